@@ -0,0 +1,72 @@
+"""
+Compare the original per-pixel glyph decoder with PSFReader, which slices
+packed glyphs straight out of the file.
+
+    python benchmarks/bench_bitmap.py
+
+The reader's time covers the whole parse of a synthetic font, header and
+Unicode table included; the baseline only decodes the bitmaps.
+"""
+
+import timeit
+from pathlib import Path
+
+from synthetic import FontSpec, codepoint, font_bytes
+
+from psf2flf.reader.psf import PSFReader
+
+# (label, glyph count, height, width) - PSF1 is always 8 pixels wide
+SIZES = [
+    ("psf1 256x8x8", 256, 8, 8),
+    ("psf1 512x16x8", 512, 16, 8),
+    ("psf2 512x16x12", 512, 16, 12),
+    ("psf2 512x32x16", 512, 32, 16),
+    ("psf2 512x64x32", 512, 64, 32),
+]
+
+
+def decode_per_pixel(data, offset, glyph_count, height, width, bytes_per_row):
+    """The original nested-loop decoder, kept here as the baseline."""
+    data_pos = offset
+    all_glyphs = []
+    for _ in range(glyph_count):
+        glyph_pixels = []
+        for _ in range(height):
+            row_pixels = []
+            x = 0
+            for _ in range(bytes_per_row):
+                byte_value = data[data_pos] if data_pos < len(data) else 0
+                data_pos += 1
+                for bit in range(8):
+                    if x < width:
+                        row_pixels.append(bool(byte_value & (1 << (7 - bit))))
+                        x += 1
+            glyph_pixels.append(tuple(row_pixels))
+        all_glyphs.append(tuple(glyph_pixels))
+    return all_glyphs
+
+
+def main():
+    reader = PSFReader()
+    print(f"{'font':<16}{'per-pixel':>12}{'psf reader':>12}")
+    for label, glyph_count, height, width in SIZES:
+        spec = FontSpec(1 if label.startswith("psf1") else 2, glyph_count, width, height)
+        data = font_bytes(spec)
+        path = Path(spec.filename)
+        header_size = 4 if spec.version == 1 else 32
+        args = (data, header_size, glyph_count, height, width, (width + 7) // 8)
+
+        expected = decode_per_pixel(*args)
+        glyphs = reader.parse(data, path).glyphs
+        assert all(glyphs[chr(codepoint(i))].to_pixels() == pixels for i, pixels in enumerate(expected))
+
+        timings = []
+        for decode in (lambda: decode_per_pixel(*args), lambda: reader.parse(data, path)):
+            runs, total = timeit.Timer(decode).autorange()
+            timings.append(total / runs * 1000)
+
+        print(f"{label:<16}" + "".join(f"{ms:>10.2f}ms" for ms in timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Per-file latency of loading a tree of gzip-compressed console fonts.
+
+    python benchmarks/bench_gunzip.py [font_dir]
+
+Defaults to /usr/share/consolefonts, falling back to copies of the test
+fonts when it isn't there. Compares GzipFile streaming (what the reader
+used to do, opening each file twice) with a single read and one zlib call,
+with and without prefetching on a thread pool.
+"""
+
+import gzip
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from psf2flf.reader import parse, prefetch
+from psf2flf.reader.source import load_data
+
+DATA = Path(__file__).parent.parent / "tests" / "data"
+COPIES = 100
+
+
+def load_gzip_twice(path: Path):
+    """The old path: sniff through one GzipFile, then read everything through another."""
+    with gzip.open(path, "rb") as f:
+        f.read(4)
+    with gzip.open(path, "rb") as f:
+        return parse(f.read(), path)
+
+
+def load_zlib(path: Path):
+    return parse(load_data(path), path)
+
+
+def run_serial(load, paths):
+    for path in paths:
+        load(path)
+
+
+def run_prefetch(paths):
+    for path, data in prefetch(paths):
+        parse(data, path)
+
+
+def font_tree(tmp: Path) -> list[Path]:
+    if len(sys.argv) > 1:
+        return sorted(Path(sys.argv[1]).glob("*.psf*"))
+    system = sorted(Path("/usr/share/consolefonts").glob("*.psf.gz"))
+    if system:
+        return system
+
+    paths = []
+    for source in sorted(DATA.glob("psf*/*.psf.gz")):
+        for i in range(COPIES):
+            path = tmp / f"{i:03}-{source.name}"
+            shutil.copy(source, path)
+            paths.append(path)
+    return paths
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = font_tree(Path(tmp))
+        print(f"{len(paths)} fonts")
+
+        runs = {
+            "gzip.open x2": lambda: run_serial(load_gzip_twice, paths),
+            "zlib": lambda: run_serial(load_zlib, paths),
+            "zlib + prefetch": lambda: run_prefetch(paths),
+        }
+        for name, run in runs.items():
+            run()  # warm the page cache
+            start = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - start
+            print(f"{name:<16}{elapsed / len(paths) * 1000:>8.3f}ms/file")
+
+
+if __name__ == "__main__":
+    main()
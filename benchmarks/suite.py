@@ -0,0 +1,161 @@
+"""
+Benchmark suite for the reader, writer and merge hot paths on synthetic fonts.
+
+    python benchmarks/suite.py [-o results.json] [--quick] [-k read] [--compare old.json]
+
+Each benchmark reports the best per-call time over several repeats. Results
+are written as JSON (by default to .benchmarks/<commit>.json) so runs on
+different commits can be compared with --compare.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from pathlib import Path
+
+from synthetic import FontSpec, write_font
+
+from psf2flf.font import Font, FontDir
+from psf2flf.reader import read
+from psf2flf.reader.psf import PSFReader
+from psf2flf.writer.flf import FLFWriter
+
+ROOT = Path(__file__).parent.parent
+
+# Font shapes to read, from the smallest console font up to a full BMP font
+READ_SPECS = [
+    FontSpec(1, 256, 8, 8, unicode=False),
+    FontSpec(1, 512, 8, 16),
+    FontSpec(2, 512, 16, 32),
+    FontSpec(2, 4096, 32, 64),
+    FontSpec(2, 65536, 8, 16),
+    FontSpec(2, 65536, 32, 64, unicode=False),
+]
+# Shapes that are written and merged; 65k glyph FLFs take too long to be worth repeating
+WRITE_SPECS = [spec for spec in READ_SPECS if spec.glyph_count <= 4096]
+# Largest fonts put in the write_tar archive
+TAR_GLYPH_COUNT = 512
+# Where merged-in glyphs are mapped, so they don't collide with the base font's
+PRIVATE_USE = 0xF0000
+# Shapes left out of --quick runs
+SLOW_GLYPH_COUNT = 65536
+
+
+def measure(func, repeat: int) -> float:
+    """Best time per call, in seconds, over `repeat` timing runs."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number
+
+
+def benchmarks(directory: Path, quick: bool):
+    """Yield (name, callable) pairs, creating the fonts they need in `directory`."""
+    read_specs = [spec for spec in READ_SPECS if not (quick and spec.glyph_count >= SLOW_GLYPH_COUNT)]
+    reader = PSFReader()
+
+    for spec in read_specs:
+        for compressed in (False, True):
+            spec_file = FontSpec(spec.version, spec.glyph_count, spec.width, spec.height, spec.unicode, compressed)
+            path = write_font(spec_file, directory)
+            yield f"read/{spec_file.name}", lambda path=path: reader.read(path)
+
+    writer = FLFWriter()
+    fonts = {spec: read(write_font(spec, directory)) for spec in WRITE_SPECS}
+    for spec, font in fonts.items():
+        for tall_mode in (False, True):
+            mode = "tall" if tall_mode else "short"
+            yield f"write-{mode}/{spec.name}", lambda font=font, tall=tall_mode: writer.write(font, io.StringIO(), tall)
+
+    # Merge in a font with the same name and size, sharing ASCII but adding everything else
+    for spec, font in fonts.items():
+        extra = {
+            char if char.isascii() else chr(PRIVATE_USE + index): glyph
+            for index, (char, glyph) in enumerate(font.glyphs.items())
+        }
+        other = Font(meta={**font.meta, "charset": "Extra"}, glyphs=extra)
+
+        def merge(font=font, other=other):
+            merged = Font(meta=dict(font.meta), glyphs=dict(font.glyphs))
+            merged += other
+
+        yield f"merge/{spec.name}", merge
+
+    # gzip dominates tar output, so keep the archive to console-sized fonts
+    container = FontDir()
+    tar_fonts = [font for spec, font in fonts.items() if spec.glyph_count <= TAR_GLYPH_COUNT]
+    for font in tar_fonts:
+        container += font
+    tar_path = directory / "fonts.tar"
+
+    def write_tar():
+        with contextlib.redirect_stdout(io.StringIO()):
+            container.write_tar(tar_path)
+
+    yield f"write-tar/{len(tar_fonts)}-fonts", write_tar
+
+
+def git_commit() -> str | None:
+    try:
+        result = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def compare(results: dict, baseline_path: Path):
+    """Print each result next to the same benchmark from an earlier run."""
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))["results"]
+    print(f"\n{'benchmark':<48}{'before':>12}{'after':>12}{'change':>10}")
+    for name, seconds in results.items():
+        if name in baseline:
+            before = baseline[name]
+            change = f"{seconds / before:>9.2f}x"
+            print(f"{name:<48}{before * 1000:>10.3f}ms{seconds * 1000:>10.3f}ms{change:>10}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-o", "--output", type=Path, help="JSON results file (default .benchmarks/<commit>.json)")
+    parser.add_argument("-k", "--filter", default="", help="Only run benchmarks whose name contains this")
+    parser.add_argument("--quick", action="store_true", help="Skip the 65k glyph fonts")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing runs per benchmark (default 5)")
+    parser.add_argument("--compare", type=Path, metavar="JSON", help="Compare with the results of an earlier run")
+    args = parser.parse_args(argv)
+
+    commit = git_commit()
+    results = {}
+    # Fonts without a Unicode table warn about every unmapped glyph
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, "w") as devnull, contextlib.redirect_stderr(devnull):
+        for name, func in benchmarks(Path(tmp), args.quick):
+            if args.filter not in name:
+                continue
+            results[name] = measure(func, args.repeat)
+            print(f"{name:<48}{results[name] * 1000:>10.3f}ms", flush=True)
+
+    output = args.output or ROOT / ".benchmarks" / f"{(commit or 'results')[:12]}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    report = {
+        "commit": commit,
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    output.write_text(json.dumps(report, indent=1) + "\n", encoding="utf-8")
+    print(f"Results: {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""
+Synthetic PSF1/PSF2 font files for benchmarks.
+
+Glyph bitmaps are random but seeded, so every run (and every commit) times
+the same bytes.
+"""
+
+import gzip
+import random
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+
+PSF1_MAGIC = b"\x36\x04"
+PSF2_MAGIC = b"\x72\xb5\x4a\x86"
+
+# Every 16th glyph also gets a two-codepoint sequence, as real tables have
+SEQUENCE_EVERY = 16
+
+
+@dataclass(frozen=True)
+class FontSpec:
+    """The shape of a synthetic font."""
+
+    version: int
+    glyph_count: int
+    width: int
+    height: int
+    unicode: bool = True
+    compressed: bool = False
+
+    @property
+    def name(self) -> str:
+        label = f"psf{self.version}-{self.glyph_count}x{self.width}x{self.height}"
+        if not self.unicode:
+            label += "-nounicode"
+        return label + (".gz" if self.compressed else "")
+
+    @property
+    def filename(self) -> str:
+        # Parsed by the reader like a real console font: family, size and charset
+        unicode = "Uni" if self.unicode else "Raw"
+        suffix = ".psf.gz" if self.compressed else ".psf"
+        return f"{unicode}{self.version}-Synth{self.glyph_count}-{self.height}x{self.width}{suffix}"
+
+
+def codepoint(index: int) -> int:
+    """The codepoint mapped to glyph `index`, skipping the surrogate range."""
+    return index if index < 0xD800 else index + 0x800
+
+
+def unicode_table(spec: FontSpec) -> bytes:
+    """Build the Unicode table: one codepoint per glyph plus the occasional sequence."""
+    entries = []
+    for index in range(spec.glyph_count):
+        char = chr(codepoint(index))
+        sequence = char + "\u0301" if index % SEQUENCE_EVERY == 0 else None
+        if spec.version == 1:
+            values = [ord(char)]
+            if sequence:
+                values += [0xFFFE, *map(ord, sequence)]
+            entries.append(struct.pack(f"<{len(values) + 1}H", *values, 0xFFFF))
+        else:
+            entry = char.encode()
+            if sequence:
+                entry += b"\xfe" + sequence.encode()
+            entries.append(entry + b"\xff")
+    return b"".join(entries)
+
+
+def font_bytes(spec: FontSpec, seed: int = 0) -> bytes:
+    """The uncompressed contents of a synthetic font file."""
+    bytes_per_row = (spec.width + 7) // 8
+    char_size = bytes_per_row * spec.height
+    bitmaps = random.Random(seed).randbytes(spec.glyph_count * char_size)
+
+    if spec.version == 1:
+        if spec.width != 8 or spec.glyph_count not in (256, 512):
+            raise ValueError("PSF1 fonts are 8 pixels wide with 256 or 512 glyphs")
+        mode = (spec.glyph_count == 512) | (0b010 if spec.unicode else 0)
+        header = PSF1_MAGIC + bytes([mode, spec.height])
+    else:
+        flags = 1 if spec.unicode else 0
+        header = PSF2_MAGIC + struct.pack("<7I", 0, 32, flags, spec.glyph_count, char_size, spec.height, spec.width)
+
+    return header + bitmaps + (unicode_table(spec) if spec.unicode else b"")
+
+
+def write_font(spec: FontSpec, directory: Path, seed: int = 0) -> Path:
+    """Write a synthetic font file into `directory` and return its path."""
+    path = directory / spec.filename
+    data = font_bytes(spec, seed)
+    path.write_bytes(gzip.compress(data, mtime=0) if spec.compressed else data)
+    return path
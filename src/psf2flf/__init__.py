@@ -0,0 +1 @@
+from .api import convert as convert
@@ -0,0 +1,30 @@
+from typing import IO
+
+from .codepoints import Codepoints
+from .reader import loads
+from .writer import RenderCache, process_cache
+from .writer.flf import FLFWriter
+
+_flf_writer = FLFWriter()
+
+
+def convert(
+    source: bytes | bytearray | memoryview | IO[bytes],
+    tall: bool = False,
+    name: str = "",
+    cache: RenderCache | None = None,
+    codepoints: Codepoints | None = None,
+) -> str:
+    """
+    Convert a font held in memory to FLF text, without touching the disk.
+
+    `source` is the font file's contents, gzipped or not, or a binary stream
+    to read them from. `name` stands in for the file name, which the font's
+    name, style and size are taken from. Rendered glyphs are cached per
+    process, so converting the same fonts repeatedly gets cheaper; pass a
+    `RenderCache` to use your own. Pass `codepoints` to only convert some
+    characters. Encode the result as UTF-8 for bytes.
+    """
+    data = source.read() if hasattr(source, "read") else source
+    font = loads(data, name, codepoints)
+    return _flf_writer.dumps(font, tall, cache if cache is not None else process_cache())
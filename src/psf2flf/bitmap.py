@@ -0,0 +1,86 @@
+# Each byte value expanded to its 8 pixels, most significant bit first
+_BITS: list[tuple[bool, ...]] = [tuple(bool(byte & (0x80 >> bit)) for bit in range(8)) for byte in range(256)]
+
+
+def unpack_row(row: bytes, width: int) -> tuple[bool, ...]:
+    """Decode a single packed row into `width` pixels."""
+    if len(row) == 1:
+        return _BITS[row[0]][:width]
+    pixels = ()
+    for byte in row:
+        pixels += _BITS[byte]
+    return pixels[:width]
+
+
+def mask_padding(block: bytes, width: int, bytes_per_row: int) -> bytes:
+    """Clear the unused low bits at the end of every row so equal pixels mean equal bytes."""
+    spare = -width % 8
+    if not spare:
+        return block
+    keep = (0xFF << spare) & 0xFF
+    table = bytes(byte & keep for byte in range(256))
+    masked = bytearray(block)
+    last = slice(bytes_per_row - 1, None, bytes_per_row)
+    masked[last] = masked[last].translate(table)
+    return bytes(masked)
+
+
+def blit(
+    block: bytes, stride: int, width: int, height: int, x: int, top: int, cell_width: int, cell_height: int
+) -> bytes:
+    """
+    Place a bitmap in a blank cell, for formats that store each glyph at its
+    own size and offset.
+
+    The bitmap is `height` rows of `stride` bytes, `width` pixels wide, most
+    significant bit first. It's drawn with its top left pixel at column `x`
+    and row `top` of the cell (either may be negative), and anything outside
+    the cell is clipped. Returns the cell's packed rows, padding bits clear.
+    """
+    bytes_per_row = (cell_width + 7) // 8
+    if stride == bytes_per_row and width == cell_width and x == 0 and top == 0 and height == cell_height:
+        size = stride * height
+        return mask_padding(bytes(block[:size]).ljust(size, b"\0"), width, bytes_per_row)
+
+    width = min(width, stride * 8)
+    cell = bytearray(bytes_per_row * cell_height)
+    shift = (bytes_per_row - stride) * 8 - x
+    bits = ((1 << width) - 1) << (stride * 8 - width)
+    keep = ((1 << cell_width) - 1) << (bytes_per_row * 8 - cell_width)
+    for row in range(max(0, -top), min(height, cell_height - top)):
+        value = int.from_bytes(block[row * stride : (row + 1) * stride], "big") & bits
+        value = value << shift if shift >= 0 else value >> -shift
+        pos = (top + row) * bytes_per_row
+        cell[pos : pos + bytes_per_row] = (value & keep).to_bytes(bytes_per_row, "big")
+    return bytes(cell)
+
+
+def unpack_glyphs(
+    data: bytes, offset: int, glyph_count: int, height: int, width: int, bytes_per_row: int
+) -> list[tuple[tuple[bool, ...], ...]]:
+    """
+    Decode a contiguous block of 1bpp glyph bitmaps into pixel tuples.
+
+    Rows are `bytes_per_row` bytes wide, most significant bit first, and any
+    bytes missing from the end of `data` are treated as zero. Rows are
+    decoded via the byte lookup table, sharing tuples between identical rows.
+    """
+    size = glyph_count * height * bytes_per_row
+    block = bytes(data[offset : offset + size])
+    if len(block) < size:
+        block += bytes(size - len(block))
+
+    if bytes_per_row == 1:
+        row_table = [bits[:width] for bits in _BITS]
+        rows = [row_table[byte] for byte in block]
+    else:
+        row_cache: dict[bytes, tuple[bool, ...]] = {}
+        rows = []
+        for pos in range(0, len(block), bytes_per_row):
+            key = block[pos : pos + bytes_per_row]
+            row = row_cache.get(key)
+            if row is None:
+                row = row_cache[key] = unpack_row(key, width)
+            rows.append(row)
+
+    return [tuple(rows[i : i + height]) for i in range(0, glyph_count * height, height)]
@@ -0,0 +1,103 @@
+from bisect import bisect_right
+
+# Names that can be used in place of ranges
+NAMED_RANGES = {
+    "ascii": [(0x20, 0x7E)],
+    "latin1": [(0xA0, 0xFF)],
+    "box": [(0x2500, 0x259F)],  # box drawing and block elements
+}
+
+
+def _codepoint(text: str) -> int:
+    """A code point written in hex, as U+XXXX, 0xXXXX or just XXXX."""
+    text = text.strip()
+    if text[:2].lower() in ("u+", "0x"):
+        text = text[2:]
+    value = int(text, 16)
+    if not 0 <= value <= 0x10FFFF:
+        raise ValueError
+    return value
+
+
+def parse_ranges(text: str) -> list[tuple[int, int]]:
+    """
+    Parse a comma separated list of code points, ranges and names, e.g.
+    "ascii,U+00A0-U+00FF,2500-257F", into inclusive (first, last) pairs.
+    """
+    ranges = []
+    for item in text.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        if item.lower() in NAMED_RANGES:
+            ranges += NAMED_RANGES[item.lower()]
+            continue
+        first, dash, last = item.partition("-")
+        try:
+            start = _codepoint(first)
+            end = _codepoint(last) if dash else start
+        except ValueError:
+            raise ValueError(f"Invalid code point range: {item}") from None
+        if end < start:
+            raise ValueError(f"Invalid code point range: {item}")
+        ranges.append((start, end))
+    return ranges
+
+
+def _merge(ranges) -> tuple[tuple[int, ...], tuple[int, ...]]:
+    """Sort and join overlapping ranges, returning their starts and ends for bisecting."""
+    merged: list[list[int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return tuple(start for start, _ in merged), tuple(end for _, end in merged)
+
+
+def _in_ranges(ranges: tuple[tuple[int, ...], tuple[int, ...]], value: int) -> bool:
+    starts, ends = ranges
+    i = bisect_right(starts, value) - 1
+    return i >= 0 and value <= ends[i]
+
+
+class Codepoints:
+    """
+    The characters to keep when reading a font.
+
+    A character is kept if it's in one of the included ranges (or none were
+    given) and not in any excluded range. Sequences, like a letter and a
+    combining accent, are kept if all of their characters are. Readers test
+    each character's mapping before decoding its bitmap, so glyphs that
+    aren't wanted cost nothing to skip.
+    """
+
+    def __init__(self, include: list[tuple[int, int]] | None = None, exclude: list[tuple[int, int]] = ()):
+        self.include = _merge(include) if include is not None else None
+        self.exclude = _merge(exclude)
+
+    @classmethod
+    def parse(cls, include: str | None = None, exclude: str | None = None) -> "Codepoints":
+        """Make a filter from range lists in the format `parse_ranges` takes, like the CLI options."""
+        return cls(
+            parse_ranges(include) if include is not None else None,
+            parse_ranges(exclude) if exclude is not None else (),
+        )
+
+    @property
+    def spec(self) -> str:
+        """A normalised description of the filter, for telling whether two runs used the same one."""
+
+        def ranges(merged) -> str:
+            return ",".join(f"{start:X}-{end:X}" for start, end in zip(*merged))
+
+        include = ranges(self.include) if self.include is not None else "*"
+        return f"include={include};exclude={ranges(self.exclude)}"
+
+    def keeps(self, codepoint: int) -> bool:
+        if self.include is not None and not _in_ranges(self.include, codepoint):
+            return False
+        return not _in_ranges(self.exclude, codepoint)
+
+    def __contains__(self, char: str) -> bool:
+        return all(self.keeps(ord(c)) for c in char)
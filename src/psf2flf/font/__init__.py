@@ -1,3 +1,6 @@
+from .glyph import Glyph as Glyph
 from .font import Font as Font
+from .font import LazyFont as LazyFont
+from .glyphstore import GlyphStore as GlyphStore
 from .typeface import TypeFace as TypeFace
 from .fontdir import FontDir as FontDir
@@ -1,13 +1,36 @@
 from dataclasses import dataclass, field
+from typing import Callable, NamedTuple
+
+# The characters whose glyphs are compared by `Font.__eq__`
+_ASCII = tuple(chr(i) for i in range(32, 128))
+
+
+class Fingerprint(NamedTuple):
+    """A font's ASCII glyphs, summarised so fonts can be compared by hash."""
+
+    coverage: int  # bit i is set if the font has chr(32 + i)
+    glyphs: tuple  # the glyphs it has, in order
+    digest: int  # hash of `glyphs`
 
 
 @dataclass
 class Font:
-    """A generic representation of a font."""
+    """
+    A generic representation of a font.
+
+    The compatibility key and ASCII fingerprint are computed once and
+    cached, and recomputed if `meta` or `glyphs` is replaced or glyphs are
+    added or removed. Code that changes the name, style or size in `meta`,
+    or replaces glyphs in place, must call `invalidate()`.
+    """
 
     meta: dict = field(default_factory=dict)
     glyphs: dict = field(default_factory=dict)
 
+    # (meta, key) and (glyphs, glyph count, fingerprint) they were computed from
+    _key_cache = None
+    _fingerprint_cache = None
+
     @property
     def name(self) -> str:
         """Get the font name from metadata."""
@@ -28,88 +51,167 @@ class Font:
         """Get the font height from metadata."""
         return self.meta.get("height", 0)
 
+    @property
+    def compat_key(self) -> tuple:
+        """(name, style, width, height); fonts can only be merged if their keys are equal."""
+        cache = self._key_cache
+        if cache is None or cache[0] is not self.meta:
+            cache = self._key_cache = (self.meta, (self.name, self.style, self.width, self.height))
+        return cache[1]
+
+    @property
+    def fingerprint(self) -> Fingerprint:
+        """The font's ASCII glyphs, as compared by `__eq__`."""
+        glyphs = self.glyphs
+        cache = self._fingerprint_cache
+        if cache is None or cache[0] is not glyphs or cache[1] != len(glyphs):
+            coverage = 0
+            present = []
+            for i, char in enumerate(_ASCII):
+                glyph = glyphs.get(char)
+                if glyph is not None:
+                    coverage |= 1 << i
+                    present.append(glyph)
+            present = tuple(present)
+            cache = self._fingerprint_cache = (glyphs, len(glyphs), Fingerprint(coverage, present, hash(present)))
+        return cache[2]
+
+    def invalidate(self):
+        """Forget the cached key and fingerprint, after changing `meta` or `glyphs` in place."""
+        self._key_cache = None
+        self._fingerprint_cache = None
+
+    def intern(self, store):
+        """Swap this font's glyphs for the shared copies held in a GlyphStore."""
+        store.intern_all(self.glyphs)
+        return self
+
     def __eq__(self, other) -> bool:
         """Two fonts are equal if name, style, width, height match and overlapping ASCII glyphs are identical."""
         if not isinstance(other, Font):
             return False
-
-        # Check basic properties
-        if (
-            self.name != other.name
-            or self.style != other.style
-            or self.width != other.width
-            or self.height != other.height
-        ):
+        if self.compat_key != other.compat_key:
             return False
 
-        # Get ASCII printable characters that exist in both fonts
-        ascii_chars = set(chr(i) for i in range(32, 128))
-        self_chars = set(self.glyphs.keys())
-        other_chars = set(other.glyphs.keys())
-        common_ascii = ascii_chars & self_chars & other_chars
-
-        # Check that common ASCII glyphs are identical
-        for char in common_ascii:
-            if self.glyphs[char] != other.glyphs[char]:
-                return False
+        mine, theirs = self.fingerprint, other.fingerprint
+        if mine.coverage == theirs.coverage:
+            return mine.digest == theirs.digest and mine.glyphs == theirs.glyphs
 
-        return True
+        # Only compare the ASCII glyphs both fonts have
+        common = mine.coverage & theirs.coverage
+        return all(self.glyphs[char] == other.glyphs[char] for i, char in enumerate(_ASCII) if common >> i & 1)
 
     def __iadd__(self, other):
         """Merge another font into this one if they are compatible."""
-        if not isinstance(other, Font):
-            raise TypeError(f"Cannot add {type(other).__name__} to Font")
-
-        # Check compatibility using existing __eq__ logic
-        if (
-            self.name != other.name
-            or self.style != other.style
-            or self.width != other.width
-            or self.height != other.height
-        ):
-            raise ValueError(
-                f"Cannot merge incompatible fonts: "
-                f"{self.name} {self.style} {self.width}x{self.height} != "
-                f"{other.name} {other.style} {other.width}x{other.height}"
-            )
-
-        # Only add glyphs that don't exist in current font (fill gaps only)
-        added_count = 0
-        for char, glyph in other.glyphs.items():
-            if char not in self.glyphs:
-                self.glyphs[char] = glyph
-                added_count += 1
-
-        # Merge metadata (keep existing, but add missing charset info)
-        if "charset" not in self.meta and "charset" in other.meta:
-            self.meta["charset"] = other.meta["charset"]
-        elif "charset" in self.meta and "charset" in other.meta:
-            # If both have charset and they differ, combine them
-            if self.meta["charset"] != other.meta["charset"]:
-                charsets = {self.meta["charset"], other.meta["charset"]}
-                self.meta["charset"] = "+".join(sorted(charsets))
-
+        self.merge(other)
         return self
 
     def force_merge(self, other):
         """Force merge another font, ignoring compatibility checks."""
-        if not isinstance(other, Font):
-            raise TypeError(f"Cannot add {type(other).__name__} to Font")
-
-        # Only add glyphs that don't exist in current font (fill gaps only)
-        added_count = 0
-        for char, glyph in other.glyphs.items():
-            if char not in self.glyphs:
-                self.glyphs[char] = glyph
-                added_count += 1
+        self.merge(other, force=True)
+        return self
 
-        # Merge metadata (keep existing, but add missing charset info)
-        if "charset" not in self.meta and "charset" in other.meta:
+    def merge(self, other, force: bool = False) -> int:
+        """
+        Fill gaps in this font with another font's glyphs, returning how many
+        were added. Glyphs already here are kept. Unless `force`, the fonts
+        must be compatible.
+        """
+        return self.merge_all([other], force)[0]
+
+    def merge_all(self, fonts, force: bool = False) -> list[int]:
+        """
+        Merge several fonts into this one, returning how many glyphs each contributed.
+
+        Priority goes in order: glyphs already in this font are kept, then
+        each font only fills the gaps left by the ones before it. Unless
+        `force`, every font is checked for compatibility before anything is
+        merged, so an incompatible font leaves this one unchanged.
+        """
+        fonts = list(fonts)
+        for other in fonts:
+            if not isinstance(other, Font):
+                raise TypeError(f"Cannot add {type(other).__name__} to Font")
+            if not force and self.compat_key != other.compat_key:
+                raise ValueError(
+                    f"Cannot merge incompatible fonts: "
+                    f"{self.name} {self.style} {self.width}x{self.height} != "
+                    f"{other.name} {other.style} {other.width}x{other.height}"
+                )
+
+        glyphs = self.glyphs
+        contributions = []
+        for other in fonts:
+            theirs = other.glyphs
+            # Find the missing characters as a set difference of the key views, then add them in one update
+            missing = theirs.keys() - glyphs.keys()
+            if len(missing) == len(theirs):
+                glyphs.update(theirs)
+            elif missing:
+                glyphs.update({char: glyph for char, glyph in theirs.items() if char in missing})
+            contributions.append(len(missing))
+            self._merge_meta(other)
+
+        return contributions
+
+    def _merge_meta(self, other):
+        """Keep existing metadata, but combine charset info."""
+        if "charset" not in other.meta:
+            return
+        if "charset" not in self.meta:
             self.meta["charset"] = other.meta["charset"]
-        elif "charset" in self.meta and "charset" in other.meta:
-            # If both have charset and they differ, combine them
-            if self.meta["charset"] != other.meta["charset"]:
-                charsets = {self.meta["charset"], other.meta["charset"]}
-                self.meta["charset"] = "+".join(sorted(charsets))
+        elif self.meta["charset"] != other.meta["charset"]:
+            charsets = set(self.meta["charset"].split("+")) | set(other.meta["charset"].split("+"))
+            self.meta["charset"] = "+".join(sorted(charsets))
+
+
+class LazyFont(Font):
+    """
+    A Font whose metadata is read up front but whose glyphs are decoded on first access.
 
+    `loader` is called once with no arguments and returns the char -> glyph
+    map. It may add to `meta` as it goes (e.g. Unicode table statistics).
+    """
+
+    def __init__(self, meta: dict, loader: Callable[[], dict]):
+        self.meta = meta
+        self._glyphs = None
+        self._loader = loader
+        self._store = None
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the glyphs have been decoded yet."""
+        return self._loader is None
+
+    @property
+    def glyphs(self) -> dict:
+        if self._loader is not None:
+            self._glyphs = self._loader()
+            self._loader = None
+            if self._store is not None:
+                self._store.intern_all(self._glyphs)
+                self._store = None
+        return self._glyphs
+
+    @glyphs.setter
+    def glyphs(self, value: dict):
+        self._glyphs = value
+        self._loader = None
+        self._store = None
+
+    def intern(self, store):
+        """Swap glyphs for shared copies from a GlyphStore, once they're loaded."""
+        if self._loader is None:
+            return super().intern(store)
+        self._store = store
         return self
+
+    def __reduce__(self):
+        # Loaders aren't picklable, so send the decoded font instead
+        return (Font, (self.meta, self.glyphs))
+
+    def __repr__(self) -> str:
+        if self._loader is None:
+            return f"LazyFont(meta={self.meta!r}, glyphs={self._glyphs!r})"
+        return f"LazyFont(meta={self.meta!r}, glyphs=<not loaded>)"
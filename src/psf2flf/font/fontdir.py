@@ -1,17 +1,43 @@
+import io
+import tarfile
+import time
 from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
-import tarfile
-from typing import Union
+from typing import Collection, Union
 
+from .. import stats
+from ..utils import parallel_map
 from .font import Font
+from .glyphstore import GlyphStore
 from .typeface import TypeFace
 
 
 @dataclass
 class FontDir:
-    """A collection of typefaces, typically representing a font directory or archive."""
+    """
+    A collection of typefaces, typically representing a font directory or archive.
+
+    Fonts are also indexed by their compatibility key, so the font that a
+    new one merges into is found with one lookup, via `find()`.
+    """
 
     typefaces: dict[str, TypeFace] = field(default_factory=dict)
+    store: GlyphStore = field(default_factory=GlyphStore, repr=False, compare=False)
+    _index: dict[tuple, Font] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        for typeface in self.typefaces.values():
+            self._index_typeface(typeface)
+
+    def find(self, font: Font) -> Font | None:
+        """The font already here that `font` would be merged into, if any."""
+        return self._index.get(font.compat_key)
+
+    def _index_typeface(self, typeface: TypeFace):
+        for style_group in typeface.styles.values():
+            for font in style_group.values():
+                self._index.setdefault(font.compat_key, font)
 
     def __iadd__(self, other: Union[Font, TypeFace]):
         """Add a font or typeface to this directory."""
@@ -23,15 +49,22 @@ class FontDir:
             raise TypeError(f"Cannot add {type(other).__name__} to FontDir")
 
     def _add_font(self, font: Font):
-        """Add a font to the appropriate typeface."""
+        """Merge a font into the one found for it, or add it to the appropriate typeface."""
+        existing = self.find(font)
+        if existing is not None:
+            font.intern(self.store)
+            existing += font
+            return self
+
         family_name = font.name
 
         if family_name not in self.typefaces:
             # Create new typeface for this family
-            self.typefaces[family_name] = TypeFace(name=family_name)
+            self.typefaces[family_name] = TypeFace(name=family_name, store=self.store)
 
         # Add font to the typeface
         self.typefaces[family_name] += font
+        self._index.setdefault(font.compat_key, self.typefaces[family_name].styles[font.style][font.height])
         return self
 
     def _add_typeface(self, typeface: TypeFace):
@@ -39,90 +72,118 @@ class FontDir:
         family_name = typeface.name
 
         if family_name not in self.typefaces:
-            # Simply add the new typeface
+            # Simply add the new typeface, sharing our glyph store from now on
+            typeface.store = self.store
+            for style_group in typeface.styles.values():
+                for font in style_group.values():
+                    font.intern(self.store)
             self.typefaces[family_name] = typeface
+            self._index_typeface(typeface)
         else:
             # Merge with existing typeface by adding all fonts
-            existing_typeface = self.typefaces[family_name]
             for style_group in typeface.styles.values():
                 for font in style_group.values():
-                    existing_typeface += font
+                    self._add_font(font)
 
         return self
 
-    def write_directory(self, output_dir: Path, tall_mode: bool = False):
-        """Write all typefaces to a directory structure."""
-        from ..writer import write  # Import here to avoid circular imports
+    def outputs(self, tall_mode: bool | Collection[bool] = False) -> list[tuple[Font, list[tuple[bool, str]]]]:
+        """Each font with the (tall mode, file name) of every output it's written to."""
+        modes = render_modes(tall_mode)
+        return [
+            (font, [(tall, flf_filename(family_name, font, tall)) for tall in modes])
+            for family_name, typeface in self.typefaces.items()
+            for style_group in typeface.styles.values()
+            for font in style_group.values()
+        ]
+
+    def write_directory(
+        self, output_dir: Path, tall_mode: bool | Collection[bool] = False, jobs: int = 1
+    ) -> list[Path]:
+        """
+        Write all typefaces to a directory structure, using `jobs` worker processes if more than 1.
+
+        `tall_mode` can be a set of modes, like {False, True}, to write every
+        font in each of them; the font is only sent to a worker once.
+        Returns the paths written.
+        """
+        from ..writer import RenderCache  # Import here to avoid circular imports
 
         output_dir.mkdir(parents=True, exist_ok=True)
+        fonts = [
+            (font, [(tall, output_dir / filename) for tall, filename in outputs])
+            for font, outputs in self.outputs(tall_mode)
+        ]
 
-        for family_name, typeface in self.typefaces.items():
-            for style_group in typeface.styles.values():
-                for size, font in style_group.items():
-                    # Generate filename: FamilyStyleHxW.flf with correct output dimensions
-                    style_parts = list(font.style) if font.style else []
-                    # Filter out size information from styles (already have dimensions)
-                    style_parts = [s for s in style_parts if not any(char.isdigit() for char in s)]
-
-                    # Calculate actual output dimensions
-                    if tall_mode:
-                        # Tall mode: 1:1 pixel mapping (narrow chars since pixels are square)
-                        output_height = font.height
-                        output_width = font.width
-                        if "Narrow" not in style_parts:
-                            style_parts.append("Narrow")
-                    else:
-                        # Default mode: 2:1 compression
-                        output_height = (font.height + 1) // 2  # Round up for odd heights
-                        output_width = font.width
-
-                    style_suffix = "".join(style_parts) if style_parts else ""
-                    dimensions = f"{output_height}x{output_width}"
-
-                    filename = f"{family_name}{style_suffix}{dimensions}.flf"
-
-                    output_path = output_dir / filename
-                    write(font, output_path, tall_mode)
-                    print(f"Written: {output_path}")
-
-    def write_tar(self, output_path: Path, tall_mode: bool = False):
-        """Write all typefaces to a tar archive."""
-        from ..writer import write  # Import here to avoid circular imports
-        import tempfile
+        if jobs == 1:
+            write_font = partial(_write_font, cache=RenderCache())
+        else:
+            write_font = _write_font
+
+        written = []
+        for output_paths in parallel_map(write_font, fonts, jobs):
+            for output_path in output_paths:
+                print(f"Written: {output_path}")
+                written.append(output_path)
 
+        return written
+
+    def write_tar(self, output_path: Path, tall_mode: bool | Collection[bool] = False):
+        """Write all typefaces to a tar archive, rendering each font in memory, once per mode in `tall_mode`."""
+        from ..writer import RenderCache, write  # Import here to avoid circular imports
+
+        cache = RenderCache()
         with tarfile.open(output_path, "w:gz") as tar:
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_path = Path(temp_dir)
-
-                for family_name, typeface in self.typefaces.items():
-                    for style_group in typeface.styles.values():
-                        for size, font in style_group.items():
-                            # Generate filename: FamilyStyleHxW.flf with correct output dimensions
-                            style_parts = list(font.style) if font.style else []
-                            # Filter out size information from styles (already have dimensions)
-                            style_parts = [s for s in style_parts if not any(char.isdigit() for char in s)]
-
-                            # Calculate actual output dimensions
-                            if tall_mode:
-                                # Tall mode: 1:1 pixel mapping (narrow chars since pixels are square)
-                                output_height = font.height
-                                output_width = font.width
-                                if "Narrow" not in style_parts:
-                                    style_parts.append("Narrow")
-                            else:
-                                # Default mode: 2:1 compression
-                                output_height = (font.height + 1) // 2  # Round up for odd heights
-                                output_width = font.width
-
-                            style_suffix = "".join(style_parts) if style_parts else ""
-                            dimensions = f"{output_height}x{output_width}"
-
-                            filename = f"{family_name}{style_suffix}{dimensions}.flf"
-
-                            temp_file = temp_path / filename
-                            write(font, temp_file, tall_mode)
-
-                            # Add to tar archive
-                            tar.add(temp_file, arcname=filename)
+            for font, outputs in self.outputs(tall_mode):
+                for tall, filename in outputs:
+                    buffer = io.BytesIO()
+                    write(font, Path(filename), tall, cache, stream=buffer)
+
+                    # Add to tar archive straight from memory
+                    info = tarfile.TarInfo(filename)
+                    info.size = buffer.tell()
+                    info.mtime = int(time.time())
+                    buffer.seek(0)
+                    with stats.span("archive", font.meta.get("file_name"), info.size):
+                        tar.addfile(info, buffer)
 
         print(f"Created archive: {output_path}")
+
+
+def render_modes(tall_mode: bool | Collection[bool]) -> tuple[bool, ...]:
+    """The modes to write in, short first, from a single tall flag or a collection of them."""
+    if isinstance(tall_mode, bool):
+        return (tall_mode,)
+    return tuple(sorted(set(tall_mode)))
+
+
+def flf_filename(family_name: str, font: Font, tall_mode: bool) -> str:
+    """
+    The file name a font is written to: FamilyStyleHxW.flf, with the size of its output.
+
+    Tall mode maps pixels 1:1, so the characters come out narrow and that's
+    added to the style; the default packs two rows into each line.
+    """
+    # Size information in styles is left out, since the dimensions are added
+    style_parts = [s for s in font.style if not any(char.isdigit() for char in s)]
+
+    if tall_mode:
+        output_height = font.height
+        if "Narrow" not in style_parts:
+            style_parts.append("Narrow")
+    else:
+        output_height = (font.height + 1) // 2  # Round up for odd heights
+
+    return f"{family_name}{''.join(style_parts)}{output_height}x{font.width}.flf"
+
+
+def _write_font(job: tuple[Font, list[tuple[bool, Path]]], cache=None) -> list[Path]:
+    """Write one font in each of its modes; runs in a worker process when writing in parallel."""
+    from ..writer import process_cache, write  # Import here to avoid circular imports
+
+    font, outputs = job
+    if cache is None:
+        cache = process_cache()
+    for tall_mode, output_path in outputs:
+        write(font, output_path, tall_mode, cache)
+    return [output_path for _, output_path in outputs]
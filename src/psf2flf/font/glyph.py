@@ -0,0 +1,100 @@
+from ..bitmap import mask_padding, unpack_glyphs, unpack_row
+
+
+class Glyph:
+    """
+    A 1bpp glyph bitmap.
+
+    Rows are packed into a single `bytes` buffer, `bytes_per_row` bytes each,
+    most significant bit first - the same layout as PSF glyph data. Unused
+    padding bits are always clear, so two glyphs are equal if and only if
+    their pixels are. Indexing a glyph gives a row of bools, so code that
+    treats glyphs as `pixels[y][x]` keeps working.
+    """
+
+    __slots__ = ("width", "height", "data", "_hash")
+
+    def __init__(self, width: int, height: int, data: bytes):
+        self.width = width
+        self.height = height
+        self.data = data
+        self._hash = hash((width, height, data))
+
+    @classmethod
+    def from_bytes(cls, data: bytes, width: int, height: int) -> "Glyph":
+        """Create a glyph from packed row data, clearing any padding bits."""
+        bytes_per_row = (width + 7) // 8
+        return cls(width, height, mask_padding(bytes(data), width, bytes_per_row))
+
+    @classmethod
+    def from_pixels(cls, pixels) -> "Glyph":
+        """Create a glyph from rows of booleans, e.g. a tuple of tuples."""
+        rows = [tuple(row) for row in pixels]
+        width = len(rows[0]) if rows else 0
+        bytes_per_row = (width + 7) // 8
+        spare = bytes_per_row * 8 - width
+
+        data = bytearray()
+        for row in rows:
+            value = 0
+            for pixel in row:
+                value = (value << 1) | bool(pixel)
+            data += (value << spare).to_bytes(bytes_per_row, "big")
+
+        return cls(width, len(rows), bytes(data))
+
+    @classmethod
+    def blank(cls, width: int, height: int) -> "Glyph":
+        """Create an empty glyph."""
+        return cls(width, height, bytes(height * ((width + 7) // 8)))
+
+    @property
+    def bytes_per_row(self) -> int:
+        return (self.width + 7) // 8
+
+    def row(self, y: int) -> bytes:
+        """Get the packed bytes for row `y`."""
+        bytes_per_row = self.bytes_per_row
+        return self.data[y * bytes_per_row : (y + 1) * bytes_per_row]
+
+    def pixel(self, x: int, y: int) -> bool:
+        """Get a single pixel."""
+        return bool(self.data[y * self.bytes_per_row + (x >> 3)] & (0x80 >> (x & 7)))
+
+    def to_pixels(self) -> tuple[tuple[bool, ...], ...]:
+        """Decode into a tuple of rows of booleans."""
+        return unpack_glyphs(self.data, 0, 1, self.height, self.width, self.bytes_per_row)[0]
+
+    def __getitem__(self, y: int) -> tuple[bool, ...]:
+        if y < 0:
+            y += self.height
+        if not 0 <= y < self.height:
+            raise IndexError("glyph row out of range")
+        return unpack_row(self.row(y), self.width)
+
+    def __iter__(self):
+        return iter(self.to_pixels())
+
+    def __len__(self) -> int:
+        return self.height
+
+    def __eq__(self, other) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, Glyph):
+            return NotImplemented
+        return (
+            self._hash == other._hash
+            and self.width == other.width
+            and self.height == other.height
+            and self.data == other.data
+        )
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __reduce__(self):
+        return (Glyph, (self.width, self.height, self.data))
+
+    def __repr__(self) -> str:
+        return f"Glyph({self.width}x{self.height}, {self.data.hex()})"
@@ -0,0 +1,64 @@
+import sys
+
+from .glyph import Glyph
+
+
+def _sizeof(glyph) -> int:
+    """Approximate memory used by one glyph."""
+    size = sys.getsizeof(glyph)
+    if isinstance(glyph, Glyph):
+        size += sys.getsizeof(glyph.data)
+    return size
+
+
+class GlyphStore:
+    """
+    Content-addressed glyph storage.
+
+    Identical bitmaps are kept once: `intern()` returns the stored copy of a
+    glyph, so fonts sharing a store reference the same objects and comparing
+    them is an identity check.
+    """
+
+    def __init__(self):
+        self._glyphs: dict = {}
+        self.references = 0
+        self.duplicates = 0
+        self.saved_bytes = 0
+
+    def intern(self, glyph):
+        """Return the stored glyph equal to `glyph`, storing it if it's new."""
+        self.references += 1
+        stored = self._glyphs.setdefault(glyph, glyph)
+        if stored is not glyph:
+            self.duplicates += 1
+            self.saved_bytes += _sizeof(glyph)
+        return stored
+
+    def intern_all(self, glyphs: dict):
+        """Intern every value of a char -> glyph dict in place, once per distinct glyph object."""
+        seen = {}
+        for char, glyph in glyphs.items():
+            stored = seen.get(id(glyph))
+            if stored is None:
+                stored = seen[id(glyph)] = self.intern(glyph)
+            glyphs[char] = stored
+
+    @property
+    def stats(self) -> dict:
+        """Deduplication counters."""
+        return {
+            "unique": len(self._glyphs),
+            "references": self.references,
+            "duplicates": self.duplicates,
+            "saved_bytes": self.saved_bytes,
+        }
+
+    def __len__(self) -> int:
+        return len(self._glyphs)
+
+    def __contains__(self, glyph) -> bool:
+        return glyph in self._glyphs
+
+    def __iter__(self):
+        return iter(self._glyphs)
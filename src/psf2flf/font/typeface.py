@@ -1,6 +1,7 @@
 from dataclasses import dataclass, field
 
 from .font import Font
+from .glyphstore import GlyphStore
 
 
 @dataclass
@@ -10,6 +11,7 @@ class TypeFace:
     name: str
     family: str = field(init=False)
     styles: dict[frozenset[str], dict[int, Font]] = field(default_factory=dict)
+    store: GlyphStore | None = field(default=None, repr=False, compare=False)
 
     def __post_init__(self):
         self.family = self.name
@@ -23,6 +25,9 @@ class TypeFace:
         if font.name != self.name:
             raise ValueError(f"Cannot add font '{font.name}' to typeface '{self.name}': " f"family name mismatch")
 
+        if self.store is not None:
+            font.intern(self.store)
+
         # Get or create style group
         style_key = font.style
         if style_key not in self.styles:
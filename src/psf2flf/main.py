@@ -1,19 +1,27 @@
 import argparse
+import cProfile
 import sys
+import time
+from functools import partial
 from pathlib import Path
+from typing import Collection, Iterator
 
+from . import stats
+from .codepoints import Codepoints
 from .font import FontDir
-from .reader import read
-from .writer import write
-from .utils import print_dict
+from .font.fontdir import render_modes
+from .manifest import Manifest
+from .reader import parse, prefetch, read
+from .render import render
+from .writer import RenderCache, process_cache, write
+from .utils import parallel_map, print_dict
 
 
 def show_info(source: Path):
-    """Show information about a single font file."""
-    font = read(source)
+    """Show information about a single font file, reading only the header of PSF fonts."""
+    font = read(source, lazy=True)
     print(f"Font: {source}")
     print_dict(font.meta)
-    print(f"codepoints: {len(font.glyphs)}")
 
 
 def is_directory_output(path: Path) -> bool:
@@ -35,25 +43,102 @@ def is_directory_output(path: Path) -> bool:
     return False
 
 
-def convert_multiple(inputs: list[Path], output: Path, tall_mode: bool = False, force: bool = False):
-    """Convert multiple input files to single output (font or directory)."""
+def _load(paths: list[Path], jobs: int) -> Iterator[tuple[Path, Path | bytes | Exception]]:
+    """
+    Pair each input with what to parse it from.
+
+    Serial runs over several files load and decompress them ahead on
+    threads. Otherwise each file is read where it's parsed, so worker
+    processes are only sent its path, and uncompressed fonts are mapped.
+    """
+    if jobs == 1 and len(paths) > 1:
+        return prefetch(paths)
+    return ((path, path) for path in paths)
+
+
+def _parse_loaded(path: Path, data: Path | bytes | Exception, codepoints: Codepoints | None = None):
+    """Parse what `_load()` gave for `path`, re-raising any error from loading it."""
+    if isinstance(data, Exception):
+        raise data
+    if isinstance(data, Path):
+        return read(data, codepoints=codepoints)
+    return parse(data, path, codepoints)
+
+
+def _read_font(loaded: tuple[Path, Path | bytes | Exception], codepoints: Codepoints | None = None):
+    """Parse a loaded font, returning (font, None) or (None, error) so failures can cross process boundaries."""
+    try:
+        return _parse_loaded(*loaded, codepoints), None
+    except Exception as e:
+        return None, e
+
+
+def _convert_file(
+    job: tuple[Path, list[tuple[bool, Path]], Path | bytes | Exception],
+    cache: RenderCache | None = None,
+    codepoints: Codepoints | None = None,
+) -> tuple[str, bool]:
+    """
+    Parse a single loaded font and write it to each (tall mode, path) output.
+
+    Returns its report line and whether it succeeded.
+    """
+    path, outputs, data = job
+    try:
+        font = _parse_loaded(path, data, codepoints)
+        if cache is None:
+            cache = process_cache()
+        for tall_mode, out_path in outputs:
+            write(font, out_path, tall_mode, cache)
+        return "\t".join([str(path), *(str(out_path) for _, out_path in outputs)]), True
+    except Exception as e:
+        return f"{path}\tERROR: {e}", False
+
+
+def convert_multiple(
+    inputs: list[Path],
+    output: Path,
+    tall_mode: bool | Collection[bool] = False,
+    force: bool = False,
+    jobs: int = 1,
+    codepoints: Codepoints | None = None,
+):
+    """
+    Convert multiple input files to single output (font or directory), keeping only `codepoints` if given.
+
+    Directory and tar outputs can be written in several modes at once by passing a set of them as `tall_mode`.
+    """
+    if len(render_modes(tall_mode)) > 1 and not is_directory_output(output):
+        print("ERROR: Several modes can only be written to a directory or tar file", file=sys.stderr)
+        return 1
+
+    # Files are parsed in input order (in worker processes if jobs > 1) and merged here
+    results = parallel_map(partial(_read_font, codepoints=codepoints), _load(inputs, jobs), jobs)
+
     if is_directory_output(output):
         # Output is a directory or tar file - use FontDir
         container = FontDir()
 
         # Add all input fonts to the directory
-        for input_path in inputs:
+        for input_path, (font, error) in zip(inputs, results):
             try:
                 if not input_path.exists():
                     print(f"ERROR: File not found: {input_path}", file=sys.stderr)
                     continue
 
-                font = read(input_path)
+                if error is not None:
+                    raise error
                 container += font
                 print(f"Added: {input_path}")
             except Exception as e:
                 print(f"ERROR reading {input_path}: {e}", file=sys.stderr)
 
+        dedup = container.store.stats
+        print(
+            f"Glyphs: {dedup['unique']} unique of {dedup['references']} "
+            f"({dedup['duplicates']} duplicates, {dedup['saved_bytes']} bytes saved)"
+        )
+
         # Write the directory
         if output.suffix == ".tar":
             container.write_tar(output, tall_mode)
@@ -61,7 +146,7 @@ def convert_multiple(inputs: list[Path], output: Path, tall_mode: bool = False,
             # Ensure output path ends with / for directory
             if not str(output).endswith("/"):
                 output = Path(str(output) + "/")
-            container.write_directory(output, tall_mode)
+            container.write_directory(output, tall_mode, jobs)
 
     else:
         # Output is a single .flf file - merge into single Font
@@ -70,23 +155,20 @@ def convert_multiple(inputs: list[Path], output: Path, tall_mode: bool = False,
 
         merged_font = None
 
-        for input_path in inputs:
+        for input_path, (font, error) in zip(inputs, results):
             try:
                 if not input_path.exists():
                     print(f"ERROR: File not found: {input_path}", file=sys.stderr)
                     return 1
 
-                font = read(input_path)
+                if error is not None:
+                    raise error
                 if merged_font is None:
                     merged_font = font
-                    print(f"Base font: {input_path}")
+                    print(f"Base font: {input_path} ({len(font.glyphs)} glyphs)")
                 else:
-                    if force:
-                        merged_font.force_merge(font)
-                        print(f"Force merged: {input_path}")
-                    else:
-                        merged_font += font
-                        print(f"Merged: {input_path}")
+                    added = merged_font.merge(font, force)
+                    print(f"{'Force merged' if force else 'Merged'}: {input_path} (+{added} glyphs)")
             except Exception as e:
                 print(f"ERROR processing {input_path}: {e}", file=sys.stderr)
                 return 1
@@ -94,7 +176,7 @@ def convert_multiple(inputs: list[Path], output: Path, tall_mode: bool = False,
         if merged_font is not None:
             try:
                 output.parent.mkdir(parents=True, exist_ok=True)
-                write(merged_font, output, tall_mode)
+                write(merged_font, output, render_modes(tall_mode)[0])
                 print(f"Output: {output}")
             except Exception as e:
                 print(f"ERROR writing output {output}: {e}", file=sys.stderr)
@@ -106,20 +188,112 @@ def convert_multiple(inputs: list[Path], output: Path, tall_mode: bool = False,
     return 0
 
 
-def convert_all_in_directory(source_dir: Path, dest_dir: Path, tall_mode: bool = False):
-    """Convert all PSF fonts in a directory (legacy --all mode)."""
-    dest_dir.mkdir(parents=True, exist_ok=True)
-    psf_files = list(source_dir.glob("*.psf")) + list(source_dir.glob("*.psf.gz"))
-
-    for path in psf_files:
+def render_text(
+    inputs: list[Path], text: str, tall_mode: bool = False, force: bool = False, codepoints: Codepoints | None = None
+):
+    """Print text rendered in a font, merging several fonts to cover more characters."""
+    font = None
+    for input_path in inputs:
         try:
-            font = read(path)
-            name = path.stem.replace(".psf", "").replace(".gz", "")
-            out_path = dest_dir / f"{name}.flf"
-            write(font, out_path, tall_mode)
-            print(f"{path}\t{out_path}")
+            other = read(input_path, codepoints=codepoints)
+            if font is None:
+                font = other
+            else:
+                font.merge(other, force)
         except Exception as e:
-            print(f"{path}\tERROR: {e}")
+            print(f"ERROR reading {input_path}: {e}", file=sys.stderr)
+            return 1
+
+    sys.stdout.write(render(font, text, tall_mode))
+    return 0
+
+
+# Fonts picked up by --all
+_FONT_PATTERNS = ("*.psf", "*.psf.gz", "*.bdf", "*.bdf.gz", "*.pcf", "*.pcf.gz")
+
+
+def convert_all_in_directory(
+    source_dir: Path,
+    dest_dir: Path,
+    tall_mode: bool | Collection[bool] = False,
+    jobs: int = 1,
+    incremental: bool = False,
+    codepoints: Codepoints | None = None,
+):
+    """
+    Convert all PSF, BDF and PCF fonts in a directory (legacy --all mode).
+
+    With a set of modes as `tall_mode`, each font is read once and written in
+    all of them, the tall ones to "name-Narrow.flf".
+    """
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    font_files = sorted(path for pattern in _FONT_PATTERNS for path in source_dir.glob(pattern))
+
+    # Incremental runs skip inputs the manifest says are already converted
+    manifest = Manifest.load(dest_dir) if incremental else None
+    spec = codepoints.spec if codepoints is not None else ""
+    modes = render_modes(tall_mode)
+    skipped = 0
+
+    conversions = []
+    for path in font_files:
+        name = Path(path.stem).stem if path.suffix == ".gz" else path.stem
+        outputs = [
+            (tall, dest_dir / (f"{name}-Narrow.flf" if tall and len(modes) > 1 else f"{name}.flf")) for tall in modes
+        ]
+        out_paths = [out_path for _, out_path in outputs]
+        if manifest is not None and manifest.is_current(path, modes, out_paths, spec):
+            skipped += 1
+            continue
+        conversions.append((path, outputs))
+
+    if jobs == 1:
+        convert = partial(_convert_file, cache=RenderCache(), codepoints=codepoints)
+    else:
+        convert = partial(_convert_file, codepoints=codepoints)
+
+    loaded = _load([path for path, _ in conversions], jobs)
+    jobs_data = ((path, outputs, data) for (path, outputs), (_, data) in zip(conversions, loaded))
+
+    converted = 0
+    for (path, outputs), (line, ok) in zip(conversions, parallel_map(convert, jobs_data, jobs)):
+        print(line)
+        converted += ok
+        if manifest is not None:
+            if ok:
+                manifest.record(path, modes, [out_path for _, out_path in outputs], spec)
+            else:
+                manifest.forget(path)
+
+    if manifest is not None:
+        removed = manifest.prune(font_files)
+        for out_path in removed:
+            print(f"Removed: {out_path}")
+        manifest.save()
+        print(f"Converted {converted}, skipped {skipped}, removed {len(removed)}")
+
+
+def run_profiled(run, trace_path: Path | None = None, profile_path: Path | None = None):
+    """Call `run()` with stage timing (and cProfile, if given a path) on, then print the stats to stderr."""
+    profiler = cProfile.Profile() if profile_path else None
+    stats.enable()
+    start = time.perf_counter()
+    try:
+        return profiler.runcall(run) if profiler else run()
+    finally:
+        wall_time = time.perf_counter() - start
+        spans = stats.disable()
+        print(stats.summary(spans, wall_time), file=sys.stderr)
+        if trace_path:
+            stats.write_trace(trace_path, spans, wall_time)
+            print(f"Trace: {trace_path}", file=sys.stderr)
+        if profiler:
+            profiler.dump_stats(profile_path)
+            print(f"Profile: {profile_path}", file=sys.stderr)
+
+
+# Names for the values of `tall_mode` accepted by --modes
+_MODES = {"short": False, "tall": True}
 
 
 def cli(argv):
@@ -129,10 +303,20 @@ def cli(argv):
 Examples:
   psf2flf font.psf output.flf                    # Convert single font
   psf2flf font1.psf font2.psf merged.flf         # Merge fonts into single output
+  psf2flf font.psf existing.flf merged.flf       # ...including FIGlet fonts made by psf2flf
   psf2flf font1.psf font2.psf output/            # Create directory of fonts
   psf2flf font1.psf font2.psf fonts.tar          # Create tar archive
+  psf2flf --modes short,tall font.psf output/    # ...with both default and --tall fonts
+  psf2flf ter-u16n.bdf 6x13.pcf.gz output/       # BDF and PCF fonts work too
   psf2flf --all input_dir/ output_dir/           # Convert all fonts in directory
+  psf2flf --all -j 8 input_dir/ output_dir/      # ...using 8 worker processes
+  psf2flf --all --incremental in_dir/ out_dir/   # ...only converting what changed
   psf2flf --info font.psf                        # Show font information
+  psf2flf --info fonts/*.psf.gz                  # ...for many fonts, reading only headers
+  psf2flf --render "Hello" font.psf              # Print text in a font
+  psf2flf --include ascii,box font.psf out.flf   # Only keep some characters
+  psf2flf --all --stats input_dir/ output_dir/   # Show where the time goes
+  psf2flf --serve /tmp/psf2flf.sock              # Keep fonts loaded and answer requests
         """,
         formatter_class=argparse.RawDescriptionHelpFormatter,
     )
@@ -141,35 +325,114 @@ Examples:
     parser.add_argument(
         "--all", action="store_true", help="Convert all PSF fonts in input directory to output directory"
     )
-    parser.add_argument("--info", action="store_true", help="Show font information instead of converting")
+    parser.add_argument("--info", action="store_true", help="Show font header information instead of converting")
+    parser.add_argument(
+        "--render", metavar="TEXT", help="Print TEXT (- to read stdin) in the input fonts instead of converting"
+    )
     parser.add_argument(
         "--tall", action="store_true", help="Use full-size 1:1 pixel mapping instead of default 2x1 compression"
     )
+    parser.add_argument(
+        "--modes",
+        metavar="MODES",
+        help="Write directory, tar and --all output in each of these modes from one read: short, tall or short,tall",
+    )
     parser.add_argument("--force", action="store_true", help="Force merge incompatible fonts by ignoring conflicts")
+    parser.add_argument(
+        "--include",
+        metavar="RANGES",
+        help="Only keep these characters: hex code points and ranges like U+00A0-U+00FF, or ascii, latin1, box",
+    )
+    parser.add_argument("--exclude", metavar="RANGES", help="Drop these characters, in the same format as --include")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="With --all, only convert inputs that changed since the last run and remove outputs of deleted ones",
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=1, metavar="N", help="Convert using N worker processes (0 for one per CPU)"
+    )
+    parser.add_argument(
+        "--serve",
+        nargs="?",
+        const="-",
+        metavar="SOCKET",
+        help="Serve JSON-lines requests on stdin/stdout, or on a UNIX socket, keeping fonts loaded",
+    )
+    parser.add_argument(
+        "--cache-size", type=int, default=256, metavar="MB", help="Memory for fonts kept by --serve (default 256)"
+    )
+    parser.add_argument(
+        "--stats", action="store_true", help="Print time and bytes per stage, and the slowest files, to stderr"
+    )
+    parser.add_argument("--trace", type=Path, metavar="FILE", help="Like --stats, also saving every timing as JSON")
+    parser.add_argument("--profile", type=Path, metavar="FILE", help="Like --stats, also saving cProfile output")
 
     args = parser.parse_args(argv)
 
-    if args.info:
-        if len(args.files) != 1:
-            parser.error("--info requires exactly one input file.")
-        show_info(Path(args.files[0]))
-        return 0
+    if args.incremental and not args.all:
+        parser.error("--incremental can only be used with --all.")
+    if args.serve and (args.files or args.info or args.all):
+        parser.error("--serve takes no input files.")
+    if args.info and not args.files:
+        parser.error("--info requires at least one input file.")
+    if args.render is not None and not args.files:
+        parser.error("--render requires at least one input font.")
+    if args.all and len(args.files) != 2:
+        parser.error("--all requires exactly two arguments: input_dir output_dir.")
+    if not (args.info or args.all or args.serve or args.render is not None) and len(args.files) < 2:
+        parser.error("You must provide at least one input file and one output destination.")
+
+    tall_mode = args.tall
+    if args.modes is not None:
+        if args.tall:
+            parser.error("--tall and --modes can't be used together.")
+        try:
+            tall_mode = {_MODES[mode.strip()] for mode in args.modes.split(",")}
+        except KeyError as e:
+            parser.error(f"Unknown mode: {e.args[0]} (choose from {', '.join(_MODES)})")
+        if args.render is not None and len(tall_mode) > 1:
+            parser.error("--render takes a single mode.")
+
+    codepoints = None
+    if args.include is not None or args.exclude is not None:
+        try:
+            codepoints = Codepoints.parse(args.include, args.exclude)
+        except ValueError as e:
+            parser.error(str(e))
 
-    elif args.all:
-        if len(args.files) != 2:
-            parser.error("--all requires exactly two arguments: input_dir output_dir.")
-        convert_all_in_directory(Path(args.files[0]), Path(args.files[1]), args.tall)
-        return 0
+    def run():
+        if args.serve:
+            from .server import serve  # asyncio is only needed here
 
-    else:
-        # New multi-input mode
-        if len(args.files) < 2:
-            parser.error("You must provide at least one input file and one output destination.")
+            serve(None if args.serve == "-" else Path(args.serve), args.cache_size * 1024 * 1024)
+            return 0
+
+        elif args.render is not None:
+            text = sys.stdin.read() if args.render == "-" else args.render
+            return render_text([Path(f) for f in args.files], text, render_modes(tall_mode)[0], args.force, codepoints)
+
+        elif args.info:
+            for source in args.files:
+                show_info(Path(source))
+            return 0
+
+        elif args.all:
+            convert_all_in_directory(
+                Path(args.files[0]), Path(args.files[1]), tall_mode, args.jobs, args.incremental, codepoints
+            )
+            return 0
+
+        else:
+            # New multi-input mode
+            inputs = [Path(f) for f in args.files[:-1]]
+            output = Path(args.files[-1])
 
-        inputs = [Path(f) for f in args.files[:-1]]
-        output = Path(args.files[-1])
+            return convert_multiple(inputs, output, tall_mode, args.force, args.jobs, codepoints)
 
-        return convert_multiple(inputs, output, args.tall, args.force)
+    if args.stats or args.trace or args.profile:
+        return run_profiled(run, args.trace, args.profile)
+    return run()
 
 
 def main():
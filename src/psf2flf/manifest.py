@@ -0,0 +1,137 @@
+import hashlib
+import json
+import os
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Collection
+
+from .font.fontdir import render_modes
+
+MANIFEST_NAME = ".psf2flf-manifest.json"
+MANIFEST_FORMAT = 1
+
+try:
+    CONVERTER_VERSION = version("psf2flf")
+except PackageNotFoundError:  # pragma: no cover - running from a source checkout
+    CONVERTER_VERSION = "unknown"
+
+
+def file_hash(path: Path) -> str:
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class Manifest:
+    """
+    Record of which inputs produced which outputs in an output directory.
+
+    Each entry is keyed by the absolute input path and stores its size,
+    mtime, content hash, the converter version, tall flag (or list of them,
+    when written in several modes) and code point filter it was built with,
+    and its output files relative to the output directory. Inputs whose
+    size and mtime are unchanged are trusted without hashing.
+    """
+
+    def __init__(self, output_dir: Path, entries: dict | None = None):
+        self.output_dir = output_dir
+        self.entries: dict[str, dict] = entries or {}
+
+    @property
+    def path(self) -> Path:
+        return self.output_dir / MANIFEST_NAME
+
+    @classmethod
+    def load(cls, output_dir: Path) -> "Manifest":
+        """Load the manifest from an output directory, or start an empty one."""
+        try:
+            data = json.loads((output_dir / MANIFEST_NAME).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return cls(output_dir)
+        if data.get("format") != MANIFEST_FORMAT:
+            return cls(output_dir)
+        return cls(output_dir, data.get("entries", {}))
+
+    def save(self):
+        """Write the manifest atomically."""
+        data = {"format": MANIFEST_FORMAT, "entries": self.entries}
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        temp_path.write_text(json.dumps(data, indent=1, sort_keys=True), encoding="utf-8")
+        os.replace(temp_path, self.path)
+
+    def _key(self, input_path: Path) -> str:
+        return str(input_path.resolve())
+
+    def _relative(self, output_path: Path) -> str:
+        return str(Path(output_path).relative_to(self.output_dir))
+
+    def _modes(self, tall_mode: bool | Collection[bool]) -> bool | list[bool]:
+        """A single mode is stored as a plain flag, as it was before several could be written at once."""
+        modes = render_modes(tall_mode)
+        return modes[0] if len(modes) == 1 else list(modes)
+
+    def is_current(
+        self, input_path: Path, tall_mode: bool | Collection[bool], outputs: list[Path], codepoints: str = ""
+    ) -> bool:
+        """
+        True if `input_path` was already converted to `outputs` with the same settings and content.
+
+        `codepoints` is the spec of any code point filter, which changes what's written.
+        """
+        entry = self.entries.get(self._key(input_path))
+        if entry is None:
+            return False
+        if entry["version"] != CONVERTER_VERSION or entry["tall"] != self._modes(tall_mode):
+            return False
+        if entry.get("codepoints", "") != codepoints:
+            return False
+        if entry["outputs"] != [self._relative(p) for p in outputs] or not all(p.exists() for p in outputs):
+            return False
+
+        stat = input_path.stat()
+        if stat.st_size != entry["size"]:
+            return False
+        if stat.st_mtime_ns == entry["mtime"]:
+            return True
+
+        # Touched but maybe not changed; remember the new mtime if the content matches
+        if file_hash(input_path) != entry["sha256"]:
+            return False
+        entry["mtime"] = stat.st_mtime_ns
+        return True
+
+    def record(self, input_path: Path, tall_mode: bool | Collection[bool], outputs: list[Path], codepoints: str = ""):
+        """Record a successful conversion."""
+        stat = input_path.stat()
+        self.entries[self._key(input_path)] = {
+            "size": stat.st_size,
+            "mtime": stat.st_mtime_ns,
+            "sha256": file_hash(input_path),
+            "version": CONVERTER_VERSION,
+            "tall": self._modes(tall_mode),
+            "codepoints": codepoints,
+            "outputs": [self._relative(p) for p in outputs],
+        }
+
+    def forget(self, input_path: Path):
+        """Drop an input's entry, e.g. after it failed to convert."""
+        self.entries.pop(self._key(input_path), None)
+
+    def prune(self, inputs: list[Path]) -> list[Path]:
+        """Remove entries and output files for inputs that are no longer present. Returns the deleted files."""
+        live = {self._key(path) for path in inputs}
+        stale = [key for key in self.entries if key not in live]
+
+        claimed = {output for key in live if key in self.entries for output in self.entries[key]["outputs"]}
+        removed = []
+        for key in stale:
+            for output in self.entries.pop(key)["outputs"]:
+                output_path = self.output_dir / output
+                if output not in claimed and output_path.exists():
+                    output_path.unlink()
+                    removed.append(output_path)
+
+        return removed
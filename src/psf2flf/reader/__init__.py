@@ -1,17 +1,80 @@
 from pathlib import Path
 
+from ..codepoints import Codepoints
+from .bdf import BDFReader
+from .flf import FLFReader
+from .pcf import PCFReader
 from .psf import PSFReader
 from .reader import Reader
+from .source import decompress, font_suffix, open_data, prefetch as prefetch, read_head
 
 
 _readers: list[Reader] = [
     PSFReader(),
+    FLFReader(),
+    BDFReader(),
+    PCFReader(),
 ]
 
 
-def read(path: Path):
-    """Reads a font from the given path using the appropriate reader."""
+def register(reader: Reader):
+    """Add a reader; it's tried after the ones already registered."""
+    _readers.append(reader)
+
+
+def find_reader(head: bytes, path: Path) -> Reader:
+    """
+    Pick the reader for a file from its first bytes, falling back to its
+    extension for formats that have no magic number.
+
+    This works on data that's already been read, so identifying a file never
+    needs another open or decompression pass.
+    """
     for reader in _readers:
-        if reader.can_open(path):
-            return reader.read(path)
+        if reader.sniff(head, path):
+            return reader
+
+    suffix = font_suffix(path)
+    for reader in _readers:
+        if not reader.magic and suffix in reader.extensions:
+            return reader
+
     raise ValueError(f"No reader found for file: {path}")
+
+
+def read(path: Path, lazy: bool = False, codepoints: Codepoints | None = None):
+    """
+    Reads a font from the given path using the appropriate reader.
+
+    The file is opened (and decompressed) once, sniffed, and the contents
+    handed to the matching reader. With `lazy`, PSF fonts only have their
+    first few bytes read, to parse the header and filename metadata, and
+    glyphs are decoded the first time `font.glyphs` is used; other formats
+    are read in full (see `Reader.parse_lazy`). With `codepoints`, only the
+    characters it contains are kept; other glyphs are never decoded.
+    """
+    if lazy:
+        head = read_head(path)
+        reader = find_reader(head, path)
+        return reader.parse_lazy(head, path, codepoints)
+
+    with open_data(path) as data:
+        return parse(data, path, codepoints)
+
+
+def parse(data: bytes, path: Path, codepoints: Codepoints | None = None):
+    """
+    Parse a font from contents that have already been loaded (and
+    decompressed), e.g. by `prefetch()`. `path` is only used for its name.
+    """
+    return find_reader(data, path).parse(data, path, codepoints)
+
+
+def loads(data: bytes, name: str = "", codepoints: Codepoints | None = None):
+    """
+    Reads a font from its file contents in memory, gzipped or not, using the
+    appropriate reader. `name` stands in for the file name, for metadata and
+    for formats that are recognised by extension.
+    """
+    data = decompress(data)
+    return parse(data, Path(name), codepoints)
@@ -0,0 +1,196 @@
+import codecs
+import io
+import sys
+from binascii import unhexlify
+from pathlib import Path
+from typing import Callable
+
+from .. import stats
+from ..bitmap import blit
+from ..codepoints import Codepoints
+from ..font import Font, Glyph
+from .filename import parse_font_filename
+from .reader import Reader
+
+BDF_MAGIC = b"STARTFONT"
+
+
+class BDFParseError(Exception):
+    pass
+
+
+def font_meta(path: Path, format: str) -> dict:
+    """Metadata from the filename, the same as for PSF fonts, so the formats group together."""
+    meta = {"file_name": str(path)}
+    name, styles, primary_size, charset = parse_font_filename(path.name)
+    meta["name"] = name
+    meta["styles"] = styles
+    if primary_size is not None:
+        meta["primary_size"] = primary_size
+    if charset is not None:
+        meta["charset"] = charset
+    meta["format"] = format
+    return meta
+
+
+def apply_properties(meta: dict, properties: dict):
+    """Add what the X font properties say about style to the metadata."""
+    if str(properties.get("WEIGHT_NAME", "")).lower() == "bold":
+        meta["styles"] = meta["styles"] | {"Bold"}
+
+
+def char_decoder(properties: dict, file_name: str) -> Callable[[int], str | None]:
+    """
+    Get a function that turns a font's character codes into characters,
+    using its CHARSET_REGISTRY and CHARSET_ENCODING properties. ISO10646
+    fonts use Unicode code points; others are decoded with the matching
+    Python codec if there is one, and treated as Unicode otherwise.
+    """
+    registry = str(properties.get("CHARSET_REGISTRY", "")).strip()
+    encoding = str(properties.get("CHARSET_ENCODING", "")).strip()
+
+    def unicode(code: int) -> str | None:
+        return chr(code) if 0 <= code <= 0x10FFFF else None
+
+    if registry.upper() in ("", "ISO10646", "UNICODE"):
+        return unicode
+
+    codec = f"{registry}-{encoding}" if encoding else registry
+    try:
+        codec = codecs.lookup(codec).name
+    except LookupError:
+        print(
+            f"Warning: Unknown charset {codec} in {file_name}, treating character codes as Unicode",
+            file=sys.stderr,
+        )
+        return unicode
+
+    def decode(code: int) -> str | None:
+        if not 0 <= code <= 0xFFFF:
+            return None
+        try:
+            text = code.to_bytes(1 if code < 256 else 2, "big").decode(codec)
+        except UnicodeDecodeError:
+            return None
+        return text if len(text) == 1 else None
+
+    return decode
+
+
+def _property(value: bytes) -> str | int:
+    """A property value: a quoted string, with doubled quotes inside, or a number."""
+    value = value.strip()
+    if value.startswith(b'"'):
+        return value[1:-1].replace(b'""', b'"').decode("latin-1")
+    try:
+        return int(value)
+    except ValueError:
+        return value.decode("latin-1")
+
+
+class BDFReader(Reader):
+    """
+    Reads X11 BDF (Glyph Bitmap Distribution Format) fonts.
+
+    Every glyph is drawn into a cell the size of the font's bounding box,
+    at its own offset, so proportional fonts come out monospaced. The file
+    is parsed in a single pass, one line at a time, and identical glyphs
+    are shared; large CJK fonts don't need more than their glyphs' memory.
+    """
+
+    magic = (BDF_MAGIC,)
+    extensions = (".bdf",)
+
+    def parse(self, data: bytes, path: Path, codepoints: Codepoints | None = None) -> Font:
+        meta = font_meta(path, "bdf")
+        stream = data if hasattr(data, "readline") else io.BytesIO(data)
+        stream.seek(0)
+        lines = iter(stream.readline, b"")
+
+        if not next(lines, b"").startswith(BDF_MAGIC):
+            raise BDFParseError("Not a BDF file")
+
+        properties = {}
+        bbox = None
+        decode = None
+        glyphs = {}
+        shared: dict[bytes, Glyph] = {}
+
+        with stats.span("decode", path, len(data)):
+            for line in lines:
+                keyword, _, rest = line.strip().partition(b" ")
+                if keyword == b"STARTCHAR":
+                    if bbox is None:
+                        raise BDFParseError("Missing FONTBOUNDINGBOX")
+                    if decode is None:
+                        apply_properties(meta, properties)
+                        decode = char_decoder(properties, meta["file_name"])
+                    code, bbx, rows = self._read_char(lines, bbox)
+                    char = decode(code) if code >= 0 else None
+                    if char is not None and (codepoints is None or char in codepoints):
+                        cell = self._cell(code, bbx, rows, bbox)
+                        glyph = shared.get(cell)
+                        if glyph is None:
+                            glyph = shared[cell] = Glyph(bbox[0], bbox[1], cell)
+                        glyphs[char] = glyph
+                elif keyword == b"FONTBOUNDINGBOX":
+                    bbox = tuple(int(value) for value in rest.split()[:4])
+                elif keyword == b"STARTPROPERTIES":
+                    for line in lines:
+                        key, _, value = line.strip().partition(b" ")
+                        if key == b"ENDPROPERTIES":
+                            break
+                        properties[key.decode("latin-1")] = _property(value)
+                elif keyword == b"FONT":
+                    meta["bdf"] = {"font": rest.strip().decode("latin-1")}
+                elif keyword == b"ENDFONT":
+                    break
+
+        if bbox is None:
+            raise BDFParseError("Missing FONTBOUNDINGBOX")
+
+        meta.setdefault("bdf", {})["properties"] = properties
+        meta["width"] = bbox[0]
+        meta["height"] = bbox[1]
+        meta["glyphs"] = len(glyphs)
+        return Font(meta=meta, glyphs=glyphs)
+
+    def _read_char(self, lines, bbox: tuple[int, ...]) -> tuple[int, tuple[int, ...], list[bytes]]:
+        """Read one glyph, up to ENDCHAR, returning its code, bounding box and hex bitmap rows."""
+        code = -1
+        bbx = bbox
+        rows = []
+        for line in lines:
+            line = line.strip()
+            keyword, _, rest = line.partition(b" ")
+            if keyword == b"ENCODING":
+                code = int(rest.split()[0])
+            elif keyword == b"BBX":
+                bbx = tuple(int(value) for value in rest.split()[:4])
+            elif keyword == b"BITMAP":
+                for line in lines:
+                    line = line.strip()
+                    if line == b"ENDCHAR":
+                        break
+                    rows.append(line)
+                break
+            elif keyword == b"ENDCHAR":
+                break
+        return code, bbx, rows
+
+    def _cell(self, code: int, bbx: tuple[int, ...], rows: list[bytes], bbox: tuple[int, ...]) -> bytes:
+        """Decode a glyph's hex rows and draw them at their offset in the font's cell."""
+        stride = len(rows[0]) // 2 if rows else 0
+        digits = b"".join(rows)
+        if len(digits) != stride * 2 * len(rows):
+            digits = b"".join(row[: stride * 2].ljust(stride * 2, b"0") for row in rows)
+        try:
+            block = unhexlify(digits)
+        except ValueError:
+            raise BDFParseError(f"Invalid bitmap for character {code}") from None
+
+        width, height, x, y = bbx
+        cell_width, cell_height, cell_x, cell_y = bbox
+        # Rows are counted down from the top of the cell; y offsets up from the baseline
+        top = (cell_height + cell_y) - (height + y)
+        return blit(block, stride, width, len(rows), x - cell_x, top, cell_width, cell_height)
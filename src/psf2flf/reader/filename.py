@@ -0,0 +1,98 @@
+import re
+from pathlib import Path
+
+# Extensions that can come before a .gz suffix
+_FONT_SUFFIXES = (".psf", ".psfu", ".bdf", ".pcf")
+
+_SIZE_PATTERN = re.compile(r"(\d+(?:x\d+)?)$")
+_BOLD_PATTERN = re.compile(r"Bold$")
+
+
+def _is_charset_prefix(first_part: str, remaining_parts: list[str]) -> bool:
+    """
+    Heuristic to determine if the first part of a filename is a charset/language prefix.
+
+    Returns True if:
+    - First part starts with uppercase
+    - Contains only letters and digits (common for Lat2, Uni1, etc.)
+    - There are remaining parts (i.e., not the entire filename)
+    """
+    if not first_part or not remaining_parts:
+        return False
+
+    # Must start with uppercase
+    if not first_part[0].isupper():
+        return False
+
+    # Allow alphanumeric (for Lat2, Uni1, etc.) and "Full" prefix
+    cleaned = first_part.replace("Full", "")
+
+    # Check if it's mostly alphabetic with optional digits at the end
+    # This catches Lat2, Lat15, Uni1, CyrAsia, etc.
+    for i, char in enumerate(cleaned):
+        if not char.isalpha() and not (i > 0 and char.isdigit()):
+            return False
+
+    return True
+
+
+def parse_font_filename(filename: str) -> tuple[str, frozenset[str], int | None, str | None]:
+    """
+    Parses a font filename to extract font name, style modifiers, size, and charset.
+
+    Console font names are the model, e.g. "CyrAsia-TerminusBold14.psf.gz";
+    bitmap fonts in other formats are named the same way so they group with
+    them. Any font extension and .gz suffix are ignored.
+
+    Returns:
+        tuple[str, frozenset[str], int | None, str | None]:
+            - name: The core font name (e.g., "Terminus", "Fixed").
+            - styles: A frozenset of style modifiers (e.g., {"Bold", "14"}).
+            - size: The primary height of the font (e.g., 14, 28), or None if not found.
+            - charset: The character set/language (e.g., "Arabic", "Uni1"), or None if not found.
+    """
+    stem = Path(filename).stem
+    if Path(stem).suffix.lower() in _FONT_SUFFIXES:
+        stem = Path(stem).stem
+
+    name_parts = stem.split("-")
+
+    name = stem  # Default
+    styles = set()
+    primary_size: int | None = None
+    charset: str | None = None
+
+    if len(name_parts) > 1:
+        # First part might be language/charset
+        first_part = name_parts[0]
+        if _is_charset_prefix(first_part, name_parts[1:]):
+            charset = first_part
+            remaining_name = "-".join(name_parts[1:])
+        else:
+            remaining_name = stem
+
+        # Try to extract size from the end
+        size_match = _SIZE_PATTERN.search(remaining_name)
+        if size_match:
+            size_str = size_match.group(1)
+            styles.add(size_str)
+            try:
+                primary_size = int(size_str.split("x")[0])
+            except ValueError:
+                pass
+            remaining_name = remaining_name[: size_match.start()]
+
+        # Try to extract Bold style
+        bold_match = _BOLD_PATTERN.search(remaining_name)
+        if bold_match:
+            styles.add("Bold")
+            remaining_name = remaining_name[: bold_match.start()]
+
+        # The rest is the family name
+        name = remaining_name.strip("-")  # Remove any trailing hyphens
+
+    else:
+        # No hyphens, use full stem as name, no styles/size
+        name = stem
+
+    return name, frozenset(styles), primary_size, charset
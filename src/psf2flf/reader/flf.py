@@ -0,0 +1,238 @@
+import re
+from pathlib import Path
+
+from .. import stats
+from ..codepoints import Codepoints
+from ..font import Font, Glyph
+from .reader import Reader
+
+FLF_MAGIC = b"flf2a"
+
+# German characters that follow the ASCII ones in standard FIGlet fonts, if present
+_DEUTSCH = [196, 214, 220, 228, 246, 252, 223]
+
+# A code tag line: decimal, 0x hex or 0 octal code, maybe negative, then an optional comment
+_CODE_TAG = re.compile(r"\s*(-?)(0[xX][0-9a-fA-F]+|0[0-7]*|[1-9][0-9]*)(?:\s.*)?$")
+
+# Our own file names: family, Bold/Narrow styles, then the FLF's rows x columns
+_FILENAME = re.compile(r"(?P<name>.*?)(?P<styles>(?:Bold|Narrow)*)(?P<rows>\d+)x(?P<columns>\d+)$")
+
+
+class _Pixels(dict):
+    """Translation table to "0"/"1" pixel digits; any other visible character is a set pixel."""
+
+    def __missing__(self, key):
+        return "1"
+
+
+# Top and bottom pixels of short mode half blocks, and the single pixel of tall mode characters
+_TOP = _Pixels({ord(" "): "0", ord("▀"): "1", ord("▄"): "0", ord("█"): "1"})
+_BOTTOM = _Pixels({ord(" "): "0", ord("▀"): "0", ord("▄"): "1", ord("█"): "1"})
+_FULL = _Pixels({ord(" "): "0"})
+
+_HALF_BLOCKS = re.compile("[▀▄]")
+
+
+class FLFParseError(Exception):
+    pass
+
+
+def _parse_flf_filename(filename: str) -> tuple[str, frozenset[str], bool | None]:
+    """
+    Parses a file name like the ones `FontDir` writes, e.g. "TerminusBold8x16.flf".
+
+    Returns:
+        tuple[str, frozenset[str], bool | None]:
+            - name: The font family name (e.g., "Terminus").
+            - styles: A frozenset of style modifiers, other than the size.
+            - tall: Whether the font was written in tall mode, which is marked
+              "Narrow", or None if the name isn't in that format.
+    """
+    stem = Path(filename).name.split(".")[0]
+    match = _FILENAME.match(stem)
+    if match is None:
+        return stem, frozenset(), None
+    styles = frozenset({"Bold"} if "Bold" in match["styles"] else ())
+    return match["name"], styles, "Narrow" in match["styles"]
+
+
+def _code(tag: re.Match) -> int:
+    """The character code of a matched code tag line."""
+    digits = tag[2]
+    if digits[:2] in ("0x", "0X"):
+        value = int(digits, 16)
+    elif digits.startswith("0"):
+        value = int(digits, 8)
+    else:
+        value = int(digits)
+    return -value if tag[1] else value
+
+
+def _strip_endmarks(line: str) -> str:
+    """Remove the endmark at the end of a glyph line, doubled on its last line."""
+    line = line.rstrip()
+    return line.rstrip(line[-1:]) if line else line
+
+
+class FLFReader(Reader):
+    """
+    Reads FIGlet fonts back into bitmaps.
+
+    Fonts in short mode (as psf2flf writes by default) are read two pixel
+    rows to a line, from half blocks; otherwise each character is one pixel,
+    with spaces and hardblanks clear and anything else set. The mode comes
+    from the "Narrow" marker in psf2flf's own file names, or failing that,
+    from whether any half blocks are used. Glyphs are read in one pass
+    over the lines: the ASCII characters, the German ones if present, then
+    code-tagged characters. Negative codes have no Unicode character and are
+    skipped, as are stray lines between characters and a truncated last one.
+    """
+
+    magic = (FLF_MAGIC,)
+    extensions = (".flf",)
+
+    def parse(self, data: bytes, path: Path, codepoints: Codepoints | None = None) -> Font:
+        try:
+            text = str(data, "utf-8")
+        except UnicodeDecodeError:
+            text = str(data, "latin-1")
+        # Only newlines end lines; splitlines() would also break on characters
+        # like NEL (0x85) that Latin-1 fonts draw with
+        lines = [line.rstrip("\r") for line in text.split("\n")]
+        if lines[-1] == "":
+            lines.pop()
+        if not lines or not lines[0].startswith("flf2a"):
+            raise FLFParseError("Not a FIGlet font")
+
+        meta, hardblank, height, comment_lines, tall = self._parse_header(lines[0], path)
+        chars = self._read_chars(lines, 1 + comment_lines, height, hardblank)
+
+        # A font drawn only with full blocks reads the same either way, so
+        # trust our own file names before looking for half blocks
+        if tall is None:
+            short_mode = any(_HALF_BLOCKS.search(line) for block in chars.values() for line in block)
+        else:
+            short_mode = not tall
+        meta["flf"]["mode"] = "short" if short_mode else "tall"
+        pixel_height = height * 2 if short_mode else height
+        width = self._pixel_width(chars, meta["flf"]["max_length"], hardblank)
+
+        if codepoints is not None:
+            chars = {char: block for char, block in chars.items() if char in codepoints}
+
+        # Identical blocks (often blanks and lookalikes) are decoded once and shared
+        glyphs = {}
+        decoded: dict[tuple[str, ...], Glyph] = {}
+        with stats.span("decode", path, len(data)):
+            for char, block in chars.items():
+                glyph = decoded.get(block)
+                if glyph is None:
+                    glyph = decoded[block] = self._decode(block, width, pixel_height, hardblank, short_mode)
+                glyphs[char] = glyph
+
+        meta["width"] = width
+        meta["height"] = pixel_height
+        meta["glyphs"] = len(glyphs)
+        meta["primary_size"] = pixel_height
+        # Console font sizes are named by height, plus width unless it's 8
+        size = f"{pixel_height}" if width == 8 else f"{pixel_height}x{width}"
+        meta["styles"] = meta["styles"] | {size}
+
+        return Font(meta=meta, glyphs=glyphs)
+
+    def _parse_header(self, header: str, path: Path) -> tuple[dict, str, int, int, bool | None]:
+        """Build the font metadata from the filename and header line."""
+        hardblank = header[5:6]
+        fields = header[6:].split()
+        try:
+            height, baseline, max_length, old_layout, comment_lines = (int(field) for field in fields[:5])
+        except ValueError:
+            raise FLFParseError("Invalid FIGlet header") from None
+        if height <= 0:
+            raise FLFParseError("Invalid FIGlet height")
+
+        name, styles, tall = _parse_flf_filename(path.name)
+        meta = {
+            "file_name": str(path),
+            "name": name,
+            "styles": styles,
+            "format": "flf",
+            "flf": {
+                "hardblank": hardblank,
+                "height": height,
+                "baseline": baseline,
+                "max_length": max_length,
+                "old_layout": old_layout,
+                "comment_lines": comment_lines,
+            },
+        }
+        return meta, hardblank, height, comment_lines, tall
+
+    def _read_chars(self, lines: list[str], pos: int, height: int, hardblank: str) -> dict[str, tuple[str, ...]]:
+        """Collect each character's glyph lines, with endmarks removed."""
+        chars = {}
+
+        def block(start: int) -> tuple[str, ...]:
+            return tuple(_strip_endmarks(line) for line in lines[start : start + height])
+
+        for code in range(32, 127):
+            if pos + height > len(lines):
+                raise FLFParseError(f"Font ends before character {code}")
+            chars[chr(code)] = block(pos)
+            pos += height
+
+        # German characters are optional, and come before any code tags. Their
+        # rows can look like tags (e.g. " 88  o  88$@"), but tags don't end
+        # with the endmark the last ASCII character did
+        endmark = lines[pos - 1].rstrip()[-1:]
+        for code in _DEUTSCH:
+            if pos + height > len(lines) or not endmark or not lines[pos].rstrip().endswith(endmark):
+                break
+            chars[chr(code)] = block(pos)
+            pos += height
+
+        while pos < len(lines):
+            tag = _CODE_TAG.match(lines[pos])
+            if tag is None:
+                # Like figlet, skip stray lines (extra glyph rows, blanks) until the next code tag
+                pos += 1
+                continue
+            if pos + 1 + height > len(lines):
+                break
+            code = _code(tag)
+            if 0 <= code <= 0x10FFFF:
+                chars[chr(code)] = block(pos + 1)
+            pos += 1 + height
+
+        return chars
+
+    def _pixel_width(self, chars: dict, max_length: int, hardblank: str) -> int:
+        """
+        The width of the bitmaps. psf2flf pads every line to the same length
+        with a trailing hardblank column for spacing, which isn't part of the
+        glyph; other fonts are as wide as their widest line.
+        """
+        lengths = {len(line) for block in chars.values() for line in block}
+        if lengths == {max_length} and all(line.endswith(hardblank) for block in chars.values() for line in block):
+            return max_length - 1
+        return max(lengths, default=0)
+
+    def _decode(self, block: tuple[str, ...], width: int, height: int, hardblank: str, short_mode: bool) -> Glyph:
+        """Turn a glyph's lines of block characters back into packed rows."""
+        bytes_per_row = (width + 7) // 8
+        shift = bytes_per_row * 8 - width
+
+        def row(line: str, table: dict) -> bytes:
+            bits = line[:width].translate(table).ljust(width, "0")
+            return (int(bits, 2) << shift).to_bytes(bytes_per_row, "big") if bits else b""
+
+        rows = []
+        for line in block:
+            line = line.replace(hardblank, " ")
+            if short_mode:
+                rows.append(row(line, _TOP))
+                rows.append(row(line, _BOTTOM))
+            else:
+                rows.append(row(line, _FULL))
+
+        return Glyph(width, height, b"".join(rows[:height]))
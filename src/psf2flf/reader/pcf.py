@@ -0,0 +1,194 @@
+import struct
+from array import array
+from pathlib import Path
+
+from .. import stats
+from ..bitmap import blit
+from ..codepoints import Codepoints
+from ..font import Font, Glyph
+from .bdf import apply_properties, char_decoder, font_meta
+from .reader import Reader
+
+PCF_MAGIC = b"\x01fcp"
+
+# Table types
+PCF_PROPERTIES = 1 << 0
+PCF_METRICS = 1 << 2
+PCF_BITMAPS = 1 << 3
+PCF_BDF_ENCODINGS = 1 << 5
+
+# Format bits
+PCF_GLYPH_PAD_MASK = 3 << 0
+PCF_BYTE_MASK = 1 << 2  # most significant byte first
+PCF_BIT_MASK = 1 << 3  # most significant bit first
+PCF_SCAN_UNIT_MASK = 3 << 4
+PCF_COMPRESSED_METRICS = 0x100
+
+_NO_GLYPH = 0xFFFF
+
+# Each byte with its bits in reverse order, for fonts stored least significant bit first
+_REVERSE_BITS = bytes(int(f"{byte:08b}"[::-1], 2) for byte in range(256))
+
+
+class PCFParseError(Exception):
+    pass
+
+
+class PCFReader(Reader):
+    """
+    Reads X11 PCF (Portable Compiled Format) fonts.
+
+    The table of contents, metrics, bitmap offsets and encoding table are
+    each unpacked with a single `struct` call, and the bitmap table is put
+    in most significant bit and byte first order in one pass over the whole
+    table. Glyphs are then sliced out of it and drawn into cells the size of
+    the font's bounding box, like BDF fonts.
+    """
+
+    magic = (PCF_MAGIC,)
+    extensions = (".pcf",)
+
+    def parse(self, data: bytes, path: Path, codepoints: Codepoints | None = None) -> Font:
+        meta = font_meta(path, "pcf")
+        if bytes(data[:4]) != PCF_MAGIC:
+            raise PCFParseError("Not a PCF file")
+
+        (table_count,) = struct.unpack_from("<i", data, 4)
+        toc = {}
+        for kind, _fmt, size, offset in struct.iter_unpack("<4i", data[8 : 8 + 16 * table_count]):
+            toc[kind] = (size, offset)
+        for kind, name in ((PCF_METRICS, "metrics"), (PCF_BITMAPS, "bitmaps"), (PCF_BDF_ENCODINGS, "encodings")):
+            if kind not in toc:
+                raise PCFParseError(f"Missing {name} table")
+
+        properties = self._read_properties(data, toc[PCF_PROPERTIES][1]) if PCF_PROPERTIES in toc else {}
+        apply_properties(meta, properties)
+        decode = char_decoder(properties, meta["file_name"])
+
+        with stats.span("decode", path, len(data)):
+            metrics = self._read_metrics(data, toc[PCF_METRICS][1])
+            chars = []
+            for code, index in self._read_encodings(data, toc[PCF_BDF_ENCODINGS][1]):
+                char = decode(code)
+                if char is not None and index < len(metrics.left) and (codepoints is None or char in codepoints):
+                    chars.append((char, index))
+            glyph_data = self._read_bitmaps(data, toc[PCF_BITMAPS][1], metrics, {index for _, index in chars})
+
+        glyphs = {char: glyph_data[index] for char, index in chars}
+
+        meta["pcf"] = {"properties": properties}
+        meta["width"] = metrics.cell_width
+        meta["height"] = metrics.cell_height
+        meta["glyphs"] = len(glyphs)
+        return Font(meta=meta, glyphs=glyphs)
+
+    def _table_format(self, data: bytes, offset: int) -> tuple[int, str]:
+        """Every table starts with its format, always little endian, which gives the byte order of the rest."""
+        (fmt,) = struct.unpack_from("<i", data, offset)
+        return fmt, ">" if fmt & PCF_BYTE_MASK else "<"
+
+    def _read_properties(self, data: bytes, offset: int) -> dict:
+        _, order = self._table_format(data, offset)
+        (count,) = struct.unpack_from(order + "i", data, offset + 4)
+        pos = offset + 8
+        entries = list(struct.iter_unpack(order + "ibi", data[pos : pos + 9 * count]))
+        pos += 9 * count + (-count % 4)
+        (strings_size,) = struct.unpack_from(order + "i", data, pos)
+        strings = bytes(data[pos + 4 : pos + 4 + strings_size])
+
+        def string(start: int) -> str:
+            end = strings.find(b"\0", start)
+            return strings[start : end if end >= 0 else None].decode("latin-1")
+
+        return {string(name): string(value) if is_string else value for name, is_string, value in entries}
+
+    def _read_metrics(self, data: bytes, offset: int) -> "_Metrics":
+        fmt, order = self._table_format(data, offset)
+        if fmt & PCF_COMPRESSED_METRICS:
+            (count,) = struct.unpack_from(order + "h", data, offset + 4)
+            values = struct.unpack_from(f"{5 * count}B", data, offset + 6)
+            values = [value - 0x80 for value in values]
+            fields = 5
+        else:
+            (count,) = struct.unpack_from(order + "i", data, offset + 4)
+            values = struct.unpack_from(order + "5hH" * count, data, offset + 8)
+            fields = 6
+        return _Metrics(
+            values[0::fields],
+            values[1::fields],
+            values[3::fields],
+            values[4::fields],
+        )
+
+    def _read_bitmaps(self, data: bytes, offset: int, metrics: "_Metrics", indices: set[int]) -> dict[int, Glyph]:
+        """Decode the glyphs at the given indices into cells."""
+        fmt, order = self._table_format(data, offset)
+        (count,) = struct.unpack_from(order + "i", data, offset + 4)
+        offsets = struct.unpack_from(f"{order}{count}i", data, offset + 8)
+        pos = offset + 8 + 4 * count
+        sizes = struct.unpack_from(order + "4i", data, pos)
+        pos += 16
+        block = bytes(data[pos : pos + sizes[fmt & PCF_GLYPH_PAD_MASK]])
+
+        # Put the bitmaps in MSB first bit and byte order, swapping bytes within each scan unit if needed
+        if not fmt & PCF_BIT_MASK:
+            block = block.translate(_REVERSE_BITS)
+        scan_unit = 1 << ((fmt & PCF_SCAN_UNIT_MASK) >> 4)
+        if bool(fmt & PCF_BYTE_MASK) != bool(fmt & PCF_BIT_MASK) and scan_unit > 1:
+            units = array("H" if scan_unit == 2 else "I")
+            units.frombytes(block[: len(block) - len(block) % scan_unit])
+            units.byteswap()
+            block = units.tobytes() + block[len(units) * scan_unit :]
+
+        pad = 1 << (fmt & PCF_GLYPH_PAD_MASK)
+        cell_width, cell_height = metrics.cell_width, metrics.cell_height
+        shared: dict[bytes, Glyph] = {}
+        glyphs = {}
+        for index in sorted(indices):
+            start, left, right = offsets[index], metrics.left[index], metrics.right[index]
+            ascent, descent = metrics.ascent[index], metrics.descent[index]
+            width = right - left
+            height = ascent + descent
+            stride = ((width + 7) // 8 + pad - 1) // pad * pad
+            cell = blit(
+                block[start : start + stride * height],
+                stride,
+                width,
+                height,
+                left - metrics.min_left,
+                metrics.max_ascent - ascent,
+                cell_width,
+                cell_height,
+            )
+            glyph = shared.get(cell)
+            if glyph is None:
+                glyph = shared[cell] = Glyph(cell_width, cell_height, cell)
+            glyphs[index] = glyph
+        return glyphs
+
+    def _read_encodings(self, data: bytes, offset: int) -> list[tuple[int, int]]:
+        """The (character code, glyph index) pairs of the encoding table."""
+        _, order = self._table_format(data, offset)
+        min_byte2, max_byte2, min_byte1, max_byte1, _default = struct.unpack_from(order + "5h", data, offset + 4)
+        columns = max_byte2 - min_byte2 + 1
+        count = columns * (max_byte1 - min_byte1 + 1)
+        indices = struct.unpack_from(f"{order}{count}H", data, offset + 14)
+        return [
+            (((min_byte1 + i // columns) << 8) | (min_byte2 + i % columns), index)
+            for i, index in enumerate(indices)
+            if index != _NO_GLYPH
+        ]
+
+
+class _Metrics:
+    """Per-glyph metrics, as parallel sequences, and the bounding box they make."""
+
+    def __init__(self, left, right, ascent, descent):
+        self.left = left
+        self.right = right
+        self.ascent = ascent
+        self.descent = descent
+        self.min_left = min(left, default=0)
+        self.max_ascent = max(ascent, default=0)
+        self.cell_width = max(right, default=0) - self.min_left
+        self.cell_height = self.max_ascent + max(descent, default=0)
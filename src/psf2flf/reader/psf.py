@@ -1,145 +1,101 @@
-import gzip
-import struct
 import re
+import struct
 import sys
+from array import array
+from functools import partial
 from pathlib import Path
+from typing import Iterable, NamedTuple
 
-from ..font import Font
+from .. import stats
+from ..bitmap import mask_padding
+from ..codepoints import Codepoints
+from ..font import Font, Glyph, LazyFont
+from .filename import parse_font_filename
 from .reader import Reader
+from .source import open_data
 
 
 class PSFParseError(Exception):
     pass
 
 
-_SIZE_PATTERN = re.compile(r"(\d+(?:x\d+)?)$")
-_BOLD_PATTERN = re.compile(r"Bold$")
+# Bytes that surrogateescape couldn't decode, other than the 0xFE and 0xFF markers
+_INVALID_UTF8 = re.compile("[\udc80-\udcfd]")
 
 
-def _is_charset_prefix(first_part: str, remaining_parts: list[str]) -> bool:
-    """
-    Heuristic to determine if the first part of a filename is a charset/language prefix.
+def _drop_invalid(part: str) -> str:
+    """Drop a unicode table fragment that wasn't valid UTF-8."""
+    return "" if _INVALID_UTF8.search(part) else part
 
-    Returns True if:
-    - First part starts with uppercase
-    - Contains only letters and digits (common for Lat2, Uni1, etc.)
-    - There are remaining parts (i.e., not the entire filename)
-    """
-    if not first_part or not remaining_parts:
-        return False
 
-    # Must start with uppercase
-    if not first_part[0].isupper():
-        return False
+PSF1_MAGIC = b"\x36\x04"
+PSF2_MAGIC = b"\x72\xb5\x4a\x86"
 
-    # Allow alphanumeric (for Lat2, Uni1, etc.) and "Full" prefix
-    cleaned = first_part.replace("Full", "")
 
-    # Check if it's mostly alphabetic with optional digits at the end
-    # This catches Lat2, Lat15, Uni1, CyrAsia, etc.
-    for i, char in enumerate(cleaned):
-        if not char.isalpha() and not (i > 0 and char.isdigit()):
-            return False
+class _GlyphLayout(NamedTuple):
+    """Where a PSF file keeps its glyph bitmaps and Unicode table."""
 
-    return True
+    offset: int
+    glyph_count: int
+    width: int
+    height: int
+    char_size: int
+    bytes_per_row: int
+    unicode_offset: int | None
+    is_psf1: bool
 
 
-def _parse_psf_filename(filename: str) -> tuple[str, frozenset[str], int | None, str | None]:
-    """
-    Parses a PSF filename to extract font name, style modifiers, size, and charset.
-
-    Returns:
-        tuple[str, frozenset[str], int | None, str | None]:
-            - name: The core font name (e.g., "Terminus", "Fixed").
-            - styles: A frozenset of style modifiers (e.g., {"Bold", "14"}).
-            - size: The primary height of the font (e.g., 14, 28), or None if not found.
-            - charset: The character set/language (e.g., "Arabic", "Uni1"), or None if not found.
+class PSFReader(Reader):
     """
-    stem = Path(filename).stem
-    if stem.endswith(".psf"):
-        stem = Path(stem).stem
-
-    name_parts = stem.split("-")
-
-    name = stem  # Default
-    styles = set()
-    primary_size: int | None = None
-    charset: str | None = None
-
-    if len(name_parts) > 1:
-        # First part might be language/charset
-        first_part = name_parts[0]
-        if _is_charset_prefix(first_part, name_parts[1:]):
-            charset = first_part
-            remaining_name = "-".join(name_parts[1:])
-        else:
-            remaining_name = stem
+    Reads PSF1 and PSF2 console fonts.
 
-        # Try to extract size from the end
-        size_match = _SIZE_PATTERN.search(remaining_name)
-        if size_match:
-            size_str = size_match.group(1)
-            styles.add(size_str)
-            try:
-                primary_size = int(size_str.split("x")[0])
-            except ValueError:
-                pass
-            remaining_name = remaining_name[: size_match.start()]
+    Uncompressed files are memory-mapped, so only the parts that are decoded
+    get copied. Lazy reads only parse the header and open the file again
+    when the glyphs are needed. The reader keeps no per-file state, so a
+    single instance can be shared between threads.
+    """
 
-        # Try to extract Bold style
-        bold_match = _BOLD_PATTERN.search(remaining_name)
-        if bold_match:
-            styles.add("Bold")
-            remaining_name = remaining_name[: bold_match.start()]
+    magic = (PSF1_MAGIC, PSF2_MAGIC)
+    extensions = (".psf", ".psfu")
 
-        # The rest is the family name
-        name = remaining_name.strip("-")  # Remove any trailing hyphens
+    def parse(self, data: bytes, path: Path, codepoints: Codepoints | None = None) -> Font:
+        meta, layout = self._parse_header(path, data)
+        return Font(meta=meta, glyphs=self._load_glyphs(data, layout, meta, codepoints))
 
-    else:
-        # No hyphens, use full stem as name, no styles/size
-        name = stem
+    def parse_lazy(self, head: bytes, path: Path, codepoints: Codepoints | None = None) -> Font:
+        meta, layout = self._parse_header(path, head)
+        return LazyFont(meta, partial(self._load_file, path, layout, meta, codepoints))
 
-    return name, frozenset(styles), primary_size, charset
+    def _load_file(self, path: Path, layout: _GlyphLayout, meta: dict, codepoints: Codepoints | None = None) -> dict:
+        """Open the file again and decode its glyphs, for lazy fonts."""
+        with open_data(path) as data:
+            return self._load_glyphs(data, layout, meta, codepoints)
 
+    def _parse_header(self, path: Path, data: bytes) -> tuple[dict, _GlyphLayout]:
+        """Build the font metadata from the filename and header, and find the glyph data."""
+        meta = {"file_name": str(path)}
 
-class PSFReader(Reader):
-    @staticmethod
-    def can_open(path: Path) -> bool:
-        try:
-            with gzip.open(path, "rb") if str(path).endswith(".gz") else open(path, "rb") as f:
-                magic = f.read(4)
-            return magic[0:2] == b"\x36\x04" or magic[0:4] == b"\x72\xb5\x4a\x86"
-        except Exception:
-            return False
-
-    def read(self, path: Path) -> Font:
-        with gzip.open(path, "rb") if str(path).endswith(".gz") else open(path, "rb") as f:
-            self.data = f.read()
-
-        font = Font()
-        font.meta["file_name"] = str(path)
-
-        name, styles, primary_size, charset = _parse_psf_filename(path.name)
-        font.meta["name"] = name
-        font.meta["styles"] = styles
+        name, styles, primary_size, charset = parse_font_filename(path.name)
+        meta["name"] = name
+        meta["styles"] = styles
         if primary_size is not None:
-            font.meta["primary_size"] = primary_size
+            meta["primary_size"] = primary_size
         if charset is not None:
-            font.meta["charset"] = charset
+            meta["charset"] = charset
 
-        if self.data[0:2] == b"\x36\x04":
-            self._parse_psf1(font)
-        elif self.data[0:4] == b"\x72\xb5\x4a\x86":
-            self._parse_psf2(font)
+        if data[0:2] == PSF1_MAGIC:
+            layout = self._parse_psf1(data, meta)
+        elif data[0:4] == PSF2_MAGIC:
+            layout = self._parse_psf2(data, meta)
         else:
             raise PSFParseError("Not a PSF file")
 
-        return font
+        return meta, layout
 
-    def _parse_psf1(self, font: Font):
-        font.meta["format"] = "psf1"
-        mode = self.data[2]
-        height = self.data[3]
+    def _parse_psf1(self, data: bytes, meta: dict) -> _GlyphLayout:
+        meta["format"] = "psf1"
+        mode = data[2]
+        height = data[3]
 
         if mode > 0x111:
             raise PSFParseError("Unknown mode")
@@ -150,41 +106,21 @@ class PSFReader(Reader):
         char_size = height
         bytes_per_row = 1
 
-        font.meta["psf1"] = {
+        meta["psf1"] = {
             "mode": mode,
             "has_unicode_table": has_unicode_table,
         }
-        font.meta["width"] = width
-        font.meta["height"] = height
-        font.meta["glyphs"] = glyphs
-        font.meta["char_size"] = char_size
-
-        raw_glyphs = self._read_glyphs(4, glyphs, height, width, char_size, bytes_per_row)
+        meta["width"] = width
+        meta["height"] = height
+        meta["glyphs"] = glyphs
+        meta["char_size"] = char_size
 
-        unicode_map = {}
-        if has_unicode_table:
-            unicode_map = self._parse_unicode_table(4 + glyphs * char_size, glyphs, is_psf1=True)
-            total_mappings = sum(len(mappings) for mappings in unicode_map.values())
-            font.meta["unicode_glyphs"] = len(unicode_map)
-            font.meta["unicode_mappings"] = total_mappings
+        unicode_offset = 4 + glyphs * char_size if has_unicode_table else None
+        return _GlyphLayout(4, glyphs, width, height, char_size, bytes_per_row, unicode_offset, True)
 
-        # Map glyphs to characters
-        for i, glyph_data in enumerate(raw_glyphs):
-            if i in unicode_map:
-                for unicode_val in unicode_map[i]:
-                    font.glyphs[chr(unicode_val)] = glyph_data
-            else:
-                # Fallback for glyphs not in the unicode map
-                if i < 256:
-                    print(
-                        f"Warning: Glyph {i} (0x{i:02X}) has no Unicode mapping in {font.meta['file_name']}, using fallback chr({i})",
-                        file=sys.stderr,
-                    )
-                    font.glyphs[chr(i)] = glyph_data
-
-    def _parse_psf2(self, font: Font):
-        font.meta["format"] = "psf2"
-        header = struct.unpack("<7I", self.data[4:32])  # Skip magic, read 7 values
+    def _parse_psf2(self, data: bytes, meta: dict) -> _GlyphLayout:
+        meta["format"] = "psf2"
+        header = struct.unpack("<7I", data[4:32])  # Skip magic, read 7 values
         (
             version,
             header_size,
@@ -204,132 +140,137 @@ class PSFReader(Reader):
         if char_size != height * bytes_per_row:
             raise PSFParseError("Mismatch in char byte size")
 
-        font.meta["psf2"] = {
+        meta["psf2"] = {
             "version": version,
             "header_size": header_size,
             "flags": flags,
         }
-        font.meta["width"] = width
-        font.meta["height"] = height
-        font.meta["glyphs"] = glyphs
-        font.meta["char_size"] = char_size
-
-        raw_glyphs = self._read_glyphs(header_size, glyphs, height, width, char_size, bytes_per_row)
-
+        meta["width"] = width
+        meta["height"] = height
+        meta["glyphs"] = glyphs
+        meta["char_size"] = char_size
+
+        unicode_offset = header_size + glyphs * char_size if flags & 1 else None
+        return _GlyphLayout(header_size, glyphs, width, height, char_size, bytes_per_row, unicode_offset, False)
+
+    def _load_glyphs(self, data: bytes, layout: _GlyphLayout, meta: dict, codepoints: Codepoints | None = None) -> dict:
+        """
+        Decode the Unicode table and bitmaps, returning the char -> glyph map.
+
+        The table is read first, so only glyphs that are mapped to a wanted
+        character have their bitmaps decoded.
+        """
+        file_name = meta["file_name"]
         unicode_map = {}
-        if flags & 1:
-            unicode_map = self._parse_unicode_table(header_size + glyphs * char_size, len(raw_glyphs), is_psf1=False)
+        if layout.unicode_offset is not None:
+            with stats.span("unicode", file_name, len(data) - layout.unicode_offset):
+                unicode_map = self._parse_unicode_table(
+                    data, layout.unicode_offset, layout.glyph_count, is_psf1=layout.is_psf1
+                )
             total_mappings = sum(len(mappings) for mappings in unicode_map.values())
-            font.meta["unicode_glyphs"] = len(unicode_map)
-            font.meta["unicode_mappings"] = total_mappings
+            meta["unicode_glyphs"] = len(unicode_map)
+            meta["unicode_mappings"] = total_mappings
 
-        # Map glyphs to characters
-        for i, glyph_data in enumerate(raw_glyphs):
+        # Work out which characters use each glyph
+        chars_by_glyph = {}
+        for i in range(layout.glyph_count):
             if i in unicode_map:
-                for unicode_val in unicode_map[i]:
-                    font.glyphs[chr(unicode_val)] = glyph_data
-            else:
+                chars = unicode_map[i]
+            elif i < 256:
                 # Fallback for glyphs not in the unicode map
-                if i < 256:
-                    print(
-                        f"Warning: Glyph {i} (0x{i:02X}) has no Unicode mapping in {font.meta['file_name']}, using fallback chr({i})",
-                        file=sys.stderr,
-                    )
-                    font.glyphs[chr(i)] = glyph_data
+                print(
+                    f"Warning: Glyph {i} (0x{i:02X}) has no Unicode mapping in {meta['file_name']}, "
+                    f"using fallback chr({i})",
+                    file=sys.stderr,
+                )
+                chars = [chr(i)]
+            else:
+                continue
+            if codepoints is not None:
+                chars = [char for char in chars if char in codepoints]
+            if chars:
+                chars_by_glyph[i] = chars
+
+        with stats.span("decode", file_name, len(chars_by_glyph) * layout.char_size):
+            raw_glyphs = self._read_glyphs(
+                data,
+                layout.offset,
+                layout.glyph_count,
+                layout.height,
+                layout.width,
+                layout.char_size,
+                layout.bytes_per_row,
+                chars_by_glyph,
+            )
+
+        glyphs = {}
+        for i, chars in chars_by_glyph.items():
+            glyph = raw_glyphs[i]
+            for char in chars:
+                glyphs[char] = glyph
+
+        return glyphs
 
     def _read_glyphs(
-        self, offset: int, glyph_count: int, height: int, width: int, char_size: int, bytes_per_row: int
-    ) -> list[tuple[tuple[bool, ...], ...]]:
-        """Read glyphs and return as a list of pixel arrays (as tuples for hashability)."""
-        data_pos = offset
-        all_glyphs = []
-
-        for glyph_idx in range(glyph_count):
-            glyph_pixels = []
-
-            for y in range(height):
-                row_pixels = []
-                x = 0
-
-                for byte_idx in range(bytes_per_row):
-                    if data_pos < len(self.data):
-                        byte_value = self.data[data_pos]
-                        data_pos += 1
-                    else:
-                        byte_value = 0
-
-                    for bit in range(8):
-                        if x < width:
-                            pixel_on = bool(byte_value & (1 << (7 - bit)))
-                            row_pixels.append(pixel_on)
-                            x += 1
-
-                glyph_pixels.append(tuple(row_pixels))
-
-            all_glyphs.append(tuple(glyph_pixels))
-        return all_glyphs
-
-    def _parse_unicode_table(self, offset: int, glyph_count: int, is_psf1: bool = False) -> dict[int, list[int]]:
-        """Parse PSF1/PSF2 unicode mapping table and return a dictionary."""
-
-        pos = offset
-        unicode_map = {}
+        self,
+        data: bytes,
+        offset: int,
+        glyph_count: int,
+        height: int,
+        width: int,
+        char_size: int,
+        bytes_per_row: int,
+        indices: Iterable[int],
+    ) -> dict[int, Glyph]:
+        """Read the glyphs at the given indices as packed bitmaps, sliced straight from the glyph block."""
+        size = glyph_count * char_size
+        with memoryview(data) as view:
+            block = view[offset : offset + size].tobytes()
+        if len(block) < size:
+            block += bytes(size - len(block))
+        block = mask_padding(block, width, bytes_per_row)
+
+        return {i: Glyph(width, height, block[i * char_size : (i + 1) * char_size]) for i in indices}
+
+    def _parse_unicode_table(
+        self, data: bytes, offset: int, glyph_count: int, is_psf1: bool = False
+    ) -> dict[int, list[str]]:
+        """
+        Parse the PSF1/PSF2 unicode table into a glyph index -> mappings dict.
+
+        Each glyph's entry is a list of single codepoints, optionally followed
+        by sequences that each start with a separator (0xFFFE in PSF1, 0xFE in
+        PSF2) and the entry ends with a terminator (0xFFFF / 0xFF). Single
+        codepoints become one-character strings; a sequence stays together
+        as one multi-character string, e.g. a letter plus combining accent.
+        """
+        with memoryview(data) as view:
+            table = view[offset:].tobytes()
 
         if is_psf1:
-            # PSF1: Each glyph's mapping ends with 0xFFFF (16-bit)
-            for glyph_idx in range(glyph_count):
-                unicode_list = []
-
-                while pos + 1 < len(self.data):
-                    # Read 16-bit little-endian value
-                    val = self.data[pos] | (self.data[pos + 1] << 8)
-                    pos += 2
-
-                    if val == 0xFFFF:  # End of this glyph's mappings
-                        break
-                    elif val == 0xFFFE:  # Sequence separator
-                        # In PSF1, sequences are separated by 0xFFFE
-                        continue
-                    else:
-                        unicode_list.append(val)
-
-                if unicode_list:
-                    unicode_map[glyph_idx] = unicode_list
-
+            # PSF1 stores UCS-2 little-endian values
+            values = array("H")
+            values.frombytes(table[: len(table) & ~1])
+            if sys.byteorder == "big":
+                values.byteswap()
+            text = "".join(map(chr, values))
+            terminator, separator = "\uffff", "\ufffe"
+            decode = str
         else:
-            # PSF2: UTF-8 encoded, each glyph's mapping ends with 0xFF
-            for glyph_idx in range(glyph_count):
-                unicode_list = []
-                sequence_bytes = []
-
-                while pos < len(self.data):
-                    byte = self.data[pos]
-                    pos += 1
-
-                    if byte == 0xFF:  # End of this glyph's mappings
-                        # Process any remaining bytes
-                        if sequence_bytes:
-                            try:
-                                utf8_str = bytes(sequence_bytes).decode("utf-8")
-                                for char in utf8_str:
-                                    unicode_list.append(ord(char))
-                            except UnicodeDecodeError:
-                                pass
-                        break
-                    elif byte == 0xFE:  # Sequence separator
-                        # Process accumulated bytes before separator
-                        if sequence_bytes:
-                            try:
-                                utf8_str = bytes(sequence_bytes).decode("utf-8")
-                                for char in utf8_str:
-                                    unicode_list.append(ord(char))
-                            except UnicodeDecodeError:
-                                pass
-                            sequence_bytes = []
-                    else:
-                        sequence_bytes.append(byte)
-
-                if unicode_list:
-                    unicode_map[glyph_idx] = unicode_list
+            # PSF2 stores UTF-8, decoded all at once: 0xFE and 0xFF can't occur
+            # in UTF-8, so they (and any invalid bytes) come out as escapes
+            text = table.decode("utf-8", "surrogateescape")
+            terminator, separator = "\udcff", "\udcfe"
+            decode = _drop_invalid if _INVALID_UTF8.search(text) else str
+
+        unicode_map = {}
+        for glyph_idx, entry in enumerate(text.split(terminator, glyph_count)[:glyph_count]):
+            if separator not in entry:
+                mappings = list(decode(entry))
+            else:
+                singles, *sequences = map(decode, entry.split(separator))
+                mappings = list(singles) + [sequence for sequence in sequences if sequence]
+            if mappings:
+                unicode_map[glyph_idx] = mappings
 
         return unicode_map
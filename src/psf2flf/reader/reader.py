@@ -1,19 +1,67 @@
 from abc import ABC, abstractmethod
 from pathlib import Path
 
+from ..codepoints import Codepoints
 from ..font import Font
+from .source import decompress, font_suffix, open_data, read_head
 
 
 class Reader(ABC):
-    """Base class for font readers."""
+    """
+    Base class for font readers.
 
-    @staticmethod
-    @abstractmethod
-    def can_open(path: Path) -> bool:
+    Readers declare the magic numbers they handle, or for formats without
+    one, the file extensions, so the dispatcher in `psf2flf.reader` can pick
+    one from a single look at the file and hand it the already-open data.
+    """
+
+    magic: tuple[bytes, ...] = ()
+    extensions: tuple[str, ...] = ()
+
+    def sniff(self, head: bytes, path: Path) -> bool:
+        """Returns True if the data starts with one of this reader's magic numbers."""
+        return any(head[: len(magic)] == magic for magic in self.magic)
+
+    def can_open(self, path: Path) -> bool:
         """Returns True if the reader can open the given file path."""
-        pass
+        try:
+            head = read_head(path)
+        except OSError:
+            return False
+        return self.sniff(head, path) or (not self.magic and font_suffix(path) in self.extensions)
+
+    def read(self, path: Path, lazy: bool = False, codepoints: Codepoints | None = None) -> Font:
+        """
+        Reads the font from the given path and returns a Font object, deferring glyph decoding if lazy.
+
+        With `codepoints`, only the characters it contains are kept, and the others are never decoded.
+        """
+        if lazy:
+            return self.parse_lazy(read_head(path), path, codepoints)
+        with open_data(path) as data:
+            return self.parse(data, path, codepoints)
+
+    def loads(self, data: bytes, name: str = "", codepoints: Codepoints | None = None) -> Font:
+        """
+        Reads a font from its file contents in memory, gzipped or not.
+
+        `name` stands in for the file name, which some formats take metadata from.
+        """
+        return self.parse(decompress(data), Path(name), codepoints)
 
     @abstractmethod
-    def read(self, path: Path) -> Font:
-        """Reads the font from the given path and returns a Font object."""
-        pass
+    def parse(self, data: bytes, path: Path, codepoints: Codepoints | None = None) -> Font:
+        """
+        Parses a whole font file's (decompressed) contents. `path` is used for naming and metadata.
+
+        Glyphs for characters not in `codepoints`, if given, are skipped before their bitmaps are decoded.
+        """
+
+    def parse_lazy(self, head: bytes, path: Path, codepoints: Codepoints | None = None) -> Font:
+        """
+        Parses a font from the first `source.HEAD_SIZE` bytes of its file, loading glyphs later.
+
+        Readers without a cheap header (BDF, PCF and FLF) aren't lazy at all:
+        they ignore `head`, open the file again and parse the whole font now.
+        """
+        return self.read(path, codepoints=codepoints)
@@ -0,0 +1,145 @@
+import gzip
+import mmap
+import os
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from .. import stats
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+# Bytes read up front to identify a file and parse cheap headers
+HEAD_SIZE = 64
+
+
+def font_suffix(path: Path) -> str:
+    """The file extension that identifies a font's format, ignoring any .gz compression suffix."""
+    suffixes = [suffix.lower() for suffix in path.suffixes]
+    if suffixes and suffixes[-1] == ".gz":
+        suffixes.pop()
+    return suffixes[-1] if suffixes else ""
+
+
+def gunzip(data: bytes) -> bytes:
+    """
+    Decompress a whole gzip file in memory.
+
+    Each member is inflated by a single zlib call, which is much cheaper than
+    going through GzipFile for small files, and releases the GIL so it can
+    run on a background thread.
+    """
+    members = []
+    while data:
+        inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        members.append(inflater.decompress(data))
+        if not inflater.eof:
+            raise EOFError("Compressed file ended before the end-of-stream marker was reached")
+        data = inflater.unused_data
+        if not data.strip(b"\x00"):
+            break  # trailing padding, which gzip allows
+    return b"".join(members)
+
+
+def decompress(data: bytes) -> bytes:
+    """Decompress font data held in memory if it's gzipped, otherwise return it as is."""
+    return gunzip(data) if data[: len(GZIP_MAGIC)] == GZIP_MAGIC else data
+
+
+def _is_gzip(f) -> bool:
+    magic = f.read(len(GZIP_MAGIC))
+    f.seek(0)
+    return magic == GZIP_MAGIC
+
+
+@contextmanager
+def open_data(path: Path) -> Iterator[bytes]:
+    """
+    Open a font file once and get its contents.
+
+    Gzip-compressed files (detected by their magic number, not their name)
+    are decompressed to bytes; anything else is a read-only memory map that
+    is closed on exit, so nothing read from it should be a view that
+    outlives the block. Mapped pages are only read from disk as they're
+    touched, so that time counts towards whichever stage touches them; the
+    "map" span covers setting the mapping up.
+    """
+    with open(path, "rb") as f:
+        if _is_gzip(f):
+            yield _gunzip_file(f.read, path)
+            return
+
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            yield b""
+            return
+
+        with stats.span("map", path, size):
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        with data:
+            yield data
+
+
+def read_head(path: Path, size: int = HEAD_SIZE) -> bytes:
+    """Read (and decompress, if needed) just the first `size` bytes of a font file."""
+    with open(path, "rb") as f:
+        if _is_gzip(f):
+            with gzip.GzipFile(fileobj=f) as gz:
+                return gz.read(size)
+        return f.read(size)
+
+
+def load_data(path: Path) -> bytes:
+    """Read a font file's whole (decompressed) contents into memory."""
+    with open(path, "rb") as f:
+        if _is_gzip(f):
+            return _gunzip_file(f.read, path)
+        with stats.span("read", path) as span:
+            data = f.read()
+            span.bytes = len(data)
+        return data
+
+
+def _gunzip_file(read, path: Path) -> bytes:
+    """Read and decompress a gzip file, timing each step."""
+    with stats.span("read", path) as span:
+        compressed = read()
+        span.bytes = len(compressed)
+    with stats.span("gunzip", path) as span:
+        data = gunzip(compressed)
+        span.bytes = len(data)
+    return data
+
+
+def prefetch(paths: Iterable[Path], workers: int = 4) -> Iterator[tuple[Path, bytes | Exception]]:
+    """
+    Load and decompress files on a thread pool, yielding (path, data) in order.
+
+    Up to `2 * workers` files are read ahead while the caller works on the
+    current one. Files that can't be read yield the exception instead of
+    their data.
+    """
+
+    def load(path: Path) -> bytes | Exception:
+        try:
+            return load_data(path)
+        except Exception as e:
+            return e
+
+    paths = iter(paths)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for path in paths:
+            pending.append((path, pool.submit(load, path)))
+            if len(pending) >= 2 * workers:
+                break
+
+        while pending:
+            path, future = pending.popleft()
+            next_path = next(paths, None)
+            if next_path is not None:
+                pending.append((next_path, pool.submit(load, next_path)))
+            yield path, future.result()
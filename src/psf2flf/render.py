@@ -0,0 +1,75 @@
+import sys
+
+from .font import Font, Glyph
+from .writer.flf import FLFWriter
+
+_writer = FLFWriter()
+
+
+class TextRenderer:
+    """
+    Renders text in a font as block characters, without going through FLF.
+
+    Output is laid out the way figlet shows the FLF output: one blank column
+    after each character, "?" for ASCII characters the font lacks (other
+    missing characters are left out), and a band of rows for each line of
+    input. Each glyph's rows are rendered once and reused, so rendering is a
+    join over precomputed strings and takes time proportional to the length
+    of the text.
+    """
+
+    def __init__(self, font: Font, tall_mode: bool = False):
+        self.font = font
+        self.tall_mode = tall_mode
+        self._by_char: dict[str, tuple[str, ...]] = {}
+        self._by_glyph: dict = {}
+
+        fallback = font.glyphs.get("?")
+        self._fallback = fallback if fallback is not None else Glyph.blank(font.width, font.height)
+        self.height = len(self._glyph_rows(self._fallback))
+
+    def _glyph_rows(self, glyph) -> tuple[str, ...]:
+        rows = self._by_glyph.get(glyph)
+        if rows is None:
+            lines = _writer._render_block_glyph(glyph, self.font.width, self.font.height, self.tall_mode)
+            rows = self._by_glyph[glyph] = tuple(line + " " for line in lines)
+        return rows
+
+    def rows(self, char: str) -> tuple[str, ...]:
+        """The rendered rows of one character, including its spacing column, or none if it's skipped."""
+        rows = self._by_char.get(char)
+        if rows is None:
+            glyph = self.font.glyphs.get(char)
+            if glyph is None:
+                # The FLF output only fills in missing ASCII, so that's all figlet
+                # draws as "?". Other missing characters aren't cached, so the
+                # cache can't grow past the font's characters and ASCII.
+                if not " " <= char <= "~":
+                    return ()
+                glyph = self._fallback
+            rows = self._by_char[char] = self._glyph_rows(glyph)
+        return rows
+
+    def max_size(self) -> int:
+        """Approximate memory the rendered rows can grow to, not counting the font itself."""
+        unique = len({id(glyph): glyph for glyph in self.font.glyphs.values()}) + 1
+        row = sys.getsizeof("█" * (self.font.width + 1))
+        by_glyph = unique * (sys.getsizeof((row,) * self.height) + self.height * row)
+        by_char = sys.getsizeof(dict.fromkeys(range(len(self.font.glyphs) + 95)))
+        return by_glyph + by_char + sys.getsizeof(dict.fromkeys(range(unique)))
+
+    def render_line(self, line: str) -> str:
+        """Render a single line of text, without newlines, to `height` rows."""
+        chars = [rows for rows in map(self.rows, line) if rows]
+        if not chars:
+            return "\n" * self.height
+        return "".join("".join(row) + "\n" for row in zip(*chars))
+
+    def render(self, text: str) -> str:
+        """Render text, which may span several lines."""
+        return "".join(map(self.render_line, text.splitlines()))
+
+
+def render(font: Font, text: str, tall_mode: bool = False) -> str:
+    """Render text in a font as block characters. See `TextRenderer`."""
+    return TextRenderer(font, tall_mode).render(text)
@@ -0,0 +1,272 @@
+import asyncio
+import json
+import os
+import sys
+from collections import OrderedDict
+from pathlib import Path
+
+from .font import Font
+from .reader import read
+from .render import TextRenderer
+from .writer import process_cache
+from .writer.flf import FLFWriter
+
+# Default memory budget for parsed fonts and generated FLF text
+DEFAULT_CACHE_BYTES = 256 * 1024 * 1024
+
+# Longest request line accepted, in bytes
+MAX_REQUEST = 1024 * 1024
+
+
+def font_size(font: Font) -> int:
+    """Approximate memory used by a parsed font, counting shared glyphs once."""
+    size = sys.getsizeof(font.glyphs) + sum(sys.getsizeof(char) for char in font.glyphs)
+    for glyph in {id(glyph): glyph for glyph in font.glyphs.values()}.values():
+        size += sys.getsizeof(glyph) + sys.getsizeof(getattr(glyph, "data", b""))
+    return size
+
+
+class FontCache:
+    """
+    LRU cache of parsed fonts, their FLF output and text renderers, bounded
+    by memory rather than entry count. Renderers are counted at the most
+    their rendered rows can grow to, and evicted along with their font.
+
+    Entries are keyed by the font file's resolved path and checked against
+    its size and mtime, so a font that changes on disk is loaded again.
+    Fonts are read on a worker thread, and concurrent requests for the same
+    font share one load.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._loading: dict = {}
+        self._writer = FLFWriter()
+
+    async def font(self, path: Path) -> Font:
+        """Get a parsed font."""
+        return await self._get(path, "font", lambda: read(path), font_size)
+
+    async def flf(self, path: Path, tall_mode: bool = False) -> str:
+        """Get a font's FLF text, generating it from the cached font if needed."""
+        font = await self.font(path)
+        return await self._get(
+            path,
+            ("flf", tall_mode),
+            lambda: self._writer.dumps(font, tall_mode, process_cache()),
+            sys.getsizeof,
+        )
+
+    async def renderer(self, path: Path, tall_mode: bool = False) -> TextRenderer:
+        """Get a text renderer for a font, which keeps the rows of the glyphs it has drawn."""
+        font = await self.font(path)
+        return await self._get(
+            path,
+            ("renderer", tall_mode),
+            lambda: TextRenderer(font, tall_mode),
+            TextRenderer.max_size,
+        )
+
+    async def _get(self, path: Path, kind, load, sizeof):
+        path = path.resolve()
+        stat = path.stat()
+        key = (str(path), kind)
+        version = (stat.st_size, stat.st_mtime_ns)
+
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == version:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+        # Share a load that's already running for the same file version
+        loading_key = (key, version)
+        task = self._loading.get(loading_key)
+        if task is None:
+            self.misses += 1
+            task = self._loading[loading_key] = asyncio.ensure_future(asyncio.to_thread(load))
+            task.add_done_callback(lambda _: self._loading.pop(loading_key, None))
+        value = await task
+
+        self._store(key, version, value, sizeof(value))
+        return value
+
+    def _store(self, key, version, value, size: int):
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.size -= old[2]
+        self._entries[key] = (version, value, size)
+        self.size += size
+
+        # Evict least recently used entries, but always keep the newest one.
+        # Renderers hold their font, so they go with it.
+        while self.size > self.max_bytes and len(self._entries) > 1:
+            (path, kind), (_, _, evicted_size) = self._entries.popitem(last=False)
+            self.size -= evicted_size
+            if kind == "font":
+                for tall_mode in (False, True):
+                    renderer = self._entries.pop((path, ("renderer", tall_mode)), None)
+                    if renderer is not None:
+                        self.size -= renderer[2]
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+async def handle_request(cache: FontCache, request: dict) -> dict:
+    """
+    Handle one request, returning the response.
+
+    Requests are objects with an "op" of "flf" (the font as FLF text),
+    "render" (the "text" drawn in the font) or "stats" (cache counters),
+    a "font" path for the first two, and an optional "tall" flag. Any "id"
+    is echoed back so responses can be matched to requests, since they're
+    sent as soon as each one is done.
+    """
+    response = {"id": request.get("id")} if "id" in request else {}
+    try:
+        op = request.get("op", "render")
+        tall_mode = bool(request.get("tall", False))
+        if op == "stats":
+            result = cache.stats
+        elif op == "flf":
+            result = await cache.flf(Path(request["font"]), tall_mode)
+        elif op == "render":
+            renderer = await cache.renderer(Path(request["font"]), tall_mode)
+            result = renderer.render(str(request["text"]))
+        else:
+            raise ValueError(f"Unknown op: {op}")
+    except KeyError as e:
+        response.update(ok=False, error=f"Missing field: {e.args[0]}")
+    except Exception as e:
+        response.update(ok=False, error=str(e))
+    else:
+        response.update(ok=True, result=result)
+    return response
+
+
+async def serve_stream(cache: FontCache, reader: asyncio.StreamReader, write):
+    """
+    Answer JSON-lines requests from `reader` until it's closed, handling them
+    concurrently. `write` is an async function that sends one response line.
+    """
+    lock = asyncio.Lock()
+    tasks = set()
+
+    async def send(response: dict):
+        data = json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n"
+        async with lock:
+            await write(data)
+
+    async def respond(line: bytes):
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("not a JSON object")
+        except ValueError as e:
+            await send({"ok": False, "error": f"Bad request: {e}"})
+        else:
+            await send(await handle_request(cache, request))
+
+    while True:
+        try:
+            line = await reader.readline()
+        except ValueError:  # longer than the reader's limit, and already discarded
+            await send({"ok": False, "error": "Bad request: too long"})
+            continue
+        if not line:
+            break
+        if not line.strip():
+            continue
+        task = asyncio.ensure_future(respond(line))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    if tasks:
+        await asyncio.gather(*tasks)
+
+
+async def _feed_from_thread(reader: asyncio.StreamReader, stream):
+    """Copy a blocking binary stream into `reader`, reading it on a worker thread."""
+    while data := await asyncio.to_thread(stream.read1, 65536):
+        reader.feed_data(data)
+    reader.feed_eof()
+
+
+async def serve_stdio(cache: FontCache):
+    """
+    Serve requests from stdin, writing responses to stdout.
+
+    Pipes and sockets are read by the event loop; anything else, like a
+    redirected file, is read on a worker thread. Responses are written on a
+    worker thread too, so a slow reader doesn't stall other requests.
+    """
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader(limit=MAX_REQUEST)
+    feeder = None
+    try:
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+    except ValueError:  # not a pipe or socket
+        feeder = asyncio.ensure_future(_feed_from_thread(reader, sys.stdin.buffer))
+    stdout = sys.stdout.buffer
+
+    def write_blocking(data: bytes):
+        stdout.write(data)
+        stdout.flush()
+
+    async def write(data: bytes):
+        await asyncio.to_thread(write_blocking, data)
+
+    await serve_stream(cache, reader, write)
+    if feeder is not None:
+        await feeder
+
+
+async def serve_unix(cache: FontCache, socket_path: Path):
+    """Serve requests from each connection to a UNIX socket, until cancelled."""
+
+    async def connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        async def write(data: bytes):
+            writer.write(data)
+            await writer.drain()
+
+        try:
+            await serve_stream(cache, reader, write)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    if socket_path.is_socket():
+        socket_path.unlink()
+    server = await asyncio.start_unix_server(connection, path=str(socket_path), limit=MAX_REQUEST)
+    print(f"Listening on {socket_path}", file=sys.stderr)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        if socket_path.is_socket():
+            os.unlink(socket_path)
+
+
+def serve(socket_path: Path | None = None, max_bytes: int = DEFAULT_CACHE_BYTES):
+    """Run the server on stdin/stdout, or on a UNIX socket if given a path."""
+    cache = FontCache(max_bytes)
+    try:
+        if socket_path is None:
+            asyncio.run(serve_stdio(cache))
+        else:
+            asyncio.run(serve_unix(cache, socket_path))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,156 @@
+import json
+import time
+from collections import defaultdict
+from pathlib import Path
+
+
+class Span:
+    """The wall time and byte count of one stage of work on one file."""
+
+    __slots__ = ("stage", "file", "bytes", "start", "seconds")
+
+    def __init__(self, stage: str, file, size: int = 0):
+        self.stage = stage
+        self.file = str(file) if file is not None else ""
+        self.bytes = size
+        self.start = 0.0
+        self.seconds = 0.0
+
+    def __enter__(self) -> "Span":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.seconds = time.perf_counter() - self.start
+        if _spans is not None:
+            _spans.append(self)
+
+    def to_dict(self, origin: float = 0.0) -> dict:
+        return {
+            "stage": self.stage,
+            "file": self.file,
+            "bytes": self.bytes,
+            "start": self.start - origin,
+            "seconds": self.seconds,
+        }
+
+
+class _NoSpan:
+    """Stands in for a Span while stats are off, ignoring everything."""
+
+    __slots__ = ()
+
+    @property
+    def bytes(self) -> int:
+        return 0
+
+    @bytes.setter
+    def bytes(self, value: int):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+# Recorded spans, or None when stats are off
+_spans: list[Span] | None = None
+
+
+def enable():
+    """Start recording spans, discarding any recorded before."""
+    global _spans
+    _spans = []
+
+
+def disable() -> list[Span]:
+    """Stop recording and return what was recorded."""
+    global _spans
+    spans, _spans = _spans or [], None
+    return spans
+
+
+def enabled() -> bool:
+    return _spans is not None
+
+
+def span(stage: str, file=None, size: int = 0) -> Span | _NoSpan:
+    """
+    Time a stage of work on a file, as a context manager.
+
+    The byte count can be passed in or set on the span inside the block.
+    While stats are off this returns a shared object that does nothing, so
+    instrumented code costs a function call and a global lookup.
+    """
+    if _spans is None:
+        return _NO_SPAN
+    return Span(stage, file, size)
+
+
+def add(spans: list[Span]):
+    """Record spans collected elsewhere, e.g. in a worker process."""
+    if _spans is not None:
+        _spans.extend(spans)
+
+
+class collecting:
+    """
+    Wrap a function so it records spans in whatever process it runs in, and
+    returns them along with its result as `(result, spans)`.
+    """
+
+    def __init__(self, func):
+        self.func = func
+
+    def __call__(self, *args, **kwargs):
+        enable()
+        try:
+            return self.func(*args, **kwargs), _spans
+        finally:
+            disable()
+
+
+def _format_bytes(size: int) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def summary(spans: list[Span], wall_time: float, slowest: int = 10) -> str:
+    """A table of totals per stage, followed by the slowest files."""
+    stages = defaultdict(lambda: [set(), 0, 0.0])
+    files = defaultdict(float)
+    for s in spans:
+        totals = stages[s.stage]
+        totals[0].add(s.file)
+        totals[1] += s.bytes
+        totals[2] += s.seconds
+        files[s.file] += s.seconds
+
+    lines = [f"{'Stage':<12}{'Files':>8}{'Bytes':>12}{'Time':>12}{'Share':>8}"]
+    for stage, (stage_files, size, seconds) in sorted(stages.items(), key=lambda item: -item[1][2]):
+        share = seconds / wall_time * 100 if wall_time else 0
+        lines.append(
+            f"{stage:<12}{len(stage_files):>8}{_format_bytes(size):>12}{seconds * 1000:>10.1f}ms{share:>7.1f}%"
+        )
+    lines.append(f"{'wall time':<32}{wall_time * 1000:>10.1f}ms")
+
+    if files:
+        lines.append("")
+        lines.append("Slowest files:")
+        for file, seconds in sorted(files.items(), key=lambda item: -item[1])[:slowest]:
+            lines.append(f"{seconds * 1000:>10.1f}ms  {file}")
+
+    return "\n".join(lines)
+
+
+def write_trace(path: Path, spans: list[Span], wall_time: float):
+    """Write every span as JSON, with start times relative to the first one."""
+    origin = min((s.start for s in spans), default=0.0)
+    data = {"wall_time": wall_time, "spans": [s.to_dict(origin) for s in sorted(spans, key=lambda s: s.start)]}
+    path.write_text(json.dumps(data, indent=1) + "\n", encoding="utf-8")
@@ -1,3 +1,10 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from . import stats
+
+
 def print_dict(data: dict, prefix: str = ""):
     """Recursively prints the key-value pairs of a dictionary."""
     for key, value in data.items():
@@ -6,3 +13,40 @@ def print_dict(data: dict, prefix: str = ""):
             print_dict(value, new_prefix)
         else:
             print(f"{new_prefix}: {value}")
+
+
+def parallel_map(func, items, jobs: int = 1):
+    """
+    Map `func` over `items`, yielding results in input order.
+
+    Runs in-process when `jobs` is 1, otherwise on a pool of `jobs` worker
+    processes (0 means one per CPU), in which case `func` and the items must
+    be picklable. Only a few items per worker are submitted ahead of the
+    results being consumed, so `items` can be a lazy iterator of large values.
+    """
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    if jobs <= 1:
+        yield from map(func, items)
+        return
+
+    # Workers can't record into this process's stats, so they send theirs back
+    collect = stats.enabled()
+    if collect:
+        func = stats.collecting(func)
+
+    def result(future):
+        if not collect:
+            return future.result()
+        value, spans = future.result()
+        stats.add(spans)
+        return value
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        pending = deque()
+        for item in items:
+            pending.append(pool.submit(func, item))
+            if len(pending) >= 2 * jobs:
+                yield result(pending.popleft())
+        while pending:
+            yield result(pending.popleft())
@@ -1,6 +1,8 @@
 from pathlib import Path
+from typing import IO
 
 from ..font import Font
+from .cache import RenderCache, process_cache as process_cache
 from .flf import FLFWriter
 from .writer import Writer
 
@@ -10,10 +12,15 @@ _writers: list[Writer] = [
 ]
 
 
-def write(font: Font, path: Path, tall_mode: bool = False):
-    """Writes a font to the given path using the appropriate writer."""
+def write(font: Font, path: Path, tall_mode: bool = False, cache: RenderCache | None = None, stream: IO | None = None):
+    """
+    Writes a font to the given path using the appropriate writer.
+
+    If a stream is given, the writer is still chosen by path but the output
+    goes to the stream instead of the file.
+    """
     for writer in _writers:
         if writer.can_write(path):
-            writer.write(font, path, tall_mode)
+            writer.write(font, path if stream is None else stream, tall_mode, cache)
             return
     raise ValueError(f"No writer found for file: {path}")
@@ -0,0 +1,60 @@
+import threading
+from collections import OrderedDict
+
+
+class RenderCache:
+    """
+    Bounded LRU cache of rendered glyph blocks.
+
+    Keys identify a glyph and how it was rendered, values are the finished
+    text for that glyph. One cache can be shared between several writes so
+    fonts with identical bitmaps only render them once, including writes
+    running on different threads.
+    """
+
+    def __init__(self, maxsize: int = 8192):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value for `key`, or None if it's missing."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        """Store `value`, evicting the least recently used entry if full. Returns `value`."""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_process_cache: RenderCache | None = None
+
+
+def process_cache() -> RenderCache:
+    """Get a cache shared by everything rendered in this process, e.g. by a pool worker."""
+    global _process_cache
+    if _process_cache is None:
+        _process_cache = RenderCache()
+    return _process_cache
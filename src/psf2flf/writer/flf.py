@@ -1,15 +1,51 @@
+import io
+import os
 from pathlib import Path
+from typing import IO, Iterable, Iterator
 
-from ..font import Font
+from .. import stats
+from ..font import Font, Glyph
+from .cache import RenderCache
 from .writer import Writer
 
+# Each byte's 8 pixels as full blocks and spaces, most significant bit first
+_FULL_BLOCKS = ["".join("█" if byte & (0x80 >> bit) else " " for bit in range(8)) for byte in range(256)]
+
+# Each byte's 8 bits moved into 8 hex digits, so 0b101 becomes 0x101
+_SPREAD = [int(f"{byte:08b}", 16) for byte in range(256)]
+
+# Hex digit (top pixel * 2 + bottom pixel) to half block character
+_HALF_BLOCKS = str.maketrans("0123", " ▄▀█")
+
 
 class FLFWriter(Writer):
     @staticmethod
     def can_write(path: Path) -> bool:
         return path.suffix == ".flf"
 
-    def write(self, font: Font, output_path: Path, tall_mode: bool = False):
+    def write(self, font: Font, output: Path | IO, tall_mode: bool = False, cache: RenderCache | None = None):
+        """Write `font` as FLF to a path, or to an open text or binary stream (encoded as UTF-8)."""
+        batches = _batched(self._flf_chunks(font, tall_mode, cache))
+
+        # Timed against the input file, so a font's stages add up in the stats
+        with stats.span("render", font.meta.get("file_name")) as span:
+            if isinstance(output, (str, os.PathLike)):
+                with Path(output).open("wb") as f:
+                    f.writelines(batch.encode("utf-8") for batch in batches)
+                    span.bytes = f.tell()
+            elif _is_binary(output):
+                start = output.tell() if stats.enabled() and output.seekable() else None
+                output.writelines(batch.encode("utf-8") for batch in batches)
+                if start is not None:
+                    span.bytes = output.tell() - start
+            else:
+                output.writelines(batches)
+
+    def _flf_chunks(self, font: Font, tall_mode: bool, cache: RenderCache | None) -> Iterator[str]:
+        """Generate the FLF file: the header, then one chunk per character."""
+        if cache is None:
+            cache = RenderCache()
+
         height = font.meta["height"]
         width = font.meta["width"]
         fig_height, max_length, _ = self._calculate_flf_dimensions(width, height, tall_mode)
@@ -17,57 +53,54 @@ class FLFWriter(Writer):
         hardblank = "$"
         layout = 0
 
-        # Get the default glyph for fallback
-        default_glyph_data = font.glyphs.get("?")
-
-        # Prepare ASCII glyphs (32-126)
-        ascii_glyphs = []
-        for i in range(32, 127):
-            char = chr(i)
-            glyph = font.glyphs.get(char, default_glyph_data)
-            if glyph is None:
-                # Create a blank glyph if no default and no specific glyph
-                glyph = [[False for _ in range(width)] for _ in range(height)]
-            ascii_glyphs.append(glyph)
-
-        # Collect extended glyphs (outside 32-126)
-        extended_glyphs = {}
-        for char, glyph_data in font.glyphs.items():
-            cp = ord(char)
-            if not (32 <= cp <= 126):
-                extended_glyphs[cp] = glyph_data
-
-        # Sort extended glyphs by codepoint
-        sorted_extended_codepoints = sorted(extended_glyphs.keys())
-
-        # Total number of characters to write
-        total_chars_to_write = len(ascii_glyphs) + len(sorted_extended_codepoints)
-
-        with output_path.open("w", encoding="utf-8") as f:
-            # Write FLF header with the correct number of characters
-            f.write(
-                f"flf2a{hardblank} {fig_height} {fig_height - 1} {max_length} -1 {layout} 0 1 {total_chars_to_write}\n"
-            )
-
-            # Write ASCII glyphs (32-126) - no 0x prefix
-            for glyph_data in ascii_glyphs:
-                rendered = self._render_block_glyph(glyph_data, width, height, tall_mode)
-                for i, line in enumerate(rendered):
-                    padded_line = line.replace(" ", hardblank).ljust(max_length, hardblank)
-                    terminator = "@" if i < len(rendered) - 1 else "@@"
-                    f.write(padded_line + terminator + "\n")
-
-            # Write extended glyphs - with 0x prefix
-            for cp in sorted_extended_codepoints:
-                glyph_data = extended_glyphs[cp]
-                rendered = self._render_block_glyph(glyph_data, width, height, tall_mode)
-
-                f.write(f"0x{cp:X}\n")  # Write character code line
-
-                for i, line in enumerate(rendered):
-                    padded_line = line.replace(" ", hardblank).ljust(max_length, hardblank)
-                    terminator = "@" if i < len(rendered) - 1 else "@@"
-                    f.write(padded_line + terminator + "\n")
+        # Missing ASCII characters are drawn as "?", or left blank if there's no "?" either
+        default_glyph = font.glyphs.get("?")
+        if default_glyph is None:
+            default_glyph = Glyph.blank(width, height)
+
+        # Extended characters (outside 32-126) in codepoint order, which is how
+        # single characters sort; multi-codepoint sequences have no FIGlet code
+        extended_chars = sorted(char for char in font.glyphs if len(char) == 1 and not " " <= char <= "~")
+
+        total_chars = 127 - 32 + len(extended_chars)
+        yield f"flf2a{hardblank} {fig_height} {fig_height - 1} {max_length} -1 {layout} 0 1 {total_chars}\n"
+
+        # ASCII glyphs (32-126) - no 0x prefix
+        for code in range(32, 127):
+            glyph = font.glyphs.get(chr(code), default_glyph)
+            yield self._render_flf_glyph(glyph, width, height, tall_mode, max_length, hardblank, cache)
+
+        # Extended glyphs - with a 0x code line
+        for char in extended_chars:
+            glyph = font.glyphs[char]
+            yield f"0x{ord(char):X}\n"
+            yield self._render_flf_glyph(glyph, width, height, tall_mode, max_length, hardblank, cache)
+
+    def _render_flf_glyph(
+        self,
+        glyph: Glyph,
+        width: int,
+        height: int,
+        tall_mode: bool,
+        max_length: int,
+        hardblank: str,
+        cache: RenderCache,
+    ) -> str:
+        """Render a glyph's padded, terminated FLF lines, reusing earlier renders of the same bitmap."""
+        key = (glyph, width, height, tall_mode, max_length, hardblank)
+        block = cache.get(key)
+        if block is not None:
+            return block
+
+        rendered = self._render_block_glyph(glyph, width, height, tall_mode)
+        if not rendered:
+            return cache.put(key, "")
+
+        # Rendered lines are exactly `width` wide, so they all get the same
+        # padding, and the spaces can become hardblanks in a single pass
+        padding = " " * (max_length - width)
+        block = (padding + "@\n").join(rendered) + padding + "@@\n"
+        return cache.put(key, block.replace(" ", hardblank))
 
     def _calculate_flf_dimensions(self, font_width: int, font_height: int, tall_mode: bool):
         if tall_mode:
@@ -81,39 +114,59 @@ class FLFWriter(Writer):
 
         return fig_height, max_length, display_width
 
-    def _render_block_glyph(self, pixel_array: list[list[bool]], width: int, height: int, tall_mode: bool) -> list[str]:
+    def _render_block_glyph(self, pixel_array: Glyph, width: int, height: int, tall_mode: bool) -> list[str]:
         if tall_mode:
             return self._render_full_pixels(pixel_array, width, height)
         else:
             return self._render_short_blocks(pixel_array, width, height)
 
-    def _render_short_blocks(self, pixel_array: list[list[bool]], width: int, height: int) -> list[str]:
+    def _render_short_blocks(self, pixel_array: Glyph, width: int, height: int) -> list[str]:
+        rows = _packed_rows(pixel_array, height)
         lines = []
         for y in range(0, height, 2):
-            line = ""
-            for x in range(width):
-                top_pixel = pixel_array[y][x] if y < height and x < width else False
-                bottom_pixel = pixel_array[y + 1][x] if y + 1 < height and x < width else False
-
-                if top_pixel and bottom_pixel:
-                    line += "█"
-                elif top_pixel:
-                    line += "▀"
-                elif bottom_pixel:
-                    line += "▄"
-                else:
-                    line += " "
-            lines.append(line)
+            top_row = rows[y]
+            bottom_row = rows[y + 1] if y + 1 < height else bytes(len(top_row))
+
+            # Spread both rows to one hex digit per pixel, top pixel in bit 1 and bottom in bit 0
+            value = 0
+            for top, bottom in zip(top_row, bottom_row):
+                value = (value << 32) | (_SPREAD[top] << 1) | _SPREAD[bottom]
+            digits = f"{value:0{len(top_row) * 8}x}"
+            lines.append(digits[:width].translate(_HALF_BLOCKS).ljust(width))
         return lines
 
-    def _render_full_pixels(self, pixel_array: list[list[bool]], width: int, height: int) -> list[str]:
-        lines = []
-        for y in range(height):
-            line = ""
-            for x in range(width):
-                if pixel_array[y][x]:
-                    line += "█"
-                else:
-                    line += " "
-            lines.append(line)
-        return lines
+    def _render_full_pixels(self, pixel_array: Glyph, width: int, height: int) -> list[str]:
+        rows = _packed_rows(pixel_array, height)
+        return ["".join([_FULL_BLOCKS[byte] for byte in row])[:width].ljust(width) for row in rows]
+
+
+# Characters of output joined into each write
+_BATCH_SIZE = 1 << 16
+
+
+def _batched(chunks: Iterable[str], size: int = _BATCH_SIZE) -> Iterator[str]:
+    """Join small chunks of text into strings of at least `size` characters, bar the last."""
+    batch = []
+    length = 0
+    for chunk in chunks:
+        batch.append(chunk)
+        length += len(chunk)
+        if length >= size:
+            yield "".join(batch)
+            batch.clear()
+            length = 0
+    if batch:
+        yield "".join(batch)
+
+
+def _is_binary(stream) -> bool:
+    """Guess whether a stream takes bytes rather than str."""
+    return isinstance(stream, (io.RawIOBase, io.BufferedIOBase)) or "b" in getattr(stream, "mode", "")
+
+
+def _packed_rows(glyph: Glyph, height: int) -> list[bytes]:
+    """Get `height` packed rows from a glyph, blank past its bottom edge."""
+    if not isinstance(glyph, Glyph):
+        glyph = Glyph.from_pixels(glyph)
+    blank = bytes(glyph.bytes_per_row)
+    return [glyph.row(y) if y < glyph.height else blank for y in range(height)]
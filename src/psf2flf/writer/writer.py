@@ -1,5 +1,7 @@
+import io
 from abc import ABC, abstractmethod
 from pathlib import Path
+from typing import IO
 
 from ..font import Font
 
@@ -14,6 +16,15 @@ class Writer(ABC):
         pass
 
     @abstractmethod
-    def write(self, font: Font, path: Path):
-        """Writes the font to the given path."""
+    def write(self, font: Font, path: Path | IO, tall_mode: bool = False, cache=None):
+        """
+        Writes the font to the given path or open text/binary stream, optionally
+        sharing a render cache with other writes.
+        """
         pass
+
+    def dumps(self, font: Font, tall_mode: bool = False, cache=None) -> str:
+        """Renders the font to a string instead of a file."""
+        buffer = io.StringIO()
+        self.write(font, buffer, tall_mode, cache)
+        return buffer.getvalue()
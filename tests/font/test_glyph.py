@@ -0,0 +1,60 @@
+import pickle
+
+import pytest
+
+from psf2flf.font import Glyph
+
+PIXELS = (
+    (True, False, False, True, False, False, False, False, False, True),
+    (False, True, True, False, False, False, False, False, True, False),
+    (False, False, False, False, False, False, False, False, False, False),
+)
+
+
+def test_round_trip_pixels():
+    glyph = Glyph.from_pixels(PIXELS)
+    assert glyph.width == 10
+    assert glyph.height == 3
+    assert glyph.bytes_per_row == 2
+    assert glyph.to_pixels() == PIXELS
+    assert tuple(glyph) == PIXELS
+
+
+def test_row_and_pixel_access():
+    glyph = Glyph.from_pixels(PIXELS)
+    assert glyph[0] == PIXELS[0]
+    assert glyph[-1] == PIXELS[2]
+    assert glyph.row(1) == bytes([0b01100000, 0b10000000])
+    assert glyph.pixel(9, 0)
+    assert not glyph.pixel(8, 0)
+    assert len(glyph) == 3
+    with pytest.raises(IndexError):
+        glyph[3]
+
+
+def test_padding_bits_are_ignored():
+    clean = Glyph.from_bytes(bytes([0xF0, 0x80]), 4, 2)
+    dirty = Glyph.from_bytes(bytes([0xFF, 0x8F]), 4, 2)
+    assert clean == dirty
+    assert hash(clean) == hash(dirty)
+    assert dirty.data == bytes([0xF0, 0x80])
+
+
+def test_equality_and_hashing():
+    glyph = Glyph.from_pixels(PIXELS)
+    same = Glyph(glyph.width, glyph.height, glyph.data)
+    assert glyph == same
+    assert len({glyph, same}) == 1
+    assert glyph != Glyph.blank(10, 3)
+    assert glyph != Glyph.from_bytes(glyph.data, 9, 3)
+    assert glyph != PIXELS
+
+
+def test_pickle():
+    glyph = Glyph.from_pixels(PIXELS)
+    assert pickle.loads(pickle.dumps(glyph)) == glyph
+
+
+def test_slots():
+    with pytest.raises(AttributeError):
+        Glyph.blank(8, 8).extra = 1
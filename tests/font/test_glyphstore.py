@@ -0,0 +1,56 @@
+from psf2flf.font import Font, FontDir, Glyph, GlyphStore, TypeFace
+
+
+def make_font(name, height, glyphs):
+    font = Font()
+    font.meta = {"name": name, "styles": frozenset(), "width": 8, "height": height}
+    font.glyphs = glyphs
+    return font
+
+
+def test_intern_returns_stored_copy():
+    store = GlyphStore()
+    first = Glyph.from_bytes(b"\x18\x3c", 8, 2)
+    copy = Glyph.from_bytes(b"\x18\x3c", 8, 2)
+
+    assert store.intern(first) is first
+    assert store.intern(copy) is first
+    assert store.intern(first) is first
+    assert len(store) == 1
+    assert store.stats["references"] == 3
+    assert store.stats["duplicates"] == 1
+    assert store.stats["saved_bytes"] > 0
+
+
+def test_intern_all_shares_objects_per_codepoint():
+    store = GlyphStore()
+    shared = Glyph.from_bytes(b"\xff\x00", 8, 2)
+    glyphs = {"A": shared, "Α": shared, "B": Glyph.from_bytes(b"\xff\x00", 8, 2)}
+
+    store.intern_all(glyphs)
+
+    assert glyphs["A"] is glyphs["Α"] is glyphs["B"]
+    assert store.stats == {"unique": 1, "references": 2, "duplicates": 1, "saved_bytes": store.saved_bytes}
+
+
+def test_fontdir_shares_store_across_typefaces():
+    fontdir = FontDir()
+    fontdir += make_font("One", 2, {"A": Glyph.from_bytes(b"\x10\x20", 8, 2)})
+    fontdir += make_font("Two", 2, {"A": Glyph.from_bytes(b"\x10\x20", 8, 2)})
+
+    one = fontdir.typefaces["One"].styles[frozenset()][2]
+    two = fontdir.typefaces["Two"].styles[frozenset()][2]
+    assert one.glyphs["A"] is two.glyphs["A"]
+    assert len(fontdir.store) == 1
+
+
+def test_fontdir_adopts_added_typeface():
+    typeface = TypeFace(name="Three")
+    typeface += make_font("Three", 2, {"A": Glyph.from_bytes(b"\x10\x20", 8, 2)})
+
+    fontdir = FontDir()
+    fontdir += make_font("One", 2, {"A": Glyph.from_bytes(b"\x10\x20", 8, 2)})
+    fontdir += typeface
+
+    assert typeface.store is fontdir.store
+    assert fontdir.store.stats["duplicates"] == 1
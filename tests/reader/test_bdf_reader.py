@@ -0,0 +1,114 @@
+import gzip
+from pathlib import Path
+
+import pytest
+
+import psf2flf
+
+from psf2flf.font import Glyph
+from psf2flf.reader import find_reader, loads, read
+from psf2flf.reader.bdf import BDFParseError, BDFReader
+
+FONT = Path(__file__).parent.parent / "data" / "psf2" / "Arabic-VGA32x16.psf.gz"
+
+
+def bdf_text(font, properties='CHARSET_REGISTRY "ISO10646"\nCHARSET_ENCODING "1"\n') -> str:
+    """Write a font's single characters as a BDF font, with every glyph the size of the cell."""
+    chars = sorted(char for char in font.glyphs if len(char) == 1)
+    lines = [
+        "STARTFONT 2.1",
+        "FONT -misc-vga-medium-r-normal--32-320-75-75-c-160-iso10646-1",
+        f"FONTBOUNDINGBOX {font.width} {font.height} 0 -4",
+        f"STARTPROPERTIES {properties.count(chr(10))}",
+        properties.rstrip("\n"),
+        "ENDPROPERTIES",
+        f"CHARS {len(chars)}",
+    ]
+    for char in chars:
+        glyph = font.glyphs[char]
+        lines += [f"STARTCHAR U+{ord(char):04X}", f"ENCODING {ord(char)}", f"BBX {font.width} {font.height} 0 -4"]
+        lines.append("BITMAP")
+        lines += [glyph.row(y).hex().upper() for y in range(glyph.height)]
+        lines.append("ENDCHAR")
+    lines.append("ENDFONT")
+    return "\n".join(lines) + "\n"
+
+
+def test_matches_psf(tmp_path):
+    font = read(FONT)
+    path = tmp_path / "Arabic-VGA32x16.bdf.gz"
+    path.write_bytes(gzip.compress(bdf_text(font).encode()))
+
+    bdf = read(path)
+    assert isinstance(find_reader(bdf_text(font).encode(), path), BDFReader)
+    assert (bdf.name, bdf.style, bdf.width, bdf.height) == (font.name, font.style, font.width, font.height)
+    assert bdf.meta["charset"] == "Arabic"
+    assert bdf.glyphs == {char: glyph for char, glyph in font.glyphs.items() if len(char) == 1}
+
+
+def test_glyphs_placed_in_cell():
+    data = b"""STARTFONT 2.1
+FONTBOUNDINGBOX 6 8 -1 -2
+STARTPROPERTIES 2
+WEIGHT_NAME "Bold"
+FONT_ASCENT 6
+ENDPROPERTIES
+CHARS 2
+STARTCHAR dot
+ENCODING 46
+BBX 2 2 1 0
+BITMAP
+C0
+C0
+ENDCHAR
+STARTCHAR bar
+ENCODING 124
+BBX 7 1 -2 5
+BITMAP
+FE
+ENDCHAR
+ENDFONT
+"""
+    font = loads(data, "Misc-Tiny8.bdf")
+    assert (font.name, font.style, font.width, font.height) == ("Tiny", frozenset({"Bold", "8"}), 6, 8)
+    assert font.meta["bdf"]["properties"] == {"WEIGHT_NAME": "Bold", "FONT_ASCENT": 6}
+
+    # The dot sits two columns in from the left edge, on the baseline two rows up from the bottom
+    assert font.glyphs["."] == Glyph.from_bytes(bytes([0, 0, 0, 0, 0x30, 0x30, 0, 0]), 6, 8)
+    # The bar starts left of the cell and is clipped on both sides
+    assert font.glyphs["|"] == Glyph.from_bytes(bytes([0xFC, 0, 0, 0, 0, 0, 0, 0]), 6, 8)
+
+
+def test_legacy_charset():
+    data = b"""STARTFONT 2.1
+FONTBOUNDINGBOX 1 1 0 0
+STARTPROPERTIES 2
+CHARSET_REGISTRY "KOI8"
+CHARSET_ENCODING "R"
+ENDPROPERTIES
+CHARS 2
+STARTCHAR a
+ENCODING 97
+BITMAP
+80
+ENDCHAR
+STARTCHAR ya
+ENCODING 209
+BITMAP
+80
+ENDCHAR
+ENDFONT
+"""
+    assert set(loads(data, "x.bdf").glyphs) == {"a", "я"}
+
+
+def test_missing_bounding_box():
+    with pytest.raises(BDFParseError, match="FONTBOUNDINGBOX"):
+        loads(b"STARTFONT 2.1\nCHARS 0\nENDFONT\n", "x.bdf")
+
+
+@pytest.mark.parametrize("wrap", [bytearray, memoryview])
+def test_convert_bytes_like(wrap):
+    font = read(FONT)
+    data = bdf_text(font).encode()
+    assert psf2flf.convert(wrap(data), name="Arabic-VGA32x16.bdf") == psf2flf.convert(data, name="Arabic-VGA32x16.bdf")
@@ -0,0 +1,110 @@
+from pathlib import Path
+
+import pyfiglet
+import pytest
+
+from psf2flf.font import FontDir
+from psf2flf.reader import find_reader, loads, read
+from psf2flf.reader.flf import FLFParseError, FLFReader, _parse_flf_filename
+
+DATA = Path(__file__).parent.parent / "data"
+FONTS = [DATA / "psf1" / "Uni1-VGA8.psf.gz", DATA / "psf2" / "Arabic-VGA32x16.psf.gz"]
+
+
+def _single_chars(font) -> dict:
+    return {char: glyph for char, glyph in font.glyphs.items() if len(char) == 1}
+
+
+@pytest.mark.parametrize("tall_mode", [False, True])
+@pytest.mark.parametrize("path", FONTS, ids=lambda path: path.name)
+def test_round_trip(tmp_path, path, tall_mode):
+    fontdir = FontDir()
+    fontdir += read(path)
+    (written,) = fontdir.write_directory(tmp_path, tall_mode)
+
+    original = read(path)
+    font = read(written)
+    assert isinstance(find_reader(written.read_bytes(), written), FLFReader)
+    assert (font.name, font.style, font.width, font.height) == (
+        original.name,
+        original.style,
+        original.width,
+        original.height,
+    )
+    assert font.meta["flf"]["mode"] == ("tall" if tall_mode else "short")
+    assert _single_chars(font) == _single_chars(original)
+
+
+def test_merges_with_psf_input(tmp_path):
+    fontdir = FontDir()
+    fontdir += read(FONTS[1])
+    (written,) = fontdir.write_directory(tmp_path)
+
+    fontdir = FontDir()
+    fontdir += read(FONTS[1])
+    fontdir += read(written)
+    assert len(fontdir.typefaces) == 1
+    (typeface,) = fontdir.typefaces.values()
+    assert sum(len(sizes) for sizes in typeface.styles.values()) == 1
+
+
+def test_header_metadata():
+    font = loads(b"flf2a# 1 1 3 -1 1\ncomment\n" + b"#@@\n" * 95, "Thing.flf")
+    assert font.name == "Thing"
+    assert font.meta["flf"]["hardblank"] == "#"
+    assert font.meta["flf"]["comment_lines"] == 1
+    assert font.meta["format"] == "flf"
+    assert len(font.glyphs) == 95
+
+
+def test_full_block_mode_from_half_blocks():
+    ascii_chars = b"  @@\n" * 95
+    font = loads(b"flf2a$ 1 1 3 0 0\n" + ascii_chars + b"0x2580\n\xe2\x96\x80\xe2\x96\x84@@\n", "Blocks.flf")
+    assert (font.width, font.height) == (2, 2)
+    assert font.glyphs["▀"].to_pixels() == ((True, False), (False, True))
+
+
+def test_deutsch_and_code_tags():
+    ascii_chars = b" @@\n" * 95
+    deutsch = b"#@@\n" * 7
+    tagged = b"0x263A  SMILE\n#@@\n-1\n#@@\n0400\n#@@\n9731\n#@@\n"
+    font = loads(b"flf2a$ 1 1 2 0 0\n" + ascii_chars + deutsch + tagged, "Tags.flf")
+
+    assert font.meta["flf"]["mode"] == "tall"
+    assert all(font.glyphs[char].to_pixels() == ((True,),) for char in "ÄÖÜäöüß☺Ā☃")
+    assert font.glyphs[" "].to_pixels() == ((False,),)
+    assert len(font.glyphs) == 95 + 7 + 3
+
+
+def test_malformed_font_keeps_good_characters():
+    ascii_chars = b" @@\n" * 95
+    # German rows that look like code tags, then a Latin-1 NEL drawn as a
+    # pixel, stray rows between characters and a character cut off at the end
+    deutsch = b"88@@\n" * 7
+    tagged = b"133\n\x85@@\nextra row@@\n\n0x263A\n#@@\n0x2603\n"
+    font = loads(b"flf2a$ 1 1 2 0 0\n" + ascii_chars + deutsch + tagged, "Bad.flf")
+
+    assert all(font.glyphs[char].to_pixels() == ((True, True),) for char in "ÄÖÜäöüß")
+    assert font.glyphs["\x85"].to_pixels() == ((True, False),)
+    assert font.glyphs["☺"].to_pixels() == ((True, False),)
+    assert "☃" not in font.glyphs
+    assert len(font.glyphs) == 95 + 7 + 2
+
+
+@pytest.mark.parametrize("name", ["b1ff", "bubble", "digital", "filter", "o8", "pyramid", "rot13", "term"])
+def test_reads_irregular_pyfiglet_fonts(name):
+    """These bundled fonts have Latin-1 NEL glyphs, stray rows or tag-like German rows."""
+    font = read(Path(pyfiglet.__file__).parent / "fonts" / f"{name}.flf")
+    loaded = {ord(char) for char in font.glyphs}
+    assert set(pyfiglet.FigletFont(name).chars) - {32} <= loaded
+
+
+def test_filename_parsing():
+    assert _parse_flf_filename("TerminusBold8x16.flf") == ("Terminus", frozenset({"Bold"}), False)
+    assert _parse_flf_filename("VGANarrowBold32x16.flf") == ("VGA", frozenset({"Bold"}), True)
+    assert _parse_flf_filename("standard.flf") == ("standard", frozenset(), None)
+
+
+def test_truncated_font():
+    with pytest.raises(FLFParseError, match="ends before"):
+        loads(b"flf2a$ 2 1 3 0 0\n" + b"  @\n  @@\n" * 10, "Short.flf")
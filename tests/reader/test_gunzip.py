@@ -0,0 +1,54 @@
+import gzip
+import zlib
+from pathlib import Path
+
+import pytest
+
+from psf2flf.reader import parse, prefetch, read
+from psf2flf.reader.source import gunzip, load_data
+
+DATA = Path(__file__).parent.parent / "data"
+FONTS = [DATA / "psf1" / "Uni1-VGA8.psf.gz", DATA / "psf2" / "Arabic-VGA32x16.psf.gz"]
+
+
+def test_gunzip_matches_gzip():
+    for path in FONTS:
+        compressed = path.read_bytes()
+        assert gunzip(compressed) == gzip.decompress(compressed)
+
+
+def test_gunzip_multiple_members():
+    data = gzip.compress(b"abc") + gzip.compress(b"def")
+    assert gunzip(data) == b"abcdef"
+
+
+def test_gunzip_trailing_padding():
+    assert gunzip(gzip.compress(b"abc") + bytes(16)) == b"abc"
+
+
+def test_gunzip_truncated():
+    data = gzip.compress(b"abc" * 100)
+    with pytest.raises((EOFError, zlib.error)):
+        gunzip(data[:-12])
+
+
+def test_load_data_plain_and_compressed(tmp_path):
+    plain = tmp_path / "font.psf"
+    plain.write_bytes(gzip.decompress(FONTS[0].read_bytes()))
+    assert load_data(plain) == load_data(FONTS[0])
+
+
+def test_prefetch_order_and_errors(tmp_path):
+    missing = tmp_path / "missing.psf.gz"
+    paths = FONTS * 8 + [missing] + FONTS
+
+    loaded = list(prefetch(paths, workers=2))
+
+    assert [path for path, _ in loaded] == paths
+    assert isinstance(loaded[16][1], FileNotFoundError)
+    for path, data in loaded[:16] + loaded[17:]:
+        assert parse(data, path).glyphs == read(path).glyphs
+
+
+def test_prefetch_empty():
+    assert list(prefetch([])) == []
@@ -0,0 +1,42 @@
+import pickle
+from pathlib import Path
+
+from psf2flf.font import Font, FontDir, LazyFont
+from psf2flf.reader import read
+
+FONT = Path(__file__).parent.parent / "data" / "psf2" / "Arabic-VGA32x16.psf.gz"
+
+
+def test_lazy_read_defers_glyphs():
+    eager = read(FONT)
+    lazy = read(FONT, lazy=True)
+
+    assert isinstance(lazy, LazyFont)
+    assert not lazy.loaded
+    assert (lazy.name, lazy.style, lazy.width, lazy.height) == (eager.name, eager.style, eager.width, eager.height)
+    assert lazy.meta["glyphs"] == 512
+    assert "unicode_mappings" not in lazy.meta
+    assert "not loaded" in repr(lazy)
+
+    assert lazy.glyphs == eager.glyphs
+    assert lazy.loaded
+    assert lazy.meta == eager.meta
+
+
+def test_grouping_does_not_load():
+    fontdir = FontDir()
+    font = read(FONT, lazy=True)
+    fontdir += font
+
+    assert not font.loaded
+    assert len(fontdir.store) == 0
+
+    assert font.glyphs and font.loaded
+    assert len(fontdir.store) > 0
+    assert all(glyph in fontdir.store for glyph in font.glyphs.values())
+
+
+def test_pickles_as_loaded_font():
+    font = pickle.loads(pickle.dumps(read(FONT, lazy=True)))
+    assert type(font) is Font
+    assert font.glyphs == read(FONT).glyphs
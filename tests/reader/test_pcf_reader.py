@@ -0,0 +1,132 @@
+import struct
+from pathlib import Path
+
+import pytest
+
+from psf2flf.font import Glyph
+from psf2flf.reader import find_reader, loads, read
+from psf2flf.reader.pcf import PCFParseError, PCFReader
+
+FONT = Path(__file__).parent.parent / "data" / "psf1" / "Uni1-VGA8.psf.gz"
+
+MSB_BYTES = 1 << 2
+MSB_BITS = 1 << 3
+
+
+def _reverse_bits(data: bytes) -> bytes:
+    return bytes(int(f"{byte:08b}"[::-1], 2) for byte in data)
+
+
+def pcf_bytes(chars, fmt: int, properties: dict, compressed: bool = False) -> bytes:
+    """
+    Encode a PCF font. `chars` is a list of (code, left, right, ascent,
+    descent, rows), with each row an int of `right - left` bits.
+    """
+    order = ">" if fmt & MSB_BYTES else "<"
+    pad = 1 << (fmt & 3)
+    scan_unit = 1 << ((fmt >> 4) & 3)
+
+    strings = b""
+    entries = []
+    for name, value in properties.items():
+        is_string = isinstance(value, str)
+        entries.append((len(strings), is_string, len(strings) + len(name) + 1 if is_string else value))
+        strings += name.encode() + b"\0" + (value.encode() + b"\0" if is_string else b"")
+    props = struct.pack("<i", fmt) + struct.pack(order + "i", len(entries))
+    props += b"".join(struct.pack(order + "ibi", *entry) for entry in entries) + bytes(-len(entries) % 4)
+    props += struct.pack(order + "i", len(strings)) + strings
+
+    metrics_fmt = fmt | (0x100 if compressed else 0)
+    metrics = struct.pack("<i", metrics_fmt)
+    if compressed:
+        metrics += struct.pack(order + "h", len(chars))
+        for _, left, right, ascent, descent, _ in chars:
+            metrics += bytes(value + 0x80 for value in (left, right, right - left, ascent, descent))
+    else:
+        metrics += struct.pack(order + "i", len(chars))
+        for _, left, right, ascent, descent, _ in chars:
+            metrics += struct.pack(order + "5hH", left, right, right - left, ascent, descent, 0)
+
+    block = b""
+    offsets = []
+    for _, left, right, _, _, rows in chars:
+        width = right - left
+        stride = ((width + 7) // 8 + pad - 1) // pad * pad
+        offsets.append(len(block))
+        block += b"".join((row << (stride * 8 - width)).to_bytes(stride, "big") for row in rows)
+    if bool(fmt & MSB_BYTES) != bool(fmt & MSB_BITS):
+        block = b"".join(block[i : i + scan_unit][::-1] for i in range(0, len(block), scan_unit))
+    if not fmt & MSB_BITS:
+        block = _reverse_bits(block)
+    bitmaps = struct.pack("<i", fmt) + struct.pack(order + "i", len(chars))
+    bitmaps += struct.pack(f"{order}{len(chars)}i", *offsets) + struct.pack(order + "4i", *[len(block)] * 4) + block
+
+    low = min(code for code, *_ in chars)
+    high = max(code for code, *_ in chars)
+    indices = [0xFFFF] * (high - low + 1)
+    for index, (code, *_) in enumerate(chars):
+        indices[code - low] = index
+    encodings = struct.pack("<i", fmt) + struct.pack(order + "5h", low, high, 0, 0, 0)
+    encodings += struct.pack(f"{order}{len(indices)}H", *indices)
+
+    tables = [(1, fmt, props), (4, metrics_fmt, metrics), (8, fmt, bitmaps), (32, fmt, encodings)]
+    data = b"\x01fcp" + struct.pack("<i", len(tables))
+    offset = len(data) + 16 * len(tables)
+    body = b""
+    for kind, table_fmt, table in tables:
+        table += bytes(-len(table) % 4)
+        data += struct.pack("<4i", kind, table_fmt, len(table), offset + len(body))
+        body += table
+    return data + body
+
+
+def psf_chars(font) -> list:
+    chars = []
+    for char in sorted(char for char in font.glyphs if len(char) == 1 and ord(char) < 256):
+        glyph = font.glyphs[char]
+        rows = [int.from_bytes(glyph.row(y), "big") for y in range(glyph.height)]
+        chars.append((ord(char), 0, font.width, font.height - 2, 2, rows))
+    return chars
+
+
+@pytest.mark.parametrize(
+    "fmt",
+    [
+        MSB_BYTES | MSB_BITS,  # pad 1, scan unit 1
+        2 | (2 << 4),  # LSB bits and bytes, pad 4, scan unit 4
+        MSB_BYTES | 2 | (2 << 4),  # MSB bytes, LSB bits: swapped within scan units
+        MSB_BITS | 1 | (1 << 4),  # LSB bytes, MSB bits, pad 2, scan unit 2
+    ],
+)
+@pytest.mark.parametrize("compressed", [False, True])
+def test_matches_psf(tmp_path, fmt, compressed):
+    font = read(FONT)
+    data = pcf_bytes(psf_chars(font), fmt, {"CHARSET_REGISTRY": "ISO10646", "CHARSET_ENCODING": "1"}, compressed)
+    path = tmp_path / "Uni1-VGA8.pcf"
+    path.write_bytes(data)
+
+    pcf = read(path)
+    assert isinstance(find_reader(data, path), PCFReader)
+    assert (pcf.name, pcf.style, pcf.width, pcf.height) == (font.name, font.style, font.width, font.height)
+    assert pcf.glyphs == {char: glyph for char, glyph in font.glyphs.items() if len(char) == 1 and ord(char) < 256}
+
+
+def test_glyphs_placed_in_cell():
+    chars = [
+        (ord("."), 1, 3, 2, 0, [0b11, 0b11]),
+        (ord("|"), -1, 6, 6, 2, [0b1111111] * 8),
+    ]
+    properties = {"WEIGHT_NAME": "Bold", "PIXEL_SIZE": 8}
+    font = loads(pcf_bytes(chars, MSB_BYTES | MSB_BITS, properties), "Misc-Tiny8.pcf")
+
+    assert (font.width, font.height) == (7, 8)
+    assert font.style == frozenset({"Bold", "8"})
+    assert font.meta["pcf"]["properties"] == {"WEIGHT_NAME": "Bold", "PIXEL_SIZE": 8}
+    assert font.glyphs["."] == Glyph.from_bytes(bytes([0, 0, 0, 0, 0x30, 0x30, 0, 0]), 7, 8)
+    assert font.glyphs["|"] == Glyph.from_bytes(bytes([0xFE] * 8), 7, 8)
+
+
+def test_missing_table():
+    data = b"\x01fcp" + struct.pack("<i", 0)
+    with pytest.raises(PCFParseError, match="metrics"):
+        loads(data, "x.pcf")
@@ -1,6 +1,6 @@
 import pytest
 
-from psf2flf.reader.psf import _parse_psf_filename
+from psf2flf.reader.filename import parse_font_filename
 
 
 @pytest.mark.parametrize(
@@ -21,7 +21,7 @@ from psf2flf.reader.psf import _parse_psf_filename
     ],
 )
 def test_parse_psf_filename(filename, expected_name, expected_styles, expected_size, expected_charset):
-    name, styles, size, charset = _parse_psf_filename(filename)
+    name, styles, size, charset = parse_font_filename(filename)
     assert name == expected_name
     assert styles == expected_styles
     assert size == expected_size
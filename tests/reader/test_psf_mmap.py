@@ -0,0 +1,45 @@
+import gzip
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from psf2flf.reader import read
+from psf2flf.reader.psf import PSFParseError, PSFReader
+
+DATA = Path(__file__).parent.parent / "data"
+FONTS = [DATA / "psf1" / "Uni1-VGA8.psf.gz", DATA / "psf2" / "Arabic-VGA32x16.psf.gz"]
+
+
+@pytest.fixture
+def plain_fonts(tmp_path):
+    paths = []
+    for path in FONTS:
+        plain = tmp_path / path.name.removesuffix(".gz")
+        plain.write_bytes(gzip.decompress(path.read_bytes()))
+        paths.append(plain)
+    return paths
+
+
+def test_uncompressed_matches_gzip(plain_fonts):
+    for plain, compressed in zip(plain_fonts, FONTS):
+        assert read(plain).glyphs == read(compressed).glyphs
+        assert read(plain, lazy=True).glyphs == read(compressed).glyphs
+
+
+def test_shared_reader_across_threads(plain_fonts):
+    expected = {path: read(path).glyphs for path in plain_fonts}
+    reader = PSFReader()
+    paths = plain_fonts * 16
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        fonts = list(pool.map(reader.read, paths))
+
+    assert all(font.glyphs == expected[path] for font, path in zip(fonts, paths))
+
+
+def test_empty_file(tmp_path):
+    empty = tmp_path / "empty.psf"
+    empty.touch()
+    with pytest.raises(PSFParseError):
+        PSFReader().read(empty)
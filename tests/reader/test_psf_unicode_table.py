@@ -0,0 +1,67 @@
+import io
+import struct
+from pathlib import Path
+
+from psf2flf.font import Font, Glyph
+from psf2flf.reader import parse
+from psf2flf.reader.psf import PSF1_MAGIC, PSF2_MAGIC, PSFReader
+from psf2flf.writer import write
+
+
+def _psf1_table(entries: list[list[list[int]]]) -> bytes:
+    """Build a PSF1 table from per-glyph [singles, sequence, ...] lists of codepoints."""
+    table = b""
+    for singles, *sequences in entries:
+        values = singles + [v for sequence in sequences for v in [0xFFFE, *sequence]] + [0xFFFF]
+        table += struct.pack(f"<{len(values)}H", *values)
+    return table
+
+
+def _psf2_font(table: bytes, glyph_count: int = 2) -> bytes:
+    header = PSF2_MAGIC + struct.pack("<7I", 0, 32, 1, glyph_count, 8, 8, 8)
+    return header + bytes(range(glyph_count * 8)) + table
+
+
+def test_psf2_singles_and_sequences():
+    table = "A\u00c0".encode() + b"\xfe" + "A\u0300".encode() + b"\xff" + "B".encode() + b"\xff"
+    assert PSFReader()._parse_unicode_table(table, 0, 2) == {0: ["A", "\u00c0", "A\u0300"], 1: ["B"]}
+
+
+def test_psf2_invalid_utf8_fragment_dropped():
+    table = b"A\xc3\xfeB\xfe\xc3\xa9\xff\x80\xff"
+    assert PSFReader()._parse_unicode_table(table, 0, 2) == {0: ["B", "\u00e9"]}
+
+
+def test_psf2_truncated_table():
+    assert PSFReader()._parse_unicode_table(b"A\xffBC", 0, 4) == {0: ["A"], 1: ["B", "C"]}
+
+
+def test_psf1_singles_and_sequences():
+    table = _psf1_table([[[0x41, 0xC0], [0x41, 0x300]], [[0x42]], [[]]])
+    assert PSFReader()._parse_unicode_table(table, 0, 3, is_psf1=True) == {0: ["A", "\u00c0", "A\u0300"], 1: ["B"]}
+
+
+def test_psf1_font_keeps_sequences():
+    data = PSF1_MAGIC + bytes([0b010, 8]) + bytes(256 * 8) + _psf1_table([[[0x41], [0x41, 0x300]]] * 256)
+    font = parse(data, Path("Test-8.psf"))
+    assert font.glyphs["A\u0300"] is font.glyphs["A"]
+    assert font.meta["unicode_mappings"] == 512
+
+
+def test_sequences_not_written_to_flf():
+    font = parse(_psf2_font("A".encode() + b"\xfe" + "A\u0300".encode() + b"\xff" + b"B\xff"), Path("Test-8.psf"))
+    assert "A\u0300" in font.glyphs
+
+    out = io.StringIO()
+    write(font, Path("test.flf"), stream=out)
+    header = out.getvalue().splitlines()[0]
+    assert header.endswith(f" {127 - 32}")
+
+
+def test_writer_skips_sequence_keys():
+    glyph = Glyph.blank(8, 8)
+    font = Font(meta={"width": 8, "height": 8}, glyphs={"\u00e9": glyph, "e\u0301": glyph})
+    out = io.StringIO()
+    write(font, Path("test.flf"), stream=out)
+    assert "0xE9\n" in out.getvalue()
+    assert out.getvalue().count("0x") == 1
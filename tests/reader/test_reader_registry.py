@@ -0,0 +1,63 @@
+import builtins
+import shutil
+from pathlib import Path
+
+import pytest
+
+import psf2flf.reader as reader_module
+from psf2flf.font import Font
+from psf2flf.reader import find_reader, read, source
+from psf2flf.reader.psf import PSFReader
+from psf2flf.reader.reader import Reader
+
+FONT = Path(__file__).parent.parent / "data" / "psf1" / "Uni1-VGA8.psf.gz"
+
+
+class RawReader(Reader):
+    extensions = (".raw",)
+
+    def parse(self, data, path, codepoints=None):
+        return Font(meta={"name": path.stem, "size": len(data)})
+
+
+@pytest.fixture
+def raw_reader(monkeypatch):
+    reader = RawReader()
+    monkeypatch.setattr(reader_module, "_readers", [*reader_module._readers])
+    reader_module.register(reader)
+    return reader
+
+
+def test_read_opens_file_once(monkeypatch):
+    opened = []
+
+    def counting_open(path, *args, **kwargs):
+        opened.append(path)
+        return builtins.open(path, *args, **kwargs)
+
+    monkeypatch.setattr(source, "open", counting_open, raising=False)
+    read(FONT)
+    assert opened == [FONT]
+
+    opened.clear()
+    read(FONT, lazy=True)
+    assert opened == [FONT]
+
+
+def test_gzip_detected_by_magic(tmp_path):
+    renamed = tmp_path / "Uni1-VGA8.psf"
+    shutil.copy(FONT, renamed)
+    assert read(renamed).glyphs == read(FONT).glyphs
+
+
+def test_dispatch_by_magic_then_extension(tmp_path, raw_reader):
+    assert isinstance(find_reader(b"\x36\x04\x02\x08", Path("font.raw")), PSFReader)
+    assert find_reader(b"\x00\x00", Path("font.raw.gz")) is raw_reader
+
+    raw = tmp_path / "blob.raw"
+    raw.write_bytes(b"\x00" * 10)
+    assert read(raw).meta == {"name": "blob", "size": 10}
+    assert raw_reader.can_open(raw)
+
+    with pytest.raises(ValueError, match="No reader found"):
+        find_reader(b"\x00\x00", Path("font.psf"))
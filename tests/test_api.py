@@ -0,0 +1,45 @@
+import gzip
+import io
+from pathlib import Path
+
+import pytest
+
+import psf2flf
+from psf2flf.reader import read
+from psf2flf.reader.psf import PSFReader
+from psf2flf.writer import RenderCache, write
+from psf2flf.writer.flf import FLFWriter
+
+DATA = Path(__file__).parent / "data"
+FONTS = sorted(DATA.glob("psf*/*.psf.gz"))
+
+
+@pytest.mark.parametrize("path", FONTS, ids=lambda path: path.name)
+@pytest.mark.parametrize("tall", [False, True])
+def test_convert_matches_file_output(path, tall, tmp_path):
+    expected_path = tmp_path / "expected.flf"
+    write(read(path), expected_path, tall)
+    expected = expected_path.read_text(encoding="utf-8")
+
+    compressed = path.read_bytes()
+    plain = gzip.decompress(compressed)
+    assert psf2flf.convert(compressed, tall, name=path.name) == expected
+    assert psf2flf.convert(memoryview(plain), tall, name=path.name) == expected
+    assert psf2flf.convert(io.BytesIO(plain), tall, name=path.name, cache=RenderCache()) == expected
+
+
+def test_reader_loads_and_writer_dumps():
+    path = FONTS[0]
+    font = PSFReader().loads(path.read_bytes(), path.name)
+    assert font == read(path)
+    assert font.meta["name"] == read(path).meta["name"]
+    assert font.glyphs == read(path).glyphs
+
+    buffer = io.StringIO()
+    write(font, Path("out.flf"), stream=buffer)
+    assert FLFWriter().dumps(font) == buffer.getvalue()
+
+
+def test_convert_rejects_unknown_data():
+    with pytest.raises(ValueError):
+        psf2flf.convert(b"not a font")
@@ -0,0 +1,42 @@
+import random
+
+import pytest
+
+from psf2flf import bitmap
+
+
+def decode_per_pixel(data, offset, glyph_count, height, width, bytes_per_row):
+    """Reference decoder: one pixel at a time, zero-padding past the end of data."""
+    pos = offset
+    glyphs = []
+    for _ in range(glyph_count):
+        rows = []
+        for _ in range(height):
+            row = []
+            for _ in range(bytes_per_row):
+                byte = data[pos] if pos < len(data) else 0
+                pos += 1
+                row.extend(bool(byte & (0x80 >> bit)) for bit in range(8))
+            rows.append(tuple(row[:width]))
+        glyphs.append(tuple(rows))
+    return glyphs
+
+
+SIZES = [(256, 8, 8), (512, 16, 8), (16, 13, 5), (32, 16, 12), (8, 32, 16), (4, 64, 32), (4, 7, 17)]
+
+
+@pytest.mark.parametrize("glyph_count,height,width", SIZES)
+def test_lut_matches_reference(glyph_count, height, width):
+    bytes_per_row = (width + 7) // 8
+    rng = random.Random(glyph_count * height + width)
+    data = bytes(rng.randrange(256) for _ in range(3 + glyph_count * height * bytes_per_row))
+
+    args = (data, 3, glyph_count, height, width, bytes_per_row)
+    assert bitmap.unpack_glyphs(*args) == decode_per_pixel(*args)
+
+
+def test_truncated_data_is_zero_padded():
+    data = bytes([0xFF, 0x81, 0xAA])
+    glyphs = bitmap.unpack_glyphs(data, 0, 2, 4, 8, 1)
+    assert glyphs == decode_per_pixel(data, 0, 2, 4, 8, 1)
+    assert glyphs[1] == ((False,) * 8,) * 4
@@ -0,0 +1,79 @@
+from pathlib import Path
+
+import pytest
+
+from psf2flf import stats
+from psf2flf.codepoints import Codepoints, parse_ranges
+from psf2flf.main import cli
+from psf2flf.reader import read
+
+DATA = Path(__file__).parent / "data"
+PSF1 = DATA / "psf1" / "Uni1-VGA8.psf.gz"
+PSF2 = DATA / "psf2" / "Arabic-VGA32x16.psf.gz"
+
+
+def test_parse_ranges():
+    assert parse_ranges("U+0041, 0x61-0x7a,2500-257F") == [(0x41, 0x41), (0x61, 0x7A), (0x2500, 0x257F)]
+    assert parse_ranges("ascii,latin1") == [(0x20, 0x7E), (0xA0, 0xFF)]
+    assert parse_ranges("") == []
+
+    for bad in ("zz", "7F-20", "110000", "20-"):
+        with pytest.raises(ValueError, match="Invalid code point range"):
+            parse_ranges(bad)
+
+
+def test_include_and_exclude():
+    codepoints = Codepoints.parse("ascii,latin1", "30-39")
+    assert "A" in codepoints
+    assert "\u00e9" in codepoints
+    assert "5" not in codepoints
+    assert "─" not in codepoints
+    assert "e\u0301" not in codepoints  # the accent isn't included
+
+    everything_but = Codepoints.parse(exclude="box")
+    assert "─" not in everything_but
+    assert "\U0001f600" in everything_but
+
+
+def test_spec_is_normalised():
+    assert Codepoints.parse("41-5A,20-40").spec == Codepoints.parse("20-5A").spec == "include=20-5A;exclude="
+    assert Codepoints.parse(exclude="box").spec == "include=*;exclude=2500-259F"
+
+
+@pytest.mark.parametrize("path", [PSF1, PSF2], ids=lambda path: path.name)
+@pytest.mark.parametrize("lazy", [False, True])
+def test_read_keeps_only_included(path, lazy):
+    codepoints = Codepoints.parse("ascii,box", "41-5A")
+    full = read(path)
+    font = read(path, lazy=lazy, codepoints=codepoints)
+    assert font.glyphs == {char: glyph for char, glyph in full.glyphs.items() if char in codepoints}
+    assert "a" in font.glyphs and "A" not in font.glyphs
+
+
+def test_excluded_glyphs_not_decoded():
+    stats.enable()
+    font = read(PSF2, codepoints=Codepoints.parse("ascii"))
+    spans = stats.disable()
+
+    (decode,) = [span for span in spans if span.stage == "decode"]
+    glyph_size = font.meta["char_size"]
+    assert decode.bytes == len(set(map(id, font.glyphs.values()))) * glyph_size
+    assert decode.bytes < font.meta["glyphs"] * glyph_size
+
+
+def test_cli_include(tmp_path):
+    full = tmp_path / "full.flf"
+    subset = tmp_path / "subset.flf"
+    assert cli([str(PSF1), str(full)]) == 0
+    assert cli(["--include", "ascii,latin1", str(PSF1), str(subset)]) == 0
+
+    text = subset.read_text(encoding="utf-8")
+    assert len(text) < len(full.read_text(encoding="utf-8"))
+    assert "0xE9\n" in text
+    assert "0x2500\n" not in text
+
+
+def test_cli_rejects_bad_range(capsys):
+    with pytest.raises(SystemExit):
+        cli(["--include", "nope", str(PSF1), "out.flf"])
+    assert "Invalid code point range: nope" in capsys.readouterr().err
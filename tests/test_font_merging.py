@@ -78,6 +78,57 @@ class TestFontMerging:
         assert font1.glyphs[chr(66)] == ((True, True), (False, False))  # New added
 
 
+class TestMergeAll:
+    """Test merging several fonts at once."""
+
+    def make_font(self, glyphs, name="Test", charset=None):
+        font = Font()
+        font.meta = {"name": name, "styles": frozenset(), "width": 1, "height": 1}
+        if charset is not None:
+            font.meta["charset"] = charset
+        font.glyphs = dict(glyphs)
+        return font
+
+    def test_priority_and_contributions(self):
+        """Test that earlier fonts win and each font's contribution is counted."""
+        base = self.make_font({"A": "base"})
+        first = self.make_font({"A": "first", "B": "first", "C": "first"})
+        second = self.make_font({"B": "second", "D": "second"})
+
+        assert base.merge_all([first, second]) == [2, 1]
+        assert base.glyphs == {"A": "base", "B": "first", "C": "first", "D": "second"}
+        assert base.merge_all([first, second]) == [0, 0]
+
+    def test_incompatible_font_merges_nothing(self):
+        """Test that one incompatible font stops the whole merge before anything changes."""
+        base = self.make_font({"A": "base"})
+        with pytest.raises(ValueError, match="Cannot merge incompatible fonts"):
+            base.merge_all([self.make_font({"B": "ok"}), self.make_font({"C": "no"}, name="Other")])
+        assert base.glyphs == {"A": "base"}
+
+        assert base.merge_all([self.make_font({"C": "forced"}, name="Other")], force=True) == [1]
+        assert base.glyphs["C"] == "forced"
+
+    def test_merge_returns_count(self):
+        """Test that merge() reports what += and force_merge() add."""
+        base = self.make_font({"A": "base"})
+        assert base.merge(self.make_font({"A": "x", "B": "x"})) == 1
+        with pytest.raises(TypeError):
+            base.merge("not a font")
+
+    def test_charsets_combined_once(self):
+        """Test that charsets are combined without repeats across several merges."""
+        base = self.make_font({}, charset="Uni1")
+        base.merge_all(
+            [
+                self.make_font({}, charset="Arabic"),
+                self.make_font({}, charset="Uni1"),
+                self.make_font({}, charset="Arabic+Lat2"),
+            ]
+        )
+        assert base.meta["charset"] == "Arabic+Lat2+Uni1"
+
+
 class TestTypeFace:
     """Test TypeFace functionality."""
 
@@ -138,6 +189,75 @@ class TestFontDir:
         assert fontdir.typefaces["Test"] == typeface
 
 
+class TestFontIndex:
+    """Test cached compatibility keys, fingerprints and the FontDir index."""
+
+    def make_font(self, name="Test", height=16, glyphs=None):
+        font = Font()
+        font.meta = {"name": name, "styles": frozenset({"Bold"}), "width": 8, "height": height}
+        font.glyphs = dict(glyphs if glyphs is not None else {"A": ((True,),), "B": ((False,),)})
+        return font
+
+    def test_compat_key_follows_meta(self):
+        """Test that the cached key is recomputed when meta is replaced or invalidated."""
+        font = self.make_font()
+        assert font.compat_key == ("Test", frozenset({"Bold"}), 8, 16)
+
+        font.meta = {**font.meta, "height": 8}
+        assert font.compat_key == ("Test", frozenset({"Bold"}), 8, 8)
+
+        font.meta["name"] = "Other"
+        assert font.compat_key[0] == "Test"
+        font.invalidate()
+        assert font.compat_key[0] == "Other"
+
+    def test_fingerprint_follows_glyphs(self):
+        """Test that the fingerprint covers ASCII glyphs only and notices added glyphs."""
+        font = self.make_font(glyphs={"A": ((True,),), "\u00e9": ((True,),)})
+        assert font.fingerprint.coverage == 1 << (ord("A") - 32)
+        assert font.fingerprint.glyphs == (((True,),),)
+
+        font.glyphs["B"] = ((False,),)
+        assert font.fingerprint.coverage == (1 << (ord("A") - 32)) | (1 << (ord("B") - 32))
+
+    def test_equality_with_different_coverage(self):
+        """Test that fonts covering different ASCII characters compare only the shared ones."""
+        font = self.make_font()
+        fewer = self.make_font(glyphs={"A": ((True,),)})
+        different = self.make_font(glyphs={"A": ((False,),)})
+
+        assert font == fewer
+        assert fewer == font
+        assert font != different
+        assert font != self.make_font(height=8)
+
+    def test_fontdir_find(self, monkeypatch):
+        """Test that FontDir finds the font a new one would merge into."""
+        fontdir = FontDir()
+        first = self.make_font()
+        fontdir += first
+        # Compatible fonts are merged through the index, not the typeface
+        monkeypatch.setattr(TypeFace, "__iadd__", None)
+        fontdir += self.make_font(glyphs={"C": ((True,),)})
+        monkeypatch.undo()
+
+        assert fontdir.find(self.make_font()) is first
+        assert "C" in first.glyphs
+        assert fontdir.find(self.make_font(height=8)) is None
+        assert fontdir.find(self.make_font(name="Other")) is None
+
+    def test_fontdir_find_after_adding_typeface(self):
+        """Test that fonts added as part of a typeface are indexed too."""
+        typeface = TypeFace(name="Test")
+        font = self.make_font()
+        typeface += font
+
+        assert FontDir(typefaces={"Test": typeface}).find(self.make_font()) is font
+        fontdir = FontDir()
+        fontdir += typeface
+        assert fontdir.find(self.make_font()) is font
+
+
 class TestRealFonts:
     """Test with real PSF files."""
 
@@ -0,0 +1,73 @@
+import os
+import shutil
+from pathlib import Path
+
+from psf2flf.codepoints import Codepoints
+from psf2flf.main import convert_all_in_directory
+from psf2flf.manifest import MANIFEST_NAME, Manifest
+
+DATA = Path(__file__).parent / "data"
+
+
+def run(source, dest, capsys, tall_mode=False):
+    convert_all_in_directory(source, dest, tall_mode, incremental=True)
+    return capsys.readouterr().out.splitlines()[-1]
+
+
+def test_incremental_conversion(tmp_path, capsys):
+    source = tmp_path / "in"
+    dest = tmp_path / "out"
+    source.mkdir()
+    for path in DATA.glob("psf*/*.psf.gz"):
+        shutil.copy(path, source)
+
+    assert run(source, dest, capsys) == "Converted 2, skipped 0, removed 0"
+    assert (dest / MANIFEST_NAME).exists()
+    assert run(source, dest, capsys) == "Converted 0, skipped 2, removed 0"
+
+    # Touching a file without changing it doesn't trigger a conversion
+    vga8 = source / "Uni1-VGA8.psf.gz"
+    os.utime(vga8, ns=(1, 1))
+    assert run(source, dest, capsys) == "Converted 0, skipped 2, removed 0"
+    assert Manifest.load(dest).entries[str(vga8.resolve())]["mtime"] == 1
+
+    # Changing the mode or deleting an output does
+    assert run(source, dest, capsys, tall_mode=True) == "Converted 2, skipped 0, removed 0"
+    (dest / "Uni1-VGA8.flf").unlink()
+    assert run(source, dest, capsys, tall_mode=True) == "Converted 1, skipped 1, removed 0"
+
+    # Deleted inputs take their outputs with them
+    vga8.unlink()
+    assert run(source, dest, capsys, tall_mode=True) == "Converted 0, skipped 1, removed 1"
+    assert not (dest / "Uni1-VGA8.flf").exists()
+    assert (dest / "Arabic-VGA32x16.flf").exists()
+
+
+def test_changed_content_is_reconverted(tmp_path, capsys):
+    source = tmp_path / "in"
+    dest = tmp_path / "out"
+    source.mkdir()
+    font = source / "Uni1-VGA8.psf.gz"
+    shutil.copy(DATA / "psf1" / font.name, font)
+    run(source, dest, capsys)
+
+    stat = font.stat()
+    shutil.copy(DATA / "psf2" / "Arabic-VGA32x16.psf.gz", font)
+    os.utime(font, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert run(source, dest, capsys) == "Converted 1, skipped 0, removed 0"
+
+
+def test_codepoint_filter_change_reconverts(tmp_path, capsys):
+    source = tmp_path / "in"
+    dest = tmp_path / "out"
+    source.mkdir()
+    shutil.copy(DATA / "psf1" / "Uni1-VGA8.psf.gz", source)
+
+    def run_filtered(codepoints):
+        convert_all_in_directory(source, dest, incremental=True, codepoints=codepoints)
+        return capsys.readouterr().out.splitlines()[-1]
+
+    assert run_filtered(None) == "Converted 1, skipped 0, removed 0"
+    assert run_filtered(Codepoints.parse("ascii")) == "Converted 1, skipped 0, removed 0"
+    assert run_filtered(Codepoints.parse("20-7E")) == "Converted 0, skipped 1, removed 0"
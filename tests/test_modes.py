@@ -0,0 +1,100 @@
+import shutil
+import tarfile
+from pathlib import Path
+
+import pytest
+
+from psf2flf import stats
+from psf2flf.font import FontDir
+from psf2flf.font.fontdir import flf_filename, render_modes
+from psf2flf.main import cli, convert_all_in_directory
+from psf2flf.reader import read
+
+DATA = Path(__file__).parent / "data"
+PSF1 = DATA / "psf1" / "Uni1-VGA8.psf.gz"
+PSF2 = DATA / "psf2" / "Arabic-VGA32x16.psf.gz"
+
+
+def test_render_modes():
+    assert render_modes(False) == (False,)
+    assert render_modes({True, False}) == (False, True)
+    assert render_modes([True, True]) == (True,)
+
+
+def test_flf_filename():
+    font = read(PSF2)
+    assert flf_filename("VGA", font, False) == "VGA16x16.flf"
+    assert flf_filename("VGA", font, True) == "VGANarrow32x16.flf"
+
+
+def test_write_directory_in_both_modes(tmp_path):
+    fontdir = FontDir()
+    fontdir += read(PSF1)
+    fontdir += read(PSF2)
+
+    written = fontdir.write_directory(tmp_path / "both", {False, True})
+    short = fontdir.write_directory(tmp_path / "short")
+    tall = fontdir.write_directory(tmp_path / "tall", True)
+
+    assert sorted(path.name for path in written) == sorted(path.name for path in short + tall)
+    for path in short + tall:
+        assert (tmp_path / "both" / path.name).read_bytes() == path.read_bytes()
+
+    fontdir.write_tar(tmp_path / "fonts.tar", {False, True})
+    with tarfile.open(tmp_path / "fonts.tar") as tar:
+        assert sorted(tar.getnames()) == sorted(path.name for path in written)
+
+
+def test_all_reads_each_font_once(tmp_path, capsys):
+    stats.enable()
+    convert_all_in_directory(DATA / "psf1", tmp_path, {False, True})
+    spans = stats.disable()
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["Uni1-VGA8-Narrow.flf", "Uni1-VGA8.flf"]
+    assert len([span for span in spans if span.stage == "decode"]) == 1
+
+    convert_all_in_directory(DATA / "psf1", tmp_path / "tall", True)
+    assert (tmp_path / "Uni1-VGA8-Narrow.flf").read_bytes() == (tmp_path / "tall" / "Uni1-VGA8.flf").read_bytes()
+
+
+def test_incremental_with_modes(tmp_path, capsys):
+    source = tmp_path / "in"
+    dest = tmp_path / "out"
+    source.mkdir()
+    shutil.copy(PSF1, source)
+
+    def run(modes):
+        convert_all_in_directory(source, dest, modes, incremental=True)
+        return capsys.readouterr().out.splitlines()[-1]
+
+    assert run(False) == "Converted 1, skipped 0, removed 0"
+    assert run({False}) == "Converted 0, skipped 1, removed 0"
+    assert run({False, True}) == "Converted 1, skipped 0, removed 0"
+    assert run({True, False}) == "Converted 0, skipped 1, removed 0"
+
+    (dest / "Uni1-VGA8-Narrow.flf").unlink()
+    assert run({False, True}) == "Converted 1, skipped 0, removed 0"
+
+
+def test_cli_modes(tmp_path, capsys):
+    assert cli(["--modes", "short,tall", str(PSF1), str(tmp_path / "out")]) == 0
+    assert sorted(path.name for path in (tmp_path / "out").iterdir()) == ["VGA4x8.flf", "VGANarrow8x8.flf"]
+
+    assert cli(["--modes", "short,tall", str(PSF1), str(tmp_path / "font.flf")]) == 1
+    assert "Several modes" in capsys.readouterr().err
+
+    for args, message in (
+        (["--modes", "wide"], "Unknown mode: wide"),
+        (["--modes", "short", "--tall"], "--tall and --modes"),
+        (["--modes", "short,tall", "--render", "x"], "--render takes a single mode"),
+    ):
+        with pytest.raises(SystemExit):
+            cli(args + [str(PSF1), str(tmp_path / "out")])
+        assert message in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("mode, tall", [("short", False), ("tall", True)])
+def test_cli_single_mode_to_flf(tmp_path, mode, tall):
+    assert cli(["--modes", mode, str(PSF1), str(tmp_path / "modes.flf")]) == 0
+    assert cli(["--tall"] * tall + [str(PSF1), str(tmp_path / "flag.flf")]) == 0
+    assert (tmp_path / "modes.flf").read_text(encoding="utf-8") == (tmp_path / "flag.flf").read_text(encoding="utf-8")
@@ -0,0 +1,44 @@
+import shutil
+from pathlib import Path
+
+from psf2flf.main import _load, cli
+from psf2flf.utils import parallel_map
+
+DATA = Path(__file__).parent / "data"
+
+
+def square(x):
+    return x * x
+
+
+def test_parallel_map_keeps_order():
+    items = list(range(20))
+    assert list(parallel_map(square, items, 1)) == [x * x for x in items]
+    assert list(parallel_map(square, items, 3)) == [x * x for x in items]
+
+
+def test_workers_are_sent_paths():
+    paths = sorted(DATA.glob("psf*/*.psf.gz"))
+    assert list(_load(paths, 2)) == [(path, path) for path in paths]
+    assert list(_load(paths[:1], 1)) == [(paths[0], paths[0])]
+    # Serial runs over several files load them ahead
+    assert all(isinstance(data, bytes) for _, data in _load(paths, 1))
+
+
+def test_convert_all_with_jobs_matches_serial(tmp_path, capsys):
+    source = tmp_path / "in"
+    source.mkdir()
+    for path in DATA.glob("psf*/*.psf.gz"):
+        shutil.copy(path, source)
+    (source / "broken.psf").write_bytes(b"not a font")
+
+    assert cli(["--all", str(source), str(tmp_path / "serial")]) == 0
+    serial = capsys.readouterr().out.replace("serial", "OUT")
+    assert cli(["--all", "--jobs", "2", str(source), str(tmp_path / "parallel")]) == 0
+    parallel = capsys.readouterr().out.replace("parallel", "OUT")
+
+    assert serial == parallel
+    assert serial.splitlines()[0].startswith(f"{source / 'Arabic-VGA32x16.psf.gz'}\t")
+    assert "broken.psf\tERROR" in serial
+    for flf in (tmp_path / "serial").glob("*.flf"):
+        assert flf.read_bytes() == (tmp_path / "parallel" / flf.name).read_bytes()
@@ -0,0 +1,66 @@
+from pathlib import Path
+
+import pytest
+from pyfiglet import Figlet
+
+from psf2flf.font import Font, Glyph
+from psf2flf.main import cli
+from psf2flf.reader import read
+from psf2flf.render import TextRenderer, render
+
+DATA = Path(__file__).parent / "data"
+PSF1 = DATA / "psf1" / "Uni1-VGA8.psf.gz"
+
+
+def reference(name: str) -> str:
+    return (DATA / "txt" / name).read_text(encoding="utf-8")
+
+
+@pytest.mark.parametrize("tall, name", [(False, "psf1_hello.txt"), (True, "psf1_tall_hello.txt")])
+def test_matches_figlet_output(tall, name):
+    # The reference files are pyfiglet's rendering of our FLF output
+    assert render(read(PSF1), "HELLO", tall) == reference(name)
+
+
+def test_multiple_lines():
+    renderer = TextRenderer(read(PSF1))
+    assert renderer.render("HE\n\nLLO\n") == (renderer.render("HE") + "\n" * renderer.height + renderer.render("LLO"))
+    assert renderer.height == 4
+
+
+def test_rows_cached_per_glyph():
+    glyph = Glyph.from_pixels([[1, 0], [0, 1]])
+    renderer = TextRenderer(Font(meta={"width": 2, "height": 2}, glyphs={"a": glyph, "b": glyph}), tall_mode=True)
+
+    assert renderer.rows("a") == ("█  ", " █ ")
+    assert renderer.rows("b") is renderer.rows("a")
+    assert renderer.render("ab") == "█  █  \n █  █ \n"
+
+
+def test_missing_characters():
+    question = Glyph.from_pixels([[1, 1]])
+    font = Font(meta={"width": 2, "height": 1}, glyphs={"?": question})
+    assert render(font, "x?", tall_mode=True) == "██ ██ \n"
+
+    # Without a "?" glyph, missing characters are blank
+    assert render(Font(meta={"width": 2, "height": 1}), "x", tall_mode=True) == "   \n"
+
+    # Only missing ASCII is substituted; anything else is left out
+    assert render(font, "x一?", tall_mode=True) == "██ ██ \n"
+    assert render(font, "一", tall_mode=True) == "\n"
+
+    # Skipped characters aren't cached, so arbitrary text can't grow the cache
+    renderer = TextRenderer(font, tall_mode=True)
+    renderer.render("".join(map(chr, range(0x4E00, 0x5E00))) + "x?")
+    assert sorted(renderer._by_char) == ["?", "x"]
+
+
+def test_missing_characters_match_figlet(tmp_path):
+    assert cli([str(PSF1), str(tmp_path / "font.flf")]) == 0
+    figlet = Figlet(font=str(tmp_path / "font"), width=1000)
+    assert render(read(PSF1), "A一B~\x7f") == figlet.renderText("A一B~\x7f")
+
+
+def test_cli_render(capsys):
+    assert cli(["--render", "HELLO", str(PSF1)]) == 0
+    assert capsys.readouterr().out == reference("psf1_hello.txt")
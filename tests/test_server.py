@@ -0,0 +1,160 @@
+import asyncio
+import json
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+from psf2flf.reader import read
+from psf2flf.server import FontCache, font_size, serve_stream, serve_unix
+
+DATA = Path(__file__).parent / "data"
+PSF1 = DATA / "psf1" / "Uni1-VGA8.psf.gz"
+PSF2 = DATA / "psf2" / "Arabic-VGA32x16.psf.gz"
+
+
+def run_requests(cache: FontCache, requests: list) -> list[dict]:
+    """Feed request lines through serve_stream and collect the responses by id."""
+
+    async def main():
+        reader = asyncio.StreamReader()
+        for request in requests:
+            reader.feed_data((request if isinstance(request, str) else json.dumps(request)).encode() + b"\n")
+        reader.feed_eof()
+
+        responses = []
+
+        async def write(data: bytes):
+            responses.append(json.loads(data))
+
+        await serve_stream(cache, reader, write)
+        return responses
+
+    return asyncio.run(main())
+
+
+def test_render_and_flf_requests():
+    cache = FontCache()
+    responses = run_requests(
+        cache,
+        [
+            {"id": 1, "op": "render", "font": str(PSF1), "text": "HELLO"},
+            {"id": 2, "op": "flf", "font": str(PSF1), "tall": True},
+            {"id": 3, "op": "render", "font": str(PSF1), "text": "HELLO", "tall": True},
+        ],
+    )
+    by_id = {response["id"]: response for response in responses}
+
+    assert by_id[1]["result"] == (DATA / "txt" / "psf1_hello.txt").read_text(encoding="utf-8")
+    assert by_id[2]["result"].startswith("flf2a$ 8 7 9")
+    assert by_id[3]["result"] == (DATA / "txt" / "psf1_tall_hello.txt").read_text(encoding="utf-8")
+    # All three requests shared one parse of the font
+    assert cache.stats["entries"] == 4
+    assert cache.stats["misses"] == 4
+
+
+def test_bad_requests():
+    responses = run_requests(
+        FontCache(),
+        [
+            "not json",
+            {"id": 1, "op": "render", "text": "x"},
+            {"id": 2, "op": "render", "font": "missing.psf", "text": "x"},
+            {"id": 3, "op": "nope"},
+        ],
+    )
+    assert all(not response["ok"] for response in responses)
+    errors = {response.get("id"): response["error"] for response in responses}
+    assert errors[None].startswith("Bad request")
+    assert errors[1] == "Missing field: font"
+    assert "missing.psf" in errors[2]
+    assert errors[3] == "Unknown op: nope"
+
+
+def test_cache_evicts_by_size():
+    async def main():
+        cache = FontCache()
+        psf1 = await cache.font(PSF1)
+        cache.max_bytes = font_size(psf1) + 1
+
+        await cache.font(PSF2)
+        assert cache.stats["entries"] == 1
+        assert cache.size <= font_size(await cache.font(PSF2))
+
+        await cache.font(PSF1)
+        return cache.stats
+
+    stats = asyncio.run(main())
+    assert stats["misses"] == 3
+    assert stats["hits"] == 1
+
+
+def test_renderer_evicted_with_font():
+    async def main():
+        cache = FontCache()
+        renderer = await cache.renderer(PSF1)
+        assert cache.size == font_size(renderer.font) + renderer.max_size()
+
+        # Evicting the first font makes room for the second, and its renderer goes with it
+        cache.max_bytes = renderer.max_size() + font_size(read(PSF2))
+        await cache.font(PSF2)
+        return cache.stats
+
+    stats = asyncio.run(main())
+    assert stats["entries"] == 1
+
+
+def test_cache_reloads_changed_file(tmp_path):
+    path = tmp_path / "Uni1-VGA8.psf.gz"
+    shutil.copy(PSF1, path)
+
+    async def main():
+        cache = FontCache()
+        first = await cache.font(path)
+        assert await cache.font(path) is first
+        shutil.copy(PSF2, path)
+        return first, await cache.font(path)
+
+    first, second = asyncio.run(main())
+    assert (first.width, second.width) == (8, 16)
+
+
+def test_unix_socket(tmp_path):
+    socket_path = tmp_path / "psf2flf.sock"
+
+    async def main():
+        server = asyncio.ensure_future(serve_unix(FontCache(), socket_path))
+        while not socket_path.is_socket():
+            await asyncio.sleep(0.01)
+
+        reader, writer = await asyncio.open_unix_connection(str(socket_path))
+        writer.write(json.dumps({"id": "a", "font": str(PSF1), "text": "HELLO"}).encode() + b"\n")
+        await writer.drain()
+        response = json.loads(await reader.readline())
+        writer.close()
+
+        server.cancel()
+        try:
+            await server
+        except asyncio.CancelledError:
+            pass
+        return response
+
+    response = asyncio.run(main())
+    assert response["id"] == "a"
+    assert response["result"] == (DATA / "txt" / "psf1_hello.txt").read_text(encoding="utf-8")
+    assert not socket_path.exists()
+
+
+def test_serve_stdin_from_file(tmp_path):
+    requests = tmp_path / "requests.jsonl"
+    lines = [{"id": i, "font": str(PSF1), "text": "HELLO"} for i in range(3)] + [{"id": 3, "op": "stats"}]
+    requests.write_text("".join(json.dumps(line) + "\n" for line in lines))
+
+    with open(requests, "rb") as stdin:
+        result = subprocess.run(
+            [sys.executable, "-m", "psf2flf", "--serve"], stdin=stdin, capture_output=True, check=True, timeout=60
+        )
+    responses = {response["id"]: response for response in map(json.loads, result.stdout.splitlines())}
+    assert sorted(responses) == [0, 1, 2, 3]
+    assert responses[0]["result"] == (DATA / "txt" / "psf1_hello.txt").read_text(encoding="utf-8")
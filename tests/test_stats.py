@@ -0,0 +1,81 @@
+import io
+import json
+import pstats
+import shutil
+from pathlib import Path
+
+from psf2flf import stats
+from psf2flf.main import cli
+from psf2flf.reader import read
+from psf2flf.writer.flf import FLFWriter
+
+DATA = Path(__file__).parent / "data"
+FONTS = sorted(DATA.glob("psf*/*.psf.gz"))
+
+
+def test_span_does_nothing_when_disabled():
+    assert not stats.enabled()
+    with stats.span("read", "x", 10) as span:
+        span.bytes = 20
+    assert span is stats.span("decode")
+    assert stats.disable() == []
+
+
+def test_spans_recorded_when_enabled():
+    stats.enable()
+    try:
+        with stats.span("read", Path("a.psf"), 10):
+            pass
+        with stats.span("decode", "a.psf") as span:
+            span.bytes = 5
+    finally:
+        spans = stats.disable()
+
+    assert [(s.stage, s.file, s.bytes) for s in spans] == [("read", "a.psf", 10), ("decode", "a.psf", 5)]
+    table = stats.summary(spans, 1.0)
+    assert "read" in table and "decode" in table and "a.psf" in table
+
+
+def _input_dir(tmp_path) -> Path:
+    source = tmp_path / "in"
+    source.mkdir()
+    for path in FONTS:
+        shutil.copy(path, source)
+    return source
+
+
+def test_render_bytes_counted_for_binary_streams():
+    font = read(FONTS[0])
+    buffer = io.BytesIO(b"already here")
+    buffer.seek(0, io.SEEK_END)
+    stats.enable()
+    try:
+        FLFWriter().write(font, buffer)
+    finally:
+        spans = stats.disable()
+
+    (render,) = [span for span in spans if span.stage == "render"]
+    assert render.bytes == len(buffer.getvalue()) - len(b"already here")
+
+
+def test_cli_stats_summary(tmp_path, capsys):
+    assert cli(["--all", "--stats", str(_input_dir(tmp_path)), str(tmp_path / "out")]) == 0
+    err = capsys.readouterr().err
+    for stage in ("read", "gunzip", "decode", "unicode", "render", "wall time", "Slowest files"):
+        assert stage in err
+    assert not stats.enabled()
+
+
+def test_cli_trace_with_jobs(tmp_path, capsys):
+    trace = tmp_path / "trace.json"
+    assert cli(["--all", "-j", "2", "--trace", str(trace), str(_input_dir(tmp_path)), str(tmp_path / "out")]) == 0
+
+    spans = json.loads(trace.read_text())["spans"]
+    rendered = {Path(span["file"]).name for span in spans if span["stage"] == "render"}
+    assert rendered == {path.name for path in FONTS}
+
+
+def test_cli_profile(tmp_path, capsys):
+    profile = tmp_path / "out.prof"
+    assert cli(["--profile", str(profile), str(FONTS[0]), str(tmp_path / "out.flf")]) == 0
+    assert pstats.Stats(str(profile)).total_calls > 0
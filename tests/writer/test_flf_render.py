@@ -0,0 +1,46 @@
+import random
+
+import pytest
+
+from psf2flf.font import Glyph
+from psf2flf.writer.flf import FLFWriter
+
+
+def render_short_per_pixel(pixels, width, height):
+    lines = []
+    for y in range(0, height, 2):
+        line = ""
+        for x in range(width):
+            top = pixels[y][x]
+            bottom = pixels[y + 1][x] if y + 1 < height else False
+            line += "█" if top and bottom else "▀" if top else "▄" if bottom else " "
+        lines.append(line)
+    return lines
+
+
+def render_full_per_pixel(pixels, width, height):
+    return ["".join("█" if pixels[y][x] else " " for x in range(width)) for y in range(height)]
+
+
+def random_pixels(width, height, seed):
+    rng = random.Random(seed)
+    return tuple(tuple(rng.random() < 0.5 for _ in range(width)) for _ in range(height))
+
+
+@pytest.mark.parametrize("width,height", [(8, 8), (8, 16), (8, 15), (5, 7), (12, 16), (16, 32), (17, 9), (32, 64)])
+def test_table_renderers_match_per_pixel(width, height):
+    writer = FLFWriter()
+    for seed in range(8):
+        pixels = random_pixels(width, height, seed)
+        glyph = Glyph.from_pixels(pixels)
+
+        assert writer._render_short_blocks(glyph, width, height) == render_short_per_pixel(pixels, width, height)
+        assert writer._render_full_pixels(glyph, width, height) == render_full_per_pixel(pixels, width, height)
+
+
+def test_renderers_accept_pixel_tuples():
+    writer = FLFWriter()
+    pixels = ((True, False, True), (True, True, False), (False, True, False))
+
+    assert writer._render_short_blocks(pixels, 3, 3) == ["█▄▀", " ▀ "]
+    assert writer._render_full_pixels(pixels, 3, 3) == ["█ █", "██ ", " █ "]
@@ -0,0 +1,61 @@
+import io
+import tarfile
+from pathlib import Path
+
+from psf2flf.font import FontDir
+from psf2flf.reader import read
+from psf2flf.writer.flf import _BATCH_SIZE, FLFWriter, _batched
+
+FONT = Path(__file__).parent.parent / "data" / "psf1" / "Uni1-VGA8.psf.gz"
+
+
+def test_write_to_text_and_binary_streams(tmp_path):
+    font = read(FONT)
+    writer = FLFWriter()
+
+    writer.write(font, tmp_path / "font.flf")
+    expected = (tmp_path / "font.flf").read_bytes()
+
+    text = io.StringIO()
+    writer.write(font, text)
+    assert text.getvalue().encode("utf-8") == expected
+
+    binary = io.BytesIO()
+    writer.write(font, binary)
+    assert binary.getvalue() == expected
+    assert not binary.closed
+
+
+def test_write_tar_matches_directory(tmp_path):
+    fontdir = FontDir()
+    fontdir += read(FONT)
+
+    fontdir.write_directory(tmp_path / "dir")
+    fontdir.write_tar(tmp_path / "fonts.tar")
+
+    with tarfile.open(tmp_path / "fonts.tar") as tar:
+        members = tar.getmembers()
+        assert [m.name for m in members] == ["VGA4x8.flf"]
+        assert tar.extractfile(members[0]).read() == (tmp_path / "dir" / "VGA4x8.flf").read_bytes()
+
+
+def test_output_written_in_batches():
+    class CountingStream(io.StringIO):
+        calls = 0
+
+        def write(self, data):
+            self.calls += 1
+            return super().write(data)
+
+    font = read(FONT)
+    stream = CountingStream()
+    FLFWriter().write(font, stream)
+
+    assert stream.getvalue() == FLFWriter().dumps(font)
+    assert 0 < stream.calls <= len(stream.getvalue()) // _BATCH_SIZE + 1
+
+
+def test_batched_joins_small_chunks():
+    assert list(_batched(["ab", "c", "de", "f"], size=3)) == ["abc", "def"]
+    assert list(_batched(["ab", "c", "d"], size=3)) == ["abc", "d"]
+    assert list(_batched([], size=3)) == []
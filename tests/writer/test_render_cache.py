@@ -0,0 +1,66 @@
+import threading
+from collections import OrderedDict
+
+from psf2flf.font import Font, Glyph
+from psf2flf.writer import RenderCache
+from psf2flf.writer.flf import FLFWriter
+
+
+def make_font():
+    question = Glyph.from_bytes(b"\x3c\x42\x0c\x00", 8, 4)
+    font = Font()
+    font.meta = {"name": "Test", "styles": frozenset(), "width": 8, "height": 4}
+    font.glyphs = {"?": question, "A": Glyph.from_bytes(b"\x18\x24\x7e\x42", 8, 4), "é": question}
+    return font
+
+
+def test_lru_eviction():
+    cache = RenderCache(maxsize=2)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    assert cache.get("a") == "1"
+    cache.put("c", "3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+    assert len(cache) == 2
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_eviction_from_another_thread_waits_for_get():
+    cache = RenderCache(maxsize=1)
+    cache.put("a", "1")
+
+    class Entries(OrderedDict):
+        def get(self, key, default=None):
+            # Try to evict the key between the lookup and its move to the end
+            value = super().get(key, default)
+            evict = threading.Thread(target=cache.put, args=("b", "2"))
+            evict.start()
+            evict.join(timeout=0.1)
+            self.evicting = evict
+            return value
+
+    cache._entries = Entries(cache._entries)
+    assert cache.get("a") == "1"
+    cache._entries.evicting.join()
+    assert cache.get("b") == "2"
+
+
+def test_writer_renders_each_bitmap_once(tmp_path, monkeypatch):
+    writer = FLFWriter()
+    calls = []
+    render = writer._render_block_glyph
+    monkeypatch.setattr(writer, "_render_block_glyph", lambda glyph, *args: calls.append(glyph) or render(glyph, *args))
+
+    cache = RenderCache()
+    writer.write(make_font(), tmp_path / "one.flf", cache=cache)
+    assert len(calls) == 2  # "?" (used for all missing ASCII and é) and "A"
+
+    writer.write(make_font(), tmp_path / "two.flf", cache=cache)
+    assert len(calls) == 2
+    assert (tmp_path / "one.flf").read_text() == (tmp_path / "two.flf").read_text()
+
+    writer.write(make_font(), tmp_path / "tall.flf", tall_mode=True, cache=cache)
+    assert len(calls) == 4